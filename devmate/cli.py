@@ -1,5 +1,10 @@
+import json
+import statistics
+import time
+
 import typer
 from rich import print
+from devmate.config import settings
 from devmate.logger import get_logger
 from devmate.core.agent import Agent
 
@@ -34,13 +39,26 @@ def health():
 
 
 @app.command()
-def run(intent: str):
+def run(
+    intent: str,
+    stream: bool = typer.Option(
+        False, "--stream", help="Start read-only steps while the plan is still generating"
+    ),
+    telemetry: str = typer.Option(
+        None, "--telemetry", help="Write per-call LLM telemetry for this run as JSON to this path"
+    ),
+):
     """ Run the Devmate agent with a given intent """
     logger.info(f"Running agent with intent: {intent}")
 
     agent=Agent()
 
-    results=agent.run(intent)
+    try:
+        results=agent.run(intent, stream=stream)
+    finally:
+        if telemetry and agent.last_telemetry is not None:
+            agent.last_telemetry.export(telemetry)
+            logger.info(f"Telemetry written to {telemetry}")
 
     print("[bold green]Agent execution completed[/bold green]")
 
@@ -50,13 +68,50 @@ def run(intent: str):
 
 
 
+@app.command()
+def bench(
+    intent: str,
+    recordings: str = typer.Option(
+        ..., "--recordings", help="JSONL file of recorded LLM responses to replay"
+    ),
+    profile: str = typer.Option(
+        "gpt-4o-mini", "--profile", help="Simulated latency profile (instant, fast, gpt-4o-mini, slow)"
+    ),
+    runs: int = typer.Option(3, "--runs", min=1, help="Number of agent runs"),
+    stream: bool = typer.Option(False, "--stream", help="Use streaming plan execution"),
+    output: str = typer.Option(None, "--output", help="Write timings and telemetry as JSON to this path"),
+):
+    """ Benchmark the agent offline against recorded LLM responses.
+
+    Plans are executed for real, so record them against a scratch checkout.
+    """
+    settings.LLM_BACKEND="replay"
+    settings.LLM_REPLAY_PATH=recordings
+    settings.LLM_REPLAY_PROFILE=profile
+    # Cached responses would hide the simulated latency
+    settings.LLM_CACHE=False
 
-
-
-
-
-
-
-
-
-
+    agent=Agent()
+    report=[]
+
+    for i in range(runs):
+        started=time.perf_counter()
+        agent.run(intent, stream=stream)
+        elapsed=time.perf_counter() - started
+
+        summary=agent.last_telemetry.summary()
+        report.append({"wall": round(elapsed, 4), "llm": summary})
+        print(
+            f"[cyan]run {i + 1}:[/cyan] {elapsed:.3f}s "
+            f"(llm calls={summary['calls']}, llm time={summary['latency']:.3f}s)"
+        )
+
+    walls=[r["wall"] for r in report]
+    print(
+        f"[bold green]wall time[/bold green] min={min(walls):.3f}s "
+        f"median={statistics.median(walls):.3f}s max={max(walls):.3f}s"
+    )
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump({"intent": intent, "profile": profile, "runs": report}, f, indent=2)
@@ -6,6 +6,27 @@ import os
 from dotenv import load_dotenv
 
 
+def _env_list(name, default):
+    value = os.getenv(name)
+    if not value:
+        return default
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _env_bool(name, default):
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    if not value:
+        return default
+    return int(value)
+
+
 class Settings:
     def __init__(self):
         # Load env vars at instance creation time (NOT import time)
@@ -16,6 +37,96 @@ class Settings:
         self.OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
         self.GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 
+        # File suffixes considered for repository context
+        self.CONTEXT_SUFFIXES = _env_list(
+            "DEVMATE_CONTEXT_SUFFIXES", [".py", ".md", ".txt"]
+        )
+
+        # How many BM25-ranked files feed the planning prompt, and whether
+        # the LLM reranks a wider top-k before that
+        self.CONTEXT_TOP_K = _env_int("DEVMATE_CONTEXT_TOP_K", 5)
+        self.LLM_RERANK = _env_bool("DEVMATE_LLM_RERANK", False)
+        self.RERANK_TOP_K = _env_int("DEVMATE_RERANK_TOP_K", 20)
+
+        # Upper bound on repository context added to the planning prompt
+        self.CONTEXT_TOKEN_BUDGET = _env_int("DEVMATE_CONTEXT_TOKEN_BUDGET", 6000)
+
+        # How the repo index detects changes: "git", "stat" or "auto"
+        self.INDEX_MODE = os.getenv("DEVMATE_INDEX_MODE", "auto")
+
+        # Thread pool size for bulk file reads
+        self.READ_WORKERS = _env_int("DEVMATE_READ_WORKERS", 8)
+
+        # Stage an agent run's file writes in memory and flush them before a
+        # commit or when the run ends; a failed run leaves the disk untouched
+        self.TRANSACTIONAL_WRITES = _env_bool("DEVMATE_TRANSACTIONAL_WRITES", True)
+
+        # Threads for independent read-only plan steps (1 runs steps in order)
+        self.STEP_WORKERS = _env_int("DEVMATE_STEP_WORKERS", 8)
+
+        # Opt-in disk cache of LLM responses
+        self.LLM_CACHE = _env_bool("DEVMATE_LLM_CACHE", False)
+        self.LLM_CACHE_PATH = os.getenv("DEVMATE_LLM_CACHE_PATH")
+        self.LLM_CACHE_TTL = _env_int("DEVMATE_LLM_CACHE_TTL", 86_400)
+        self.LLM_CACHE_MAX_ENTRIES = _env_int("DEVMATE_LLM_CACHE_MAX_ENTRIES", 1_000)
+        self.LLM_CACHE_MAX_BYTES = _env_int("DEVMATE_LLM_CACHE_MAX_BYTES", 50_000_000)
+
+        # Upper bound on in-flight requests from the async LLM client
+        self.LLM_MAX_CONCURRENCY = _env_int("DEVMATE_LLM_MAX_CONCURRENCY", 8)
+
+        # Provider budgets and retry policy for LLM requests
+        self.LLM_RPM = _env_int("DEVMATE_LLM_RPM", 500)
+        self.LLM_TPM = _env_int("DEVMATE_LLM_TPM", 200_000)
+        self.LLM_MAX_RETRIES = _env_int("DEVMATE_LLM_MAX_RETRIES", 5)
+
+        # LLM backend: "openai", or "replay" to serve recorded responses offline
+        self.LLM_BACKEND = os.getenv("DEVMATE_LLM_BACKEND", "openai")
+        self.LLM_REPLAY_PATH = os.getenv("DEVMATE_LLM_REPLAY_PATH")
+        self.LLM_REPLAY_PROFILE = os.getenv("DEVMATE_LLM_REPLAY_PROFILE", "instant")
+        # Append every real response to this JSONL file for later replay
+        self.LLM_RECORD_PATH = os.getenv("DEVMATE_LLM_RECORD_PATH")
+
+        # "two_pass" selects context files, then plans over their contents;
+        # "single_pass" plans over a repository outline in one request and
+        # reads the files the model asks for as plan steps
+        self.PLAN_MODE = os.getenv("DEVMATE_PLAN_MODE", "two_pass")
+
+        # Answer well-known intents ("git status", "list PRs for o/r") with
+        # fixed plans instead of the LLM; the keyword classifier is looser
+        self.INTENT_ROUTER = _env_bool("DEVMATE_INTENT_ROUTER", True)
+        self.INTENT_CLASSIFIER = _env_bool("DEVMATE_INTENT_CLASSIFIER", False)
+
+        # Opt-in cache of validated plans per intent and context fingerprint
+        self.PLAN_CACHE = _env_bool("DEVMATE_PLAN_CACHE", False)
+
+        # Per-task model chains: the first model serves the task, later ones
+        # take over on API errors or output that fails validation
+        self.DEFAULT_MODELS = _env_list("DEVMATE_MODELS_DEFAULT", ["gpt-4o-mini"])
+        self.MODEL_ROUTES = {
+            "selector": _env_list("DEVMATE_MODELS_SELECTOR", ["gpt-4o-mini"]),
+            "planner": _env_list("DEVMATE_MODELS_PLANNER", ["gpt-4o-mini", "gpt-4o"]),
+            "fixer": _env_list("DEVMATE_MODELS_FIXER", ["gpt-4o-mini", "gpt-4o"]),
+        }
+
+        # Review-comment fixes: "interactive", or "batch" for the cheaper,
+        # slower batch endpoint (poll interval and timeout in seconds)
+        self.FIX_MODE = os.getenv("DEVMATE_FIX_MODE", "interactive")
+        # Review comments on files larger than this (bytes) are fixed on a
+        # window of lines around the commented line instead of the whole file
+        self.FIX_WINDOW_BYTES = _env_int("DEVMATE_FIX_WINDOW_BYTES", 256 * 1024)
+        self.FIX_CONTEXT_LINES = _env_int("DEVMATE_FIX_CONTEXT_LINES", 40)
+
+        self.BATCH_POLL_INTERVAL = _env_int("DEVMATE_BATCH_POLL_INTERVAL", 30)
+        self.BATCH_TIMEOUT = _env_int("DEVMATE_BATCH_TIMEOUT", 86_400)
+
+        # Shared HTTP connection pool for LLM traffic (timeouts in seconds)
+        self.HTTP2 = _env_bool("DEVMATE_HTTP2", True)
+        self.HTTP_MAX_CONNECTIONS = _env_int("DEVMATE_HTTP_MAX_CONNECTIONS", 20)
+        self.HTTP_MAX_KEEPALIVE = _env_int("DEVMATE_HTTP_MAX_KEEPALIVE", 10)
+        self.HTTP_KEEPALIVE_EXPIRY = _env_int("DEVMATE_HTTP_KEEPALIVE_EXPIRY", 60)
+        self.HTTP_TIMEOUT = _env_int("DEVMATE_HTTP_TIMEOUT", 120)
+        self.HTTP_CONNECT_TIMEOUT = _env_int("DEVMATE_HTTP_CONNECT_TIMEOUT", 10)
+
     def validate(self):
         if not self.OPENAI_API_KEY:
             raise RuntimeError(
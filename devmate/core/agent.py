@@ -1,8 +1,14 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
+from devmate.config import settings
 from devmate.logger import get_logger
 from devmate.core.planner import Planner
-from devmate.core.executor import Executor
+from devmate.core.executor import Executor, READ_ONLY_ACTIONS
 from devmate.core.code_fixer import CodeFixer
+from devmate.core.file_cache import FileCache
+from devmate.core import plan_graph, telemetry, transport
 
 
 logger = get_logger("agent")
@@ -16,61 +22,259 @@ class Agent:
     def __init__(self):
         self.planner = Planner()
         self.executor = Executor()
+        self._fixer = None
+        # LLM call telemetry of the most recent run
+        self.last_telemetry = None
+
+    @property
+    def fixer(self) -> CodeFixer:
+        # Created on first use and kept for later runs
+        if self._fixer is None:
+            self._fixer = CodeFixer()
+        return self._fixer
 
     
-    def run(self, intent: str):
+    def run(self, intent: str, stream: bool = False):
         logger.info(f"Agent received intent: {intent}")
 
+        # One file cache per run, shared by context building and execution
+        file_cache = FileCache()
+        self.planner.builder.file_cache = file_cache
+        self.executor.file_cache = file_cache
+
+        run_telemetry = telemetry.Telemetry()
+        self.last_telemetry = run_telemetry
+        token = telemetry.activate(run_telemetry)
+
+        # Writes are staged and only reach disk before a commit or once the
+        # whole run has succeeded
+        if settings.TRANSACTIONAL_WRITES:
+            self.executor.begin()
+
+        try:
+            if stream:
+                results = self._run_streaming(intent)
+            else:
+                results = self._run(intent)
+
+            if settings.TRANSACTIONAL_WRITES:
+                self.executor.commit_transaction()
+            return results
+        except BaseException:
+            if settings.TRANSACTIONAL_WRITES:
+                self.executor.discard()
+            raise
+        finally:
+            telemetry.deactivate(token)
+            self.planner.builder.file_cache = None
+            self.executor.file_cache = None
+            logger.info(f"File cache: {file_cache.stats()}")
+            logger.info(f"LLM telemetry: {run_telemetry.summary()}")
+
+    def _run(self, intent: str):
         plan = self.planner.create_plan(intent)
         logger.info(f"Execution plan created: {plan}")
 
+        fixer = self.fixer
+
+        return self._execute_plan(fixer, plan)
+
+    def _execute_plan(self, fixer: CodeFixer, plan: List[Dict[str, Any]]):
+        """
+        Run the plan wave by wave (see plan_graph): independent read-only
+        steps share a wave and run on a thread pool. Results keep plan order.
+        """
+        results: List[Any] = [None] * len(plan)
+
+        for wave in plan_graph.waves(plan):
+            if len(wave) == 1 or settings.STEP_WORKERS <= 1:
+                for i in wave:
+                    results[i] = self._execute_step(fixer, plan[i])
+                continue
+
+            logger.info(f"Executing {len(wave)} independent steps concurrently")
+            with ThreadPoolExecutor(max_workers=min(settings.STEP_WORKERS, len(wave))) as pool:
+                done = pool.map(lambda i: self._execute_step(fixer, plan[i]), wave)
+                for i, result in zip(wave, done):
+                    results[i] = result
+
+        return results
+
+    def _run_streaming(self, intent: str):
+        """
+        Execute read-only steps while the plan is still being generated.
+
+        Once a step with side effects arrives, it and every later step wait
+        until the full plan has been streamed and validated, so nothing is
+        written on the strength of a plan that turns out to be invalid.
+        """
+        fixer = self.fixer
         results = []
-        fixer = CodeFixer()
+        deferred = []
 
-        for step in plan:
-           action = step["action"]
-           payload = step.get("payload") or {}
+        for step in self.planner.stream_plan(intent):
+            if not deferred and step["action"] in READ_ONLY_ACTIONS:
+                results.append(self._execute_step(fixer, step))
+            else:
+                deferred.append(step)
 
-           logger.info(f"Executing step: {action}")
+        logger.info(f"Plan streamed; {len(results)} step(s) already executed")
 
-           # ---- NORMAL EXECUTION ----
-           result = self.executor.execute(action, payload)
+        for step in deferred:
+            results.append(self._execute_step(fixer, step))
 
-           # ---- SPECIAL: PR REVIEW AUTOFIX ----
-           if action == "github_list_review_comments":
-               comments = result.get("comments", [])
+        return results
 
-               for comment in comments:
-                   path = comment.get("path")
-                   body = comment.get("body")
+    def _execute_step(self, fixer: CodeFixer, step: Dict[str, Any]):
+        action = step["action"]
+        payload = step.get("payload") or {}
 
-                   if not path or not body:
-                       continue
+        logger.info(f"Executing step: {action}")
 
-                   file_content = self.executor.execute(
-                       "read_file", {"path": path}
-                   )["content"]
+        # ---- NORMAL EXECUTION ----
+        result = self.executor.execute(action, payload)
 
-                   fixed_content = fixer.fix(file_content, body)
+        # ---- SPECIAL: PR REVIEW AUTOFIX ----
+        if action == "github_list_review_comments":
+            comments = result.get("comments", [])
 
-                   self.executor.execute(
-                       "write_file",
-                        {"path": path, "content": fixed_content},
-                   )
+            changed = self._autofix(fixer, comments)
 
-               if comments:
-                   self.executor.execute(
-                      "git_commit",
-                      {"message": "Auto-fix PR review comments"},
-                   )
+            # Nothing to commit when every fix came back identical
+            if changed:
+                self.executor.execute(
+                    "git_commit",
+                    {"message": "Auto-fix PR review comments"},
+                )
 
-           results.append(
-              {
-                "action": action,
-                "result": result,
-              }
-           )
+        return {
+            "action": action,
+            "result": result,
+        }
 
-        return results
+    def _autofix(self, fixer: CodeFixer, comments: List[Dict[str, Any]])-> bool:
+        """
+        Apply review comments with one LLM fix per comment. Returns whether
+        any file's content changed.
+
+        Comments on the same file are applied one after another, each on the
+        previous result; different files are fixed concurrently. On files
+        larger than FIX_WINDOW_BYTES, a comment with a line number is fixed
+        on a window of lines around it, which is then spliced back. In batch
+        fix mode, each file is instead fixed once with all of its comments
+        through the batch endpoint.
+        """
+        by_path: Dict[str, List[Dict[str, Any]]] = {}
+        for comment in comments:
+            path = comment.get("path")
+            body = comment.get("body")
+
+            if not path or not body:
+                continue
+
+            by_path.setdefault(path, []).append(comment)
+
+        if by_path and settings.FIX_MODE == "batch":
+            return self._autofix_batch(
+                fixer,
+                {path: [c["body"] for c in items] for path, items in by_path.items()},
+            )
+
+        changed = []
+
+        async def fix_path(path: str, items: List[Dict[str, Any]]):
+            windowed = self._is_large(path)
+            # (last line in the original file, lines added) of earlier
+            # window fixes to this file
+            shifts = []
+
+            for comment in items:
+                body = comment["body"]
+                line = comment.get("line")
+
+                if windowed and isinstance(line, int) and line > 0:
+                    # Review comment lines refer to the original file
+                    shift = sum(delta for end, delta in shifts if end < line)
+                    line += shift
+                    window = self.executor.execute(
+                        "read_file",
+                        {"path": path, "line": line, "context": settings.FIX_CONTEXT_LINES},
+                    )
+                    region = (window["start_line"], window["end_line"])
+
+                    try:
+                        fixed = await fixer.afix(window["content"], body, region=region)
+                    except Exception as e:
+                        logger.error(f"Auto-fix failed for {path}:{line}: {e}")
+                        continue
+
+                    result = self.executor.execute(
+                        "write_file",
+                        {"path": path, "content": fixed, "start_line": region[0], "end_line": region[1]},
+                    )
+                    new_lines = fixed.count("\n") + (0 if fixed.endswith("\n") else 1)
+                    shifts.append((region[1] - shift, new_lines - (region[1] - region[0] + 1)))
+                    changed.append(result.get("changed"))
+                    continue
+
+                file_content = self.executor.execute(
+                    "read_file", {"path": path}
+                )["content"]
+
+                try:
+                    fixed_content = await fixer.afix(file_content, body)
+                except Exception as e:
+                    logger.error(f"Auto-fix failed for {path}: {e}")
+                    continue
+
+                result = self.executor.execute(
+                    "write_file",
+                    {"path": path, "content": fixed_content},
+                )
+                changed.append(result.get("changed"))
+
+        async def fix_all():
+            try:
+                await asyncio.gather(
+                    *(fix_path(path, items) for path, items in by_path.items())
+                )
+            finally:
+                # This loop ends with the step; don't leak its connections
+                await transport.aclose_loop_client()
+
+        if by_path:
+            asyncio.run(fix_all())
+
+        return any(changed)
+
+    @staticmethod
+    def _is_large(path: str)-> bool:
+        try:
+            return os.path.getsize(path) > settings.FIX_WINDOW_BYTES
+        except OSError:
+            return False
+
+    def _autofix_batch(self, fixer: CodeFixer, by_path: Dict[str, List[str]])-> bool:
+        paths = list(by_path)
+        contents = [
+            self.executor.execute("read_file", {"path": path})["content"]
+            for path in paths
+        ]
+
+        fixed = fixer.fix_batch(
+            [(content, by_path[path]) for path, content in zip(paths, contents)]
+        )
+
+        changed = False
+        for path, fixed_content in zip(paths, fixed):
+            if fixed_content is None:
+                logger.error(f"Batch auto-fix failed for {path}")
+                continue
+
+            result = self.executor.execute(
+                "write_file",
+                {"path": path, "content": fixed_content},
+            )
+            changed = bool(result.get("changed")) or changed
 
-     
\ No newline at end of file
+        return changed
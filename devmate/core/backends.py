@@ -0,0 +1,246 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+from devmate.config import settings
+from devmate.core.tokens import estimate_tokens
+from devmate.core.llm_cache import ResponseCache
+from devmate.logger import get_logger
+
+
+logger = get_logger("backends")
+
+
+class LLMBackend:
+    """
+    Interface between the LLM clients and whatever produces completions.
+
+    create()/acreate() take the chat-completions keyword arguments (model,
+    messages, temperature, stream) and return an OpenAI-shaped response,
+    or an iterator of chunks when stream=True.
+    """
+
+    name = "base"
+
+    def create(self, **kwargs) -> Any:
+        raise NotImplementedError
+
+    async def acreate(self, **kwargs) -> Any:
+        raise NotImplementedError
+
+
+class OpenAIBackend(LLMBackend):
+    """
+    Passes requests straight through to an OpenAI / AsyncOpenAI client.
+    """
+
+    name = "openai"
+
+    def __init__(self, client=None, async_client=None):
+        self.client = client
+        self.async_client = async_client
+
+    def create(self, **kwargs) -> Any:
+        return self.client.chat.completions.create(**kwargs)
+
+    async def acreate(self, **kwargs) -> Any:
+        return await self.async_client.chat.completions.create(**kwargs)
+
+
+class LatencyProfile:
+    """
+    Simulated serving speed: time to first token plus decode throughput,
+    with optional multiplicative jitter drawn from a seeded RNG.
+    """
+
+    def __init__(self, ttft: float = 0.0, tokens_per_second: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _scale(self) -> float:
+        if not self.jitter:
+            return 1.0
+        with self._lock:
+            return 1.0 + self._rng.uniform(-self.jitter, self.jitter)
+
+    def first_token_delay(self) -> float:
+        return self.ttft * self._scale()
+
+    def decode_delay(self, tokens: int) -> float:
+        if not self.tokens_per_second:
+            return 0.0
+        return tokens / self.tokens_per_second * self._scale()
+
+
+PROFILES = {
+    "instant": dict(ttft=0.0, tokens_per_second=0.0),
+    "fast": dict(ttft=0.15, tokens_per_second=250.0, jitter=0.1),
+    "gpt-4o-mini": dict(ttft=0.5, tokens_per_second=80.0, jitter=0.2),
+    "slow": dict(ttft=1.5, tokens_per_second=30.0, jitter=0.3),
+}
+
+
+def profile(name: str, seed: int = 0) -> LatencyProfile:
+    if name not in PROFILES:
+        raise ValueError(f"Unknown latency profile '{name}'. Choose from: {', '.join(PROFILES)}")
+    return LatencyProfile(seed=seed, **PROFILES[name])
+
+
+def load_recordings(path: str) -> List[Dict[str, str]]:
+    """
+    Read recorded responses from a JSONL file. Each line holds a "response"
+    and either an exact prompt "key" (as written by RecordingBackend) or a
+    "match" substring looked up in the last user message.
+    """
+    recordings = []
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if "response" not in entry:
+                raise ValueError(f"{path}:{number}: recording has no 'response'")
+            recordings.append(entry)
+    return recordings
+
+
+class ReplayBackend(LLMBackend):
+    """
+    Deterministic in-process stand-in that replays recorded responses.
+
+    Lookup order: exact prompt key, then the first "match" entry found in
+    the last user message, then `default`. Responses are delayed according
+    to the latency profile, so end-to-end timings are reproducible offline.
+    """
+
+    name = "replay"
+
+    def __init__(self, recordings: Optional[List[Dict[str, str]]] = None, default: Optional[str] = None, latency: Optional[LatencyProfile] = None):
+        recordings = recordings or []
+        self.by_key = {r["key"]: r["response"] for r in recordings if "key" in r}
+        self.by_match = [(r["match"], r["response"]) for r in recordings if "match" in r]
+        self.default = default
+        self.latency = latency or LatencyProfile()
+        self.calls = 0
+
+    @classmethod
+    def from_file(cls, path: str, default: Optional[str] = None, latency: Optional[LatencyProfile] = None) -> "ReplayBackend":
+        return cls(load_recordings(path), default=default, latency=latency)
+
+    def lookup(self, model: str, temperature: float, messages: List[Dict[str, str]]) -> str:
+        self.calls += 1
+
+        key = ResponseCache.key(model, temperature, messages)
+        if key in self.by_key:
+            return self.by_key[key]
+
+        user = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+        for needle, response in self.by_match:
+            if needle in user:
+                return response
+
+        if self.default is not None:
+            return self.default
+
+        raise RuntimeError("No recorded response matches this prompt")
+
+    @staticmethod
+    def _response(text: str, messages: List[Dict[str, str]]) -> Any:
+        prompt = "".join(m.get("content") or "" for m in messages)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+            usage=SimpleNamespace(
+                prompt_tokens=estimate_tokens(prompt),
+                completion_tokens=estimate_tokens(text),
+                prompt_tokens_details={"cached_tokens": 0},
+            ),
+        )
+
+    @staticmethod
+    def _chunks(text: str, size: int = 16) -> List[str]:
+        return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+    def _stream(self, text: str) -> Iterator[Any]:
+        time.sleep(self.latency.first_token_delay())
+        for piece in self._chunks(text):
+            time.sleep(self.latency.decode_delay(estimate_tokens(piece)))
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+    def create(self, model: str, messages: List[Dict[str, str]], temperature: float, stream: bool = False, **kwargs) -> Any:
+        text = self.lookup(model, temperature, messages)
+        if stream:
+            return self._stream(text)
+
+        time.sleep(self.latency.first_token_delay() + self.latency.decode_delay(estimate_tokens(text)))
+        return self._response(text, messages)
+
+    async def acreate(self, model: str, messages: List[Dict[str, str]], temperature: float, **kwargs) -> Any:
+        text = self.lookup(model, temperature, messages)
+        await asyncio.sleep(self.latency.first_token_delay() + self.latency.decode_delay(estimate_tokens(text)))
+        return self._response(text, messages)
+
+
+class RecordingBackend(LLMBackend):
+    """
+    Wraps another backend and appends every (key, response) pair to a JSONL
+    file that ReplayBackend can load later.
+    """
+
+    name = "recording"
+
+    def __init__(self, inner: LLMBackend, path: str):
+        self.inner = inner
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _record(self, kwargs: Dict[str, Any], response: Any):
+        key = ResponseCache.key(kwargs["model"], kwargs["temperature"], kwargs["messages"])
+        line = json.dumps({"key": key, "response": response.choices[0].message.content})
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def create(self, **kwargs) -> Any:
+        response = self.inner.create(**kwargs)
+        if not kwargs.get("stream"):
+            self._record(kwargs, response)
+        return response
+
+    async def acreate(self, **kwargs) -> Any:
+        response = await self.inner.acreate(**kwargs)
+        self._record(kwargs, response)
+        return response
+
+
+def from_settings() -> Optional[LLMBackend]:
+    """
+    The stand-in backend selected in settings, or None for the default
+    OpenAI backend (which the clients construct themselves).
+    """
+    if settings.LLM_BACKEND == "openai":
+        return None
+
+    if settings.LLM_BACKEND == "replay":
+        if not settings.LLM_REPLAY_PATH:
+            raise RuntimeError("DEVMATE_LLM_REPLAY_PATH must be set for the replay backend")
+        return ReplayBackend.from_file(
+            settings.LLM_REPLAY_PATH,
+            latency=profile(settings.LLM_REPLAY_PROFILE),
+        )
+
+    raise RuntimeError(f"Unknown LLM backend '{settings.LLM_BACKEND}'")
+
+
+def with_recording(backend: LLMBackend) -> LLMBackend:
+    """
+    Wrap backend in a RecordingBackend when DEVMATE_LLM_RECORD_PATH is set.
+    """
+    if settings.LLM_RECORD_PATH:
+        return RecordingBackend(backend, settings.LLM_RECORD_PATH)
+    return backend
@@ -0,0 +1,161 @@
+import io
+import itertools
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from devmate.core.backends import LLMBackend
+from devmate.logger import get_logger
+
+
+logger = get_logger("batch")
+
+ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def build_requests(model: str, temperature: float, jobs: List[Tuple[str, List[Dict[str, str]]]]) -> List[Dict[str, Any]]:
+    """
+    One batch line per (custom_id, messages) job, in the Batch API format.
+    """
+    return [
+        {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": ENDPOINT,
+            "body": {"model": model, "messages": messages, "temperature": temperature},
+        }
+        for custom_id, messages in jobs
+    ]
+
+
+def to_jsonl(lines: List[Dict[str, Any]]) -> str:
+    return "".join(json.dumps(line) + "\n" for line in lines)
+
+
+def parse_results(text: str) -> Dict[str, Optional[str]]:
+    """
+    Map custom_id to the completion text of a batch output file; requests
+    that errored map to None.
+    """
+    results: Dict[str, Optional[str]] = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        custom_id = entry.get("custom_id")
+
+        response = entry.get("response") or {}
+        if entry.get("error") or response.get("status_code", 200) != 200:
+            logger.warning(f"Batch request {custom_id} failed: {entry.get('error') or response}")
+            results[custom_id] = None
+            continue
+
+        try:
+            results[custom_id] = response["body"]["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            results[custom_id] = None
+    return results
+
+
+class OpenAIBatchRunner:
+    """
+    Submits batches to the OpenAI Batch API: upload the JSONL as a file,
+    create a batch over it, poll, then download the output file.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def submit(self, lines: List[Dict[str, Any]]) -> str:
+        upload = self.client.files.create(
+            file=("devmate-batch.jsonl", io.BytesIO(to_jsonl(lines).encode("utf-8"))),
+            purpose="batch",
+        )
+        batch = self.client.post(
+            "/batches",
+            body={
+                "input_file_id": upload.id,
+                "endpoint": ENDPOINT,
+                "completion_window": COMPLETION_WINDOW,
+            },
+            cast_to=httpx.Response,
+        ).json()
+        return batch["id"]
+
+    def status(self, batch_id: str) -> Dict[str, Any]:
+        return self.client.get(f"/batches/{batch_id}", cast_to=httpx.Response).json()
+
+    def output(self, batch: Dict[str, Any]) -> str:
+        file_id = batch.get("output_file_id")
+        if not file_id:
+            return ""
+        return self.client.files.content(file_id).text
+
+
+class LocalBatchRunner:
+    """
+    In-process stand-in for the Batch API that runs every line through an
+    LLM backend on submit. Used for tests and offline runs.
+    """
+
+    def __init__(self, backend: LLMBackend):
+        self.backend = backend
+        self._batches: Dict[str, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+
+    def submit(self, lines: List[Dict[str, Any]]) -> str:
+        batch_id = f"local-batch-{next(self._ids)}"
+        output = []
+
+        for line in lines:
+            try:
+                response = self.backend.create(**line["body"])
+                body = {"choices": [{"message": {"content": response.choices[0].message.content}}]}
+                output.append({"custom_id": line["custom_id"], "response": {"status_code": 200, "body": body}, "error": None})
+            except Exception as e:
+                output.append({"custom_id": line["custom_id"], "response": None, "error": {"message": str(e)}})
+
+        self._batches[batch_id] = {"id": batch_id, "status": "completed", "output": to_jsonl(output)}
+        return batch_id
+
+    def status(self, batch_id: str) -> Dict[str, Any]:
+        return self._batches[batch_id]
+
+    def output(self, batch: Dict[str, Any]) -> str:
+        return batch["output"]
+
+
+def run_batch(
+    runner,
+    lines: List[Dict[str, Any]],
+    poll_interval: float = 30.0,
+    timeout: float = 86_400.0,
+    sleep=time.sleep,
+) -> Dict[str, Optional[str]]:
+    """
+    Submit a batch, wait for it to finish and return its parsed results.
+    """
+    batch_id = runner.submit(lines)
+    logger.info(f"Submitted batch {batch_id} with {len(lines)} request(s)")
+
+    waited = 0.0
+    while True:
+        batch = runner.status(batch_id)
+        status = batch.get("status")
+        if status in TERMINAL_STATUSES:
+            break
+        if waited >= timeout:
+            raise RuntimeError(f"Batch {batch_id} did not finish within {timeout}s (status: {status})")
+        sleep(poll_interval)
+        waited += poll_interval
+
+    if status != "completed":
+        raise RuntimeError(f"Batch {batch_id} ended with status '{status}'")
+
+    results = parse_results(runner.output(batch))
+    logger.info(f"Batch {batch_id} completed: {sum(r is not None for r in results.values())}/{len(lines)} succeeded")
+    return results
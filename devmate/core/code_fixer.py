@@ -1,13 +1,24 @@
-from devmate.core.llm_client import LLMClient
+import asyncio
+from typing import Dict, List, Optional, Tuple, Union
+
+from devmate.config import settings
+from devmate.core import batch, routing, transport
+from devmate.core.backends import LLMBackend
+from devmate.core.llm_client import TEMPERATURE, AsyncLLMClient, LLMClient, build_messages
+from devmate.core.rate_limit import PRIORITY_FIX
+from devmate.logger import get_logger
+
+logger = get_logger("code_fixer")
 
 FIX_PROMPT = """
 You are a senior software engineer.
 
 Given:
 - source code
-- a review comment
+- one or more review comments
 
-Return ONLY the updated full file content.
+Return ONLY the updated full file content. If you are given an excerpt
+of a file (a line range), return ONLY the updated excerpt.
 
 Rules:
 - Do NOT explain
@@ -16,17 +27,129 @@ Rules:
 """
 
 class CodeFixer:
-    def __init__(self):
-        self.llm = LLMClient()
+    def __init__(self, backend: Optional[LLMBackend] = None):
+        # Fixes queue behind planning requests when rate limited
+        self.backend = backend
+        self.llm = LLMClient(priority=PRIORITY_FIX, component="fixer", backend=backend)
+        self._async_llm = None
+        self._batch_runner = None
 
-    def fix(self, code: str, comment: str) -> str:
-        prompt = f"""
-{FIX_PROMPT}
+    @property
+    def async_llm(self) -> AsyncLLMClient:
+        if self._async_llm is None:
+            self._async_llm = AsyncLLMClient(component="fixer", backend=self.backend)
+        return self._async_llm
 
-Review comment:
-{comment}
+    @property
+    def batch_runner(self):
+        """
+        The OpenAI Batch API, or the in-process stand-in when the client
+        is running on a local backend.
+        """
+        if self._batch_runner is None:
+            if self.llm.client is not None:
+                self._batch_runner = batch.OpenAIBatchRunner(self.llm.client)
+            else:
+                self._batch_runner = batch.LocalBatchRunner(self.llm.backend)
+        return self._batch_runner
 
-Original code:
-{code}
-"""
-        return self.llm.generate(prompt)
+    def _prompt(
+        self,
+        code: str,
+        comment: Union[str, List[str]],
+        region: Optional[Tuple[int, int]] = None,
+    ) -> List[Dict[str, str]]:
+        # The file comes before the comment so fixes to the same file share
+        # a longer cacheable prefix
+        if region is not None:
+            code_block = f"Original code (lines {region[0]}-{region[1]} of the file):\n{code}"
+        else:
+            code_block = f"Original code:\n{code}"
+
+        if isinstance(comment, list):
+            numbered = "\n".join(f"{i}. {c}" for i, c in enumerate(comment, 1))
+            return build_messages(
+                FIX_PROMPT,
+                f"{code_block}\n\nReview comments (apply all of them):\n{numbered}\n",
+            )
+
+        return build_messages(
+            FIX_PROMPT,
+            f"{code_block}\n\nReview comment:\n{comment}\n",
+        )
+
+    @staticmethod
+    def _check_fix(content: str):
+        """
+        Reject outputs that cannot be the full file, so the request is
+        escalated to the next model of the fixer's chain.
+        """
+        if not content or not content.strip():
+            raise ValueError("Fix is empty")
+        if content.lstrip().startswith("```"):
+            raise ValueError("Fix is wrapped in markdown")
+
+    def fix(self, code: str, comment: str, region: Optional[Tuple[int, int]] = None) -> str:
+        """
+        Apply one comment to code. With a (start, end) line region, code is
+        that excerpt of the file and the fixed excerpt is returned.
+        """
+        return self.llm.generate(self._prompt(code, comment, region), validate=self._check_fix)
+
+    async def afix(self, code: str, comment: str, region: Optional[Tuple[int, int]] = None) -> str:
+        return await self.async_llm.generate(self._prompt(code, comment, region), validate=self._check_fix)
+
+    def fix_many(self, items: List[Tuple[str, str]]) -> List[Optional[str]]:
+        """
+        Fix independent (code, comment) pairs concurrently. Results are in
+        input order; a pair whose request failed yields None.
+        """
+        prompts = [self._prompt(code, comment) for code, comment in items]
+
+        async def run():
+            try:
+                return await self.async_llm.generate_many(prompts, return_exceptions=True)
+            finally:
+                await transport.aclose_loop_client()
+
+        results = asyncio.run(run())
+
+        fixed = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Fix failed: {result}")
+                fixed.append(None)
+            else:
+                fixed.append(result)
+        return fixed
+
+    def fix_batch(self, items: List[Tuple[str, List[str]]]) -> List[Optional[str]]:
+        """
+        Fix (code, comments) pairs through the batch endpoint: cheaper and
+        outside the interactive rate limits, but may take hours. Each pair
+        is one request that applies all of its comments at once. Results
+        are in input order; a failed request, or an output _check_fix
+        rejects, yields None.
+        """
+        jobs = [
+            (f"fix-{i}", self._prompt(code, list(comments)))
+            for i, (code, comments) in enumerate(items)
+        ]
+        results = batch.run_batch(
+            self.batch_runner,
+            batch.build_requests(routing.models_for("fixer")[0], TEMPERATURE, jobs),
+            poll_interval=settings.BATCH_POLL_INTERVAL,
+            timeout=settings.BATCH_TIMEOUT,
+        )
+
+        fixed = []
+        for custom_id, _ in jobs:
+            content = results.get(custom_id)
+            if content is not None:
+                try:
+                    self._check_fix(content)
+                except ValueError as e:
+                    logger.error(f"Batch fix {custom_id} rejected: {e}")
+                    content = None
+            fixed.append(content)
+        return fixed
@@ -1,10 +1,274 @@
 from ast import Continue
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional
+from devmate.config import settings
+from devmate.core.repo_index import RepoIndex
+from devmate.core.search import BM25Index, MAX_INDEXED_BYTES, score_texts
+from devmate.core.symbols import SymbolIndex
+from devmate.core.tokens import estimate_tokens
+from devmate.logger import get_logger
+from devmate.tools import filesystem
 
 MAX_FILE_SIZE = 4_000  # chars
 MAX_FILES = 10
 
+CHUNK_LINES = 60
+
+
+logger=get_logger("context")
+
+
+
+
+class ContextPacker:
+    """
+    Splits files into chunks, ranks them against the intent and greedily
+    fills a token budget.
+
+    Python files are chunked along AST symbols (functions, methods, class
+    heads) with module-level code in line windows; other files are cut into
+    CHUNK_LINES windows. Once the bodies are placed, leftover budget is
+    spent on one-line signatures of the symbols that did not make it, so
+    the model still sees the shape of each file.
+    """
+
+    def __init__(self, symbols: SymbolIndex, budget: Optional[int]=None):
+        self.symbols=symbols
+        self.budget=budget if budget is not None else settings.CONTEXT_TOKEN_BUDGET
+
+
+    def pack(self, intent: str, files: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Pack {path: content} (in selection order) into a prompt section.
+
+        Returns {"context", "tokens", "budget", "included", "dropped"}; each
+        included/dropped entry describes one chunk by path, line span,
+        token cost and score, and dropped entries carry a "reason".
+        """
+        chunks = []
+        for file_rank, (rel_path, content) in enumerate(files.items()):
+            for chunk in self._chunk(rel_path, content):
+                chunk["file_rank"] = file_rank
+                chunks.append(chunk)
+
+        scores = score_texts(intent, [c["text"] for c in chunks])
+        for chunk, score in zip(chunks, scores):
+            chunk["score"] = round(score, 4)
+
+        chunks.sort(key=lambda c: (-c["score"], c["file_rank"], c["start"]))
+
+        included = []
+        dropped = {}
+        seen = set()
+        opened = set()
+        parents = set()
+        used = 0
+
+        for chunk in chunks:
+            digest = _fingerprint(chunk["text"])
+            if digest in seen:
+                dropped[id(chunk)] = _describe(chunk, "duplicate")
+                continue
+
+            cost = chunk["tokens"] + self._overhead(chunk, opened, parents)
+            if used + cost > self.budget:
+                dropped[id(chunk)] = _describe(chunk, "budget")
+                continue
+
+            seen.add(digest)
+            opened.add(chunk["path"])
+            parents.add((chunk["path"], chunk.get("parent_start")))
+            chunk["included"] = True
+            used += cost
+            included.append(chunk)
+
+        # Signatures for symbols whose bodies did not fit, in files that
+        # are already part of the context.
+        for chunk in chunks:
+            if chunk.get("included") or not chunk.get("signature"):
+                continue
+            if chunk["path"] not in opened:
+                continue
+
+            cost = estimate_tokens(chunk["signature"]) + self._overhead(chunk, opened, parents)
+            if used + cost > self.budget:
+                continue
+
+            parents.add((chunk["path"], chunk.get("parent_start")))
+            chunk["signature_only"] = True
+            used += cost
+            included.append(chunk)
+            if id(chunk) in dropped:
+                dropped[id(chunk)]["signature_kept"] = True
+
+        context = self._render(files, included)
+
+        logger.info(
+            f"Context packed: {len(included)}/{len(chunks)} chunks, "
+            f"{used}/{self.budget} tokens, {len(dropped)} dropped"
+        )
+
+        return {
+            "context": context,
+            "tokens": used,
+            "budget": self.budget,
+            "included": [_describe(c) for c in included if not c.get("signature_only")],
+            "dropped": list(dropped.values()),
+        }
+
+
+    def _overhead(self, chunk: Dict[str, Any], opened: set, parents: set) -> int:
+        """
+        Tokens a chunk costs on top of its own text: the file header for the
+        first chunk of a file, the class line for the first method shown.
+        """
+        cost = 0
+        if chunk["path"] not in opened:
+            cost += estimate_tokens(_file_header(chunk["path"]))
+        if "parent" in chunk and (chunk["path"], chunk["parent_start"]) not in parents:
+            cost += estimate_tokens(chunk["parent"])
+        return cost
+
+
+    def _chunk(self, rel_path: str, content: str) -> List[Dict[str, Any]]:
+        lines = content.splitlines()
+        chunks = []
+        covered = set()
+
+        module = None
+        if rel_path.endswith(".py"):
+            module = self.symbols.outline(rel_path, content)
+
+        for symbol in (module or {}).get("symbols", []):
+            children = symbol["children"]
+
+            if symbol["kind"] == "class" and children:
+                head_end = children[0]["start"] - 1
+                chunks.append(_span(rel_path, lines, symbol["start"], head_end))
+                covered.update(range(symbol["start"], head_end + 1))
+
+                for child in children:
+                    chunk = _span(rel_path, lines, child["start"], child["end"])
+                    indent = _indent(lines[child["start"] - 1])
+                    chunk["signature"] = f"{indent}{child['signature']} ..."
+                    chunk["parent"] = symbol["signature"]
+                    chunk["parent_start"] = symbol["start"]
+                    chunks.append(chunk)
+                    covered.update(range(child["start"], child["end"] + 1))
+            else:
+                chunk = _span(rel_path, lines, symbol["start"], symbol["end"])
+                chunk["signature"] = f"{symbol['signature']} ..."
+                chunks.append(chunk)
+                covered.update(range(symbol["start"], symbol["end"] + 1))
+
+        # Everything outside a symbol (imports, constants, prose) in windows
+        start = None
+        for lineno in range(1, len(lines) + 2):
+            inside = lineno <= len(lines) and lineno not in covered
+            if inside and start is None:
+                start = lineno
+            if start is not None and (not inside or lineno - start == CHUNK_LINES):
+                chunks.append(_span(rel_path, lines, start, lineno - 1))
+                start = lineno if inside else None
+
+        # Very large symbols are split so part of them can still fit
+        result = []
+        for chunk in chunks:
+            if not chunk["text"].strip():
+                continue
+            if chunk["end"] - chunk["start"] + 1 <= 2 * CHUNK_LINES:
+                result.append(chunk)
+                continue
+            for start in range(chunk["start"], chunk["end"] + 1, CHUNK_LINES):
+                part = _span(rel_path, lines, start, min(start + CHUNK_LINES - 1, chunk["end"]))
+                for key in ("parent", "parent_start"):
+                    if key in chunk:
+                        part[key] = chunk[key]
+                result.append(part)
+
+        return result
+
+
+    def _render(self, files: Dict[str, str], included: List[Dict[str, Any]]) -> str:
+        by_path: Dict[str, List[Dict[str, Any]]] = {}
+        for chunk in included:
+            by_path.setdefault(chunk["path"], []).append(chunk)
+
+        sections = []
+        for rel_path in files:
+            chunks = by_path.get(rel_path)
+            if not chunks:
+                continue
+
+            chunks.sort(key=lambda c: c["start"])
+            lines = files[rel_path].splitlines()
+            body = []
+            last_end = 0
+            parents = set()
+
+            for chunk in chunks:
+                skipped = lines[last_end:chunk["start"] - 1]
+                if body and any(line.strip() for line in skipped):
+                    body.append("...")
+                elif body and skipped:
+                    body.append("")
+
+                parent_start = chunk.get("parent_start")
+                if parent_start is not None and parent_start not in parents:
+                    if not any(c["start"] == parent_start for c in chunks):
+                        body.append(chunk["parent"])
+                    parents.add(parent_start)
+
+                if chunk.get("signature_only"):
+                    body.append(chunk["signature"])
+                else:
+                    body.append(chunk["text"])
+                last_end = chunk["end"]
+
+            sections.append(_file_header(rel_path) + "\n" + "\n".join(body))
+
+        return "\n\n".join(sections)
+
+
+
+def _span(rel_path: str, lines: List[str], start: int, end: int) -> Dict[str, Any]:
+    text = "\n".join(lines[start - 1:end])
+    return {
+        "path": rel_path,
+        "start": start,
+        "end": end,
+        "text": text,
+        "tokens": estimate_tokens(text) + 1,
+    }
+
+
+def _indent(line: str) -> str:
+    return line[:len(line) - len(line.lstrip())]
+
+
+def _file_header(rel_path: str) -> str:
+    return f"--- FILE: {rel_path} ---"
+
+
+def _fingerprint(text: str) -> str:
+    normalized = "\n".join(line.strip() for line in text.splitlines() if line.strip())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def _describe(chunk: Dict[str, Any], reason: Optional[str]=None) -> Dict[str, Any]:
+    entry = {
+        "path": chunk["path"],
+        "start": chunk["start"],
+        "end": chunk["end"],
+        "tokens": chunk["tokens"],
+        "score": chunk["score"],
+    }
+    if reason:
+        entry["reason"] = reason
+    return entry
+
 
 
 class RepoContextBuilder:
@@ -15,8 +279,14 @@ class RepoContextBuilder:
     """
 
 
-    def __init__(self, root: str="."):
+    def __init__(self, root: str=".", index: Optional[RepoIndex]=None, file_cache=None):
         self.root=Path(root)
+        # Optional run-scoped FileCache shared with the executor
+        self.file_cache=file_cache
+        self.index=index or RepoIndex(root)
+        self.search=BM25Index(self.index)
+        self.symbols=SymbolIndex(root)
+        self.last_pack=None
 
 
     def build(self) -> str:
@@ -40,51 +310,197 @@ class RepoContextBuilder:
 
     
     def _select_files(self) -> List[Path]:
-        candidates=[]
-
-
-        for path in self.root.rglob("*"):
-            if not path.is_file():
-                continue
-
-
-            if path.suffix not in {".py", ".md", ".txt"}:
-                continue
-
-
-            if path.stat().st_size > MAX_FILE_SIZE:
-                continue
-
+        return [self.root / rel_path for rel_path in self.candidate_paths()]
+
+
+
+    def candidate_paths(self) -> List[str]:
+        """
+        Candidate files for context, served from the persistent repo index.
+        """
+        self.index.refresh()
+        self.index.save()
+
+        candidates = self.index.paths(
+            suffixes=settings.CONTEXT_SUFFIXES,
+            max_size=MAX_FILE_SIZE,
+        )
+        return candidates[:MAX_FILES]
+
+
+
+    def rank_files(self, intent: str, top_k: int) -> List[str]:
+        """
+        Rank repository files against the intent with the local BM25 index.
+        """
+        self.index.refresh()
+
+        self.search.refresh(
+            self.index.paths(
+                suffixes=settings.CONTEXT_SUFFIXES,
+                max_size=MAX_INDEXED_BYTES,
+            )
+        )
+        self.search.save()
+        self.index.save()
+
+        return [path for path, _ in self.search.search(intent, top_k=top_k)]
+
+
+
+    def outline(self, intent: Optional[str]=None, budget: Optional[int]=None) -> Dict[str, Any]:
+        """
+        Compact map of the repository: one line per file with its top-level
+        classes and functions, cut off at the token budget.
+
+        With an intent, files are listed most relevant first (BM25), then
+        the rest in path order. Sources are only read and parsed for files
+        that reach the budget check, a batch at a time.
+
+        Returns {"text", "paths"}, where paths are the files listed.
+        """
+        budget = budget or settings.CONTEXT_TOKEN_BUDGET
+
+        self.index.refresh()
+        paths = self.index.paths(
+            suffixes=settings.CONTEXT_SUFFIXES,
+            max_size=MAX_INDEXED_BYTES,
+        )
+        if intent:
+            ranked = self.rank_files(intent, top_k=len(paths))
+            seen = set(ranked)
+            paths = ranked + [p for p in paths if p not in seen]
+
+        self.symbols.load()
+
+        lines = []
+        listed = []
+        used = 0
+        batch_size = max(1, settings.READ_WORKERS)
+        full = False
+
+        for start in range(0, len(paths), batch_size):
+            batch = paths[start:start + batch_size]
+
+            # Only files whose cached outline is stale need to be read
+            stale = [
+                p for p in batch
+                if p.endswith(".py")
+                and (self.symbols.entries.get(p) or {}).get("hash") != self.index.content_hash(p)
+            ]
+            sources = self.read_bulk(stale, max_bytes=MAX_INDEXED_BYTES)
+
+            for rel_path in batch:
+                names = []
+                if rel_path in sources:
+                    module = self.symbols.outline(rel_path, sources[rel_path])
+                else:
+                    module = (self.symbols.entries.get(rel_path) or {}).get("module")
+
+                for symbol in (module or {}).get("symbols", []):
+                    names.append(symbol["name"] if symbol["kind"] == "class" else f"{symbol['name']}()")
+
+                line = f"{rel_path}: {', '.join(names)}" if names else rel_path
+                cost = estimate_tokens(line)
+                if used + cost > budget:
+                    logger.info(f"Outline truncated at {len(listed)} of {len(paths)} files")
+                    full = True
+                    break
+
+                lines.append(line)
+                listed.append(rel_path)
+                used += cost
+
+            if full:
+                break
 
-            candidates.append(path)
+        self.symbols.save()
+        self.index.save()
 
-            if len(candidates) >= MAX_FILES:
-                break
+        return {"text": "\n".join(lines), "paths": listed}
 
 
-        return candidates
 
+    def read_files(self, paths: List[str], intent: Optional[str]=None) -> str:
+        """
+        Render files as prompt context.
 
+        With an intent, files are chunked, ranked and packed into the
+        context token budget (see pack()); without one, each file is
+        truncated at MAX_FILE_SIZE.
+        """
+        if intent:
+            return self.pack(paths, intent)["context"]
 
-    def read_files(self, paths: List[str]) -> str:
         sections = []
 
-        for rel_path in paths:
-            path = self.root / rel_path
-            if not path.exists() or not path.is_file():
-                continue
+        # UTF-8 needs at most 4 bytes per character
+        files = self.read_bulk(paths, max_bytes=MAX_FILE_SIZE * 4)
 
-            try:
-                content = path.read_text(encoding="utf-8")
-                content = content[:MAX_FILE_SIZE]
-                sections.append(
-                    f"--- FILE: {rel_path} ---\n{content}"
-                )
-            except Exception:
-                continue
+        for rel_path, content in files.items():
+            content = content[:MAX_FILE_SIZE]
+            sections.append(
+                f"--- FILE: {rel_path} ---\n{content}"
+            )
 
         return "\n\n".join(sections)
 
 
 
+    def read_bulk(self, paths: List[str], max_bytes: Optional[int]=None) -> Dict[str, str]:
+        """
+        Read many files concurrently on a bounded thread pool.
+
+        Returns {path: text} in the order given. Missing, unreadable, binary
+        and non-UTF-8 files are left out and logged.
+        """
+        paths = list(dict.fromkeys(paths))
+        if not paths:
+            return {}
 
+        def read(rel_path):
+            path = str(self.root / rel_path)
+            try:
+                if self.file_cache is not None:
+                    content = self.file_cache.read_text(path, max_bytes)
+                else:
+                    content = filesystem.read_text(path, max_bytes)
+            except FileNotFoundError:
+                logger.info(f"Skipping missing file: {rel_path}")
+                return None
+            except OSError as e:
+                logger.warning(f"Skipping unreadable file {rel_path}: {e}")
+                return None
+
+            if content is None:
+                logger.info(f"Skipping binary or non-UTF-8 file: {rel_path}")
+            return content
+
+        workers = max(1, min(settings.READ_WORKERS, len(paths)))
+        if workers == 1:
+            contents = [read(p) for p in paths]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                contents = list(pool.map(read, paths))
+
+        return {
+            rel_path: content
+            for rel_path, content in zip(paths, contents)
+            if content is not None
+        }
+
+
+
+    def pack(self, paths: List[str], intent: str, budget: Optional[int]=None) -> Dict[str, Any]:
+        """
+        Pack the given files into a token-budgeted context for the intent.
+
+        The report (what was included and dropped) is also kept on
+        self.last_pack for callers that only use read_files().
+        """
+        files = self.read_bulk(paths, max_bytes=MAX_INDEXED_BYTES)
+
+        self.last_pack = ContextPacker(self.symbols, budget).pack(intent, files)
+        self.symbols.save()
+
+        return self.last_pack
@@ -1,4 +1,7 @@
-from typing import  Any, Dict
+import difflib
+import os
+import threading
+from typing import  Any, Dict, List, Optional, Tuple
 from devmate.logger import get_logger
 from devmate.tools import filesystem, git, github
 from pathlib import Path
@@ -12,6 +15,49 @@ from pathlib import Path
 logger=get_logger("executor")
 
 
+# Actions with no side effects, safe to run before the whole plan is known
+READ_ONLY_ACTIONS = {
+    "noop",
+    "read_file",
+    "list_files",
+    "git_status",
+    "git_diff",
+    "github_list_prs",
+    "github_get_pr",
+    "github_get_pr_comments",
+}
+
+
+# Lines either side of "line" when a read_file window has no "context"
+DEFAULT_CONTEXT_LINES = 20
+
+
+def _non_negative(payload: Dict[str, Any], key: str, default: Optional[int]) -> Optional[int]:
+    value = payload.get(key, default)
+    if value is None:
+        return None
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise ValueError(f"'{key}' must be a non-negative integer")
+    return value
+
+
+def _line_range(payload: Dict[str, Any]) -> Optional[Tuple[int, Optional[int]]]:
+    """
+    (start, end) lines requested by a payload, or None for no line range.
+    """
+    if "line" in payload:
+        line = _non_negative(payload, "line", None)
+        if line is None:
+            raise ValueError("'line' must be a non-negative integer")
+        context = _non_negative(payload, "context", DEFAULT_CONTEXT_LINES)
+        return max(1, line - context), line + context
+
+    if "start_line" in payload or "end_line" in payload:
+        return _non_negative(payload, "start_line", 1), _non_negative(payload, "end_line", None)
+
+    return None
+
+
 class Executor:
     """
     Executes concrete actions requested by higher-level components
@@ -20,6 +66,91 @@ class Executor:
     This is the ONLY layer allowed to cause side effects.
     """
 
+    def __init__(self, file_cache=None):
+        # Optional run-scoped FileCache shared with the context builder
+        self.file_cache=file_cache
+
+        # Staged writes {path: content} while a transaction is open
+        self.transaction: Optional[Dict[str, str]]=None
+        self._transaction_lock=threading.Lock()
+
+    # ------------------------
+    # Write transactions
+    # ------------------------
+
+    def begin(self):
+        """
+        Stage write_file actions in memory instead of writing them. Repeated
+        writes to a path are coalesced, and read_file sees staged content.
+        """
+        with self._transaction_lock:
+            if self.transaction is None:
+                self.transaction={}
+
+    def flush(self)-> List[str]:
+        """
+        Write all staged files to disk (see filesystem.write_files_atomic)
+        and keep the transaction open for further writes. Returns the paths
+        whose content changed.
+        """
+        with self._transaction_lock:
+            if not self.transaction:
+                return []
+
+            staged=self.transaction
+            written=filesystem.write_files_atomic(staged)
+            self.transaction={}
+
+        if self.file_cache is not None:
+            for path in written:
+                self.file_cache.put(path, staged[path])
+
+        logger.info(f"Flushed {len(written)} of {len(staged)} staged file(s)")
+        return written
+
+    def commit_transaction(self)-> List[str]:
+        """
+        Flush staged writes and go back to writing straight to disk.
+        """
+        written=self.flush()
+        with self._transaction_lock:
+            self.transaction=None
+        return written
+
+    def discard(self):
+        """
+        Drop staged writes without touching the disk.
+        """
+        with self._transaction_lock:
+            if self.transaction:
+                logger.warning(f"Discarding {len(self.transaction)} staged file(s)")
+            self.transaction=None
+
+    def _staged_diff(self)-> str:
+        """
+        Unified diff of the staged writes against the files on disk,
+        computed in memory so nothing is written before a commit.
+        """
+        parts=[]
+        for path, content in dict(self.transaction or {}).items():
+            try:
+                current=filesystem.read_file(path)
+            except FileNotFoundError:
+                current=""
+            rel_path=os.path.relpath(path)
+            parts.extend(difflib.unified_diff(
+                current.splitlines(keepends=True),
+                content.splitlines(keepends=True),
+                fromfile=f"a/{rel_path}",
+                tofile=f"b/{rel_path}",
+            ))
+        return "".join(parts)
+
+    def _staged(self, path: str)-> Optional[str]:
+        if self.transaction is None:
+            return None
+        return self.transaction.get(os.path.abspath(path))
+
     def execute(self, action:str, payload: Dict[str, Any] | None=None)-> Any:
         """
         Execute a single action with an optional payload.
@@ -73,20 +204,58 @@ class Executor:
 
 
     def _handle_read_file(self, payload):
+        """
+        Read a file, or part of it.
+        Payload:
+            { "path": str }                                   whole file
+            { "path": str, "offset": int, "length": int }     byte range
+            { "path": str, "start_line": int, "end_line": int }
+            { "path": str, "line": int, "context": int }      window around a line
+        Lines are 1-based and inclusive.
+        """
         path = payload.get("path")
         if not path:
             raise ValueError("read_file requires 'path'")
 
-        p = Path(path)
+        staged = self._staged(path)
+        lines = _line_range(payload)
+        byte_range = "offset" in payload or "length" in payload
 
-        if not p.exists():
+        if staged is None and not Path(path).exists():
             return {
             "content": "",
             "exists": False
             }
 
+        if lines is not None:
+            if staged is not None:
+                content, start, end, total = filesystem.slice_lines(staged, *lines)
+            else:
+                content, start, end, total = filesystem.read_lines(path, *lines)
+            return {
+                "content": content,
+                "exists": True,
+                "start_line": start,
+                "end_line": end,
+                "total_lines": total,
+            }
+
+        if byte_range:
+            offset = _non_negative(payload, "offset", 0)
+            length = _non_negative(payload, "length", None)
+            if staged is not None:
+                data = staged.encode("utf-8")
+                end = len(data) if length is None else offset + length
+                content, size = data[offset:end].decode("utf-8", errors="replace"), len(data)
+            else:
+                content, size = filesystem.read_range(path, offset, length)
+            return {"content": content, "exists": True, "offset": offset, "size": size}
+
+        if staged is not None:
+            return {"content": staged, "exists": True}
+
         return {
-            "content": p.read_text(encoding="utf-8"),
+            "content": filesystem.read_file(path, cache=self.file_cache),
             "exists": True
         }
 
@@ -95,12 +264,55 @@ class Executor:
         content = payload.get("content", "")
         if not path:
             raise ValueError("write_file requires 'path'")
-        filesystem.write_file(path, content)
-        return {"written": path}
+
+        # With a line range, content replaces just those lines
+        lines = _line_range(payload)
+        if lines is not None:
+            start, end = lines
+            if end is None:
+                raise ValueError("write_file with 'start_line' requires 'end_line'")
+            current = self._staged(path)
+            if current is None:
+                current = filesystem.read_file(path, cache=self.file_cache)
+            content = filesystem.splice_lines(current, start, end, content)
+
+        with self._transaction_lock:
+            if self.transaction is not None:
+                staged = self._staged(path)
+                if staged is not None:
+                    changed = staged != content
+                else:
+                    changed = not filesystem.same_content(path, content.encode("utf-8"))
+
+                # Keyed by absolute path so differently spelled paths coalesce
+                if changed:
+                    self.transaction[os.path.abspath(path)] = content
+                return {"written": path, "changed": changed, "staged": True}
+
+        changed = filesystem.write_file(path, content)
+        if changed and self.file_cache is not None:
+            self.file_cache.put(path, content)
+        return {"written": path, "changed": changed}
 
     def _handle_list_files(self, payload):
         path = payload.get("path", ".")
-        return {"files": filesystem.list_files(path)}
+        files = filesystem.list_files(path)
+        result = {"files": files}
+
+        # New files staged under the directory are not on disk yet
+        staged = []
+        for staged_path in self.transaction or {}:
+            rel_path = os.path.relpath(staged_path, os.path.abspath(path))
+            if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep):
+                continue
+            entry = str(Path(path) / rel_path.split(os.sep)[0])
+            if entry not in files and entry not in staged:
+                staged.append(entry)
+
+        if staged:
+            files.extend(staged)
+            result["staged"] = staged
+        return result
 
 
 
@@ -108,18 +320,26 @@ class Executor:
 
 
     def _handle_git_status(self, payload):
+        # git only sees the disk; staged writes are reported alongside
         output = git.status()
-        return {"status": output}
+        result = {"status": output}
+        if self.transaction:
+            result["staged"] = [os.path.relpath(p) for p in self.transaction]
+        return result
 
     def _handle_git_diff(self, payload):
         output = git.diff()
-        return {"diff": output}
+        result = {"diff": output}
+        if self.transaction:
+            result["staged_diff"] = self._staged_diff()
+        return result
 
 
     def _handle_git_commit(self, payload):
         message = payload.get("message")
         if not message:
             raise ValueError("git_commit requires 'message'")
+        self.flush()
         return {"commit": git.commit(message)}
 
 
@@ -0,0 +1,90 @@
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from devmate.logger import get_logger
+from devmate.tools import filesystem
+
+
+logger = get_logger("file_cache")
+
+
+class FileCache:
+    """
+    Run-scoped cache of decoded file contents.
+
+    Entries are keyed on the absolute path and validated against the file's
+    (mtime, size) on every lookup, so a file changed behind our back is
+    simply re-read. Writers should call put() with the content they wrote
+    so the next read is served from memory.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Tuple[int, int], Optional[str]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.abspath(path)
+
+    @staticmethod
+    def _signature(path: str) -> Tuple[int, int]:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def read_text(self, path: str, max_bytes: Optional[int] = None) -> Optional[str]:
+        """
+        Cached filesystem.read_text(). Only complete reads are cached; a
+        cached full read also serves later bounded reads.
+        """
+        key = self._key(path)
+        sig = self._signature(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == sig:
+                self.hits += 1
+                content = entry[1]
+                if content is not None and max_bytes is not None:
+                    return filesystem.truncate_text(content, max_bytes)
+                return content
+            self.misses += 1
+
+        content = filesystem.read_text(path, max_bytes)
+
+        if max_bytes is None or sig[1] <= max_bytes:
+            with self._lock:
+                self._entries[key] = (sig, content)
+
+        return content
+
+    def put(self, path: str, content: str):
+        """
+        Record content just written to path.
+        """
+        key = self._key(path)
+        try:
+            sig = self._signature(path)
+        except OSError:
+            self.invalidate(path)
+            return
+
+        with self._lock:
+            self._entries[key] = (sig, content)
+
+    def invalidate(self, path: str):
+        with self._lock:
+            self._entries.pop(self._key(path), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,129 @@
+import re
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+
+from devmate.core.plan_cache import normalize_intent
+from devmate.logger import get_logger
+
+
+logger = get_logger("router")
+
+Plan = List[Dict[str, Any]]
+
+_POLITE = r"(?:please |can you |could you )?"
+_REPO = r"(?P<repo>[\w.-]+/[\w.-]+)"
+_PR = r"(?:pr|pull request) #?(?P<pr>\d+)"
+_IN = r"(?:in|for|of|on|from)"
+
+
+def _route(pattern: str) -> Pattern:
+    return re.compile(f"^{_POLITE}{pattern}$", re.IGNORECASE)
+
+
+# Intent shapes with a fixed plan, tried in order. Anything more open-ended
+# ("read the readme", "explain ...") falls through to the LLM planner.
+ROUTES: List[Tuple[Pattern, Callable[[Dict[str, str]], Plan]]] = [
+    (
+        _route(r"(?:show |check |get )?(?:the )?(?:git |repo |repository )?status(?: of the repo(?:sitory)?)?"),
+        lambda m: [{"action": "git_status"}],
+    ),
+    (
+        _route(r"(?:show |get |view )?(?:me )?(?:the )?(?:git )?diff"),
+        lambda m: [{"action": "git_diff"}],
+    ),
+    (
+        _route(r"(?:list|show) (?:the )?files(?: in (?P<path>[\w./-]+))?"),
+        lambda m: [{"action": "list_files", "payload": {"path": m["path"] or "."}}],
+    ),
+    (
+        _route(r"(?:read|show|cat|open) (?:the )?(?:file )?(?P<path>[\w./-]*\w\.\w+)"),
+        lambda m: [{"action": "read_file", "payload": {"path": m["path"]}}],
+    ),
+    (
+        _route(rf"(?:list|show|get) (?:the |all )?(?:open )?(?:prs|pull requests) {_IN} {_REPO}"),
+        lambda m: [{"action": "github_list_prs", "payload": {"repo": m["repo"]}}],
+    ),
+    (
+        _route(rf"(?:list|show|get) (?:the |all )?(?:review )?comments {_IN} {_PR} {_IN} {_REPO}"),
+        lambda m: [{"action": "github_get_pr_comments", "payload": {"repo": m["repo"], "pr": int(m["pr"])}}],
+    ),
+    (
+        _route(rf"fix (?:the |all )?review comments {_IN} {_PR} {_IN} {_REPO}"),
+        lambda m: [{"action": "github_list_review_comments", "payload": {"repo": m["repo"], "pr": int(m["pr"])}}],
+    ),
+    (
+        _route(rf"(?:show|get|view) (?:the )?{_PR} {_IN} {_REPO}"),
+        lambda m: [{"action": "github_get_pr", "payload": {"repo": m["repo"], "pr": int(m["pr"])}}],
+    ),
+]
+
+
+# Keyword vocabularies for argument-free intents the patterns miss, such
+# as "what changed in the working tree"
+CLASSIFIER_LABELS: Dict[str, Tuple[set, set]] = {
+    # label: (keywords that vote for it, other words it tolerates)
+    "git_status": (
+        {"status", "modified", "untracked", "staged", "changed", "files"},
+        {"working", "tree", "repo", "repository", "git", "state", "uncommitted"},
+    ),
+    "git_diff": (
+        {"diff", "patch", "changes"},
+        {"changed", "working", "tree", "repo", "repository", "git", "code", "uncommitted", "lines"},
+    ),
+}
+
+STOPWORDS = {
+    "a", "an", "the", "me", "my", "what", "which", "is", "are", "have", "has",
+    "show", "list", "get", "view", "display", "in", "of", "current", "all",
+    "please", "can", "could", "you", "there", "any", "been",
+}
+
+
+def classify(intent: str) -> Optional[str]:
+    """
+    Tiny keyword classifier: a label wins only if every word of the intent
+    is a stopword or in its vocabulary and it has strictly the most keyword
+    hits. Returns the action or None.
+    """
+    words = set(re.findall(r"[a-z]+", normalize_intent(intent))) - STOPWORDS
+    if not words:
+        return None
+
+    scores = {}
+    for label, (keywords, tolerated) in CLASSIFIER_LABELS.items():
+        if words <= keywords | tolerated:
+            scores[label] = len(words & keywords)
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    if not ranked or ranked[0][1] == 0:
+        return None
+    if len(ranked) > 1 and ranked[1][1] == ranked[0][1]:
+        return None
+    return ranked[0][0]
+
+
+class IntentRouter:
+    """
+    Maps well-known intent shapes straight to plans without an LLM call.
+    """
+
+    def __init__(self, use_classifier: bool = False):
+        self.use_classifier = use_classifier
+
+    def route(self, intent: str) -> Optional[Plan]:
+        # Case is kept for paths and repo names; the patterns ignore it
+        text = re.sub(r"\s+", " ", intent).strip().rstrip(".!?").strip()
+
+        for pattern, build in ROUTES:
+            match = pattern.match(text)
+            if match:
+                plan = build(match.groupdict())
+                logger.info(f"Routed intent locally to {plan[0]['action']}")
+                return plan
+
+        if self.use_classifier:
+            action = classify(text)
+            if action is not None:
+                logger.info(f"Classified intent locally as {action}")
+                return [{"action": action}]
+
+        return None
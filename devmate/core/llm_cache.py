@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from devmate.config import settings
+from devmate.logger import get_logger
+
+
+logger = get_logger("llm_cache")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+
+
+def default_cache_path() -> str:
+    base = os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "devmate", "llm_cache.sqlite3")
+
+
+class ResponseCache:
+    """
+    Opt-in, disk-backed cache of LLM responses in SQLite.
+
+    Keys hash (model, temperature, prompt). Entries expire after `ttl`
+    seconds, and the least recently used ones are evicted once the cache
+    holds more than `max_entries` entries or `max_bytes` of responses.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: float = 86_400,
+        max_entries: int = 1_000,
+        max_bytes: int = 50_000_000,
+    ):
+        self.path = path or default_cache_path()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+
+    @classmethod
+    def from_settings(cls) -> Optional["ResponseCache"]:
+        """
+        Build the cache configured in settings, or None when it is disabled.
+        """
+        if not settings.LLM_CACHE:
+            return None
+
+        return cls(
+            path=settings.LLM_CACHE_PATH,
+            ttl=settings.LLM_CACHE_TTL,
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            max_bytes=settings.LLM_CACHE_MAX_BYTES,
+        )
+
+    @staticmethod
+    def key(model: str, temperature: float, prompt: Any) -> str:
+        payload = json.dumps([model, temperature, prompt], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str):
+        now = time.time()
+        size = len(response.encode("utf-8"))
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        self._conn.execute(
+            "DELETE FROM responses WHERE created < ?", (now - self.ttl,)
+        )
+
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall()
+
+        evicted = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            count -= 1
+            total -= size
+
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        logger.info(f"Evicted {len(evicted)} cached LLM response(s)")
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": count,
+            "bytes": total,
+        }
@@ -1,36 +1,387 @@
-from openai import OpenAI
+import asyncio
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+import openai
+from openai import AsyncOpenAI, OpenAI
 from devmate.config import settings
 from devmate.logger import get_logger
+from devmate.core.llm_cache import ResponseCache
+from devmate.core import backends, routing, telemetry, transport
+from devmate.core.backends import LLMBackend, OpenAIBackend
+from devmate.core.rate_limit import PRIORITY_FIX, PRIORITY_PLANNING, RateLimiter, shared_limiter
 
 logger=get_logger("llm")
 
+# Default model; per-task chains are configured in settings (see routing)
+MODEL="gpt-4o-mini"
+TEMPERATURE=0.2
+
+# Failures that move a request on to the next model in its chain
+FALLBACK_ERRORS=(ValueError, openai.APIError)
+
+# A bare string is sent as a single user message
+Prompt=Union[str, List[Dict[str, str]]]
+
+
+def build_messages(system: str, user: str)-> List[Dict[str, str]]:
+    """
+    Static instructions go in the system message and everything per-call in
+    the user message, so the prefix is byte-identical across calls and can
+    be served from the provider's prompt cache.
+    """
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user},
+    ]
+
+
+def _as_messages(prompt: Prompt)-> List[Dict[str, str]]:
+    if isinstance(prompt, str):
+        return [
+            {
+                "role": "user",
+                "content":  prompt
+            }
+        ]
+    return list(prompt)
+
+
+def _usage(response: Any)-> Dict[str, int]:
+    """
+    Prompt, cached-prefix and completion token counts of a response.
+    """
+    usage=getattr(response, "usage", None)
+    details=getattr(usage, "prompt_tokens_details", None)
+    if isinstance(details, dict):
+        cached=details.get("cached_tokens")
+    else:
+        cached=getattr(details, "cached_tokens", None)
+
+    counts={
+        "prompt_tokens": getattr(usage, "prompt_tokens", None),
+        "cached_tokens": cached,
+        "completion_tokens": getattr(usage, "completion_tokens", None),
+    }
+    return {k: v if isinstance(v, int) else 0 for k, v in counts.items()}
+
+
+def _report(
+    component: str,
+    started: float,
+    model: str=MODEL,
+    response: Any=None,
+    ttft: Optional[float]=None,
+    cache_hit: bool=False,
+    error: Optional[str]=None,
+    totals: Optional[Dict[str, int]]=None,
+):
+    """
+    Record one call in the active run's telemetry and the client's totals.
+    """
+    counts=_usage(response) if response is not None else {}
+    if totals is not None:
+        for name, value in counts.items():
+            totals[name]+=value
+
+    record=telemetry.record_call(
+        component,
+        model,
+        time.perf_counter() - started,
+        ttft=ttft,
+        cache_hit=cache_hit,
+        error=error,
+        **counts,
+    )
+    logger.info(
+        f"llm call component={component} model={model} latency={record['latency']}s "
+        f"prompt={record['prompt_tokens']} cached={record['cached_tokens']} "
+        f"completion={record['completion_tokens']}"
+    )
+
+
 class LLMClient:
     """
     Thin wrapper around the OpenAI client.
     This is the ONLY place where we talk to an LLM.
     """
 
-    def __init__(self):
-        settings.validate()
-        self.client=OpenAI(api_key=settings.OPENAI_API_KEY)
+    def __init__(
+        self,
+        cache: Optional[ResponseCache]=None,
+        limiter: Optional[RateLimiter]=None,
+        priority: int=PRIORITY_PLANNING,
+        component: str="llm",
+        backend: Optional[LLMBackend]=None,
+    ):
+        self.client=None
+        self.backend=backend or backends.from_settings()
+
+        if self.backend is None:
+            settings.validate()
+            # Retries are owned by the rate limiter
+            self.client=OpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                http_client=transport.http_client(),
+                max_retries=0,
+            )
+            self.backend=backends.with_recording(OpenAIBackend(client=self.client))
+
+        self.cache=cache if cache is not None else ResponseCache.from_settings()
+        self.limiter=limiter or shared_limiter()
+        self.priority=priority
+        self.component=component
+        self.usage={"prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0}
 
-    def generate(self, prompt: str)-> str:
+    def generate(
+        self,
+        prompt: Prompt,
+        component: Optional[str]=None,
+        validate: Optional[Callable[[str], Any]]=None,
+    )-> str:
         """
-        Simple text generation.
+        Simple text generation. `prompt` is a string or a list of chat
+        messages (see build_messages()); `component` selects the model chain
+        and labels the call in telemetry, defaulting to the client's own.
+
+        `validate` may raise ValueError to reject an output; the request is
+        then escalated to the next model in the chain, as it is on API
+        errors. The last model's failure is raised.
         """
+        component=component or self.component
+        models=routing.models_for(component)
+
+        for i, model in enumerate(models):
+            try:
+                return self._complete(model, prompt, component, validate)
+            except FALLBACK_ERRORS as e:
+                if i == len(models) - 1:
+                    raise
+                logger.warning(f"{component}: {model} failed ({e}); escalating to {models[i + 1]}")
+
+    def _complete(self, model: str, prompt: Prompt, component: str, validate: Optional[Callable[[str], Any]])-> str:
+        started=time.perf_counter()
+
+        key=None
+        if self.cache is not None:
+            key=self.cache.key(model, TEMPERATURE, prompt)
+            cached=self.cache.get(key)
+            if cached is not None:
+                logger.info(f"llm cache hit {self.cache.hits}/{self.cache.hits + self.cache.misses}")
+                _report(component, started, model, cache_hit=True)
+                return cached
 
         logger.info("sending prompt to llm")
 
-        response=self.client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "user",
-                    "content":  prompt
-                }
-            ],
-            temperature=0.2,
+        try:
+            response=self.limiter.call(
+                lambda: self.backend.create(
+                    model=model,
+                    messages=_as_messages(prompt),
+                    temperature=TEMPERATURE,
+                ),
+                prompt=prompt,
+                priority=self.priority,
+            )
+        except Exception as e:
+            _report(component, started, model, error=type(e).__name__)
+            raise
+
+        _report(component, started, model, response=response, totals=self.usage)
+
+        content=response.choices[0].message.content
+
+        # Only outputs that passed validation are cached
+        if validate is not None:
+            validate(content)
+
+        if self.cache is not None and content is not None:
+            self.cache.put(key, content)
+
+        return content
+
+    def stream(
+        self,
+        prompt: Prompt,
+        component: Optional[str]=None,
+        validate: Optional[Callable[[str], Any]]=None,
+    )-> Iterator[str]:
+        """
+        Yield the completion text as it is generated. Streams are served by
+        the first model of the component's chain only.
+
+        `validate` is called on the full text once the stream ends; the
+        output is only cached if it passes, and its ValueError is raised.
+        """
+        component=component or self.component
+        model=routing.models_for(component)[0]
+        started=time.perf_counter()
+
+        key=None
+        if self.cache is not None:
+            key=self.cache.key(model, TEMPERATURE, prompt)
+            cached=self.cache.get(key)
+            if cached is not None:
+                _report(component, started, model, cache_hit=True)
+                yield cached
+                return
+
+        logger.info("streaming prompt to llm")
+
+        response=self.limiter.call(
+            lambda: self.backend.create(
+                model=model,
+                messages=_as_messages(prompt),
+                temperature=TEMPERATURE,
+                stream=True,
+            ),
+            prompt=prompt,
+            priority=self.priority,
+        )
+
+        parts=[]
+        ttft=None
+        for chunk in response:
+            if not chunk.choices:
+                continue
+            delta=chunk.choices[0].delta.content
+            if delta:
+                if ttft is None:
+                    ttft=time.perf_counter() - started
+                parts.append(delta)
+                yield delta
+
+        # Streamed responses carry no usage in this API version
+        _report(component, started, model, ttft=ttft)
+
+        content="".join(parts)
+
+        # Only outputs that passed validation are cached
+        if validate is not None:
+            validate(content)
+
+        if self.cache is not None:
+            self.cache.put(key, content)
+
+
+class AsyncLLMClient:
+    """
+    Async counterpart of LLMClient for fanning out many requests.
+
+    At most `max_concurrency` requests are in flight at once. The underlying
+    AsyncOpenAI client and the semaphore are bound to the running event loop
+    and recreated when used from a new one.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int]=None,
+        cache: Optional[ResponseCache]=None,
+        limiter: Optional[RateLimiter]=None,
+        priority: int=PRIORITY_FIX,
+        component: str="llm",
+        backend: Optional[LLMBackend]=None,
+    ):
+        self.backend=backend or backends.from_settings()
+        # Without an explicit backend, an OpenAI one is bound per event loop
+        self._own_backend=self.backend is None
+        if self._own_backend:
+            settings.validate()
+
+        self.max_concurrency=max_concurrency or settings.LLM_MAX_CONCURRENCY
+        if self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.cache=cache if cache is not None else ResponseCache.from_settings()
+        self.limiter=limiter or shared_limiter()
+        self.priority=priority
+        self.component=component
+        self.usage={"prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0}
+        self.client=None
+        self._loop=None
+        self._semaphore=None
+
+    def _bind(self):
+        loop=asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._own_backend:
+                self.client=AsyncOpenAI(
+                    api_key=settings.OPENAI_API_KEY,
+                    http_client=transport.async_http_client(),
+                    max_retries=0,
+                )
+                self.backend=backends.with_recording(OpenAIBackend(async_client=self.client))
+            self._semaphore=asyncio.Semaphore(self.max_concurrency)
+            self._loop=loop
+
+    async def generate(
+        self,
+        prompt: Prompt,
+        component: Optional[str]=None,
+        validate: Optional[Callable[[str], Any]]=None,
+    )-> str:
+        """
+        Async LLMClient.generate(), with the same model chain and escalation.
+        """
+        component=component or self.component
+        models=routing.models_for(component)
+
+        for i, model in enumerate(models):
+            try:
+                return await self._complete(model, prompt, component, validate)
+            except FALLBACK_ERRORS as e:
+                if i == len(models) - 1:
+                    raise
+                logger.warning(f"{component}: {model} failed ({e}); escalating to {models[i + 1]}")
+
+    async def _complete(self, model: str, prompt: Prompt, component: str, validate: Optional[Callable[[str], Any]])-> str:
+        started=time.perf_counter()
+
+        key=None
+        if self.cache is not None:
+            key=self.cache.key(model, TEMPERATURE, prompt)
+            cached=self.cache.get(key)
+            if cached is not None:
+                _report(component, started, model, cache_hit=True)
+                return cached
+
+        self._bind()
+
+        try:
+            async with self._semaphore:
+                logger.info("sending prompt to llm")
+                response=await self.limiter.call_async(
+                    lambda: self.backend.acreate(
+                        model=model,
+                        messages=_as_messages(prompt),
+                        temperature=TEMPERATURE,
+                    ),
+                    prompt=prompt,
+                    priority=self.priority,
+                )
+        except Exception as e:
+            _report(component, started, model, error=type(e).__name__)
+            raise
+
+        _report(component, started, model, response=response, totals=self.usage)
+
+        content=response.choices[0].message.content
+
+        if validate is not None:
+            validate(content)
+
+        if self.cache is not None and content is not None:
+            self.cache.put(key, content)
+
+        return content
+
+    async def generate_many(self, prompts: List[Prompt], return_exceptions: bool=False)-> list:
+        """
+        Run all prompts concurrently and return the responses in prompt order.
+        With return_exceptions, a failed request yields its exception instead
+        of cancelling the rest.
+        """
+        return await asyncio.gather(
+            *(self.generate(prompt) for prompt in prompts),
+            return_exceptions=return_exceptions,
         )
-        
-        return response.choices[0].message.content
-        
\ No newline at end of file
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from devmate.core.repo_index import INDEX_DIR, blob_hash, load_state, save_state
+from devmate.logger import get_logger
+from devmate.tools import git
+
+
+logger = get_logger("plan_cache")
+
+PLANS_FILE = "plans.json"
+PLANS_VERSION = 1
+
+
+def normalize_intent(intent: str) -> str:
+    """
+    Case, surrounding punctuation and whitespace don't change what an
+    intent asks for.
+    """
+    return re.sub(r"\s+", " ", intent).strip().strip(".!?").strip().lower()
+
+
+class PlanCache:
+    """
+    Validated plans keyed on the normalized intent.
+
+    Each entry remembers the context files the plan was made from and a
+    fingerprint of HEAD plus those files' blob hashes (and the planner's
+    prompt and models). A lookup recomputes the fingerprint, so a commit or
+    an edit to any of the files invalidates the plan without bookkeeping.
+    """
+
+    def __init__(self, root: str = ".", path: Optional[str] = None, max_entries: int = 256):
+        self.root = Path(root)
+        self.path = Path(path) if path else self.root / INDEX_DIR / PLANS_FILE
+        self.max_entries = max_entries
+
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+        self._loaded = False
+
+    def load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+
+        data = load_state(self.path, PLANS_VERSION, "plan cache")
+        if data is not None:
+            self.entries = data.get("plans", {})
+
+    def save(self):
+        save_state(self.root, self.path, {"version": PLANS_VERSION, "plans": self.entries})
+
+    @staticmethod
+    def _key(intent: str) -> str:
+        return hashlib.sha256(normalize_intent(intent).encode("utf-8")).hexdigest()
+
+    def _head(self) -> str:
+        try:
+            return git.head(str(self.root))
+        except RuntimeError:
+            return ""
+
+    def fingerprint(self, files: List[str], salt: str = "") -> str:
+        hashes = []
+        for rel_path in files:
+            try:
+                hashes.append(blob_hash((self.root / rel_path).read_bytes()))
+            except OSError:
+                hashes.append(None)
+
+        payload = json.dumps([self._head(), salt, list(zip(files, hashes))])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, intent: str, salt: str = "") -> Optional[List[Dict[str, Any]]]:
+        self.load()
+
+        entry = self.entries.get(self._key(intent))
+        if entry is None or entry["fingerprint"] != self.fingerprint(entry["files"], salt):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry["plan"]
+
+    def put(self, intent: str, files: List[str], plan: List[Dict[str, Any]], salt: str = ""):
+        self.load()
+
+        self.entries[self._key(intent)] = {
+            "intent": normalize_intent(intent),
+            "files": list(files),
+            "fingerprint": self.fingerprint(files, salt),
+            "plan": plan,
+            "created": time.time(),
+        }
+
+        if len(self.entries) > self.max_entries:
+            oldest = sorted(self.entries, key=lambda k: self.entries[k]["created"])
+            for key in oldest[: len(self.entries) - self.max_entries]:
+                del self.entries[key]
+
+        self.save()
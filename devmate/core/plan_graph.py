@@ -0,0 +1,51 @@
+from typing import Any, Dict, List, Set
+
+from devmate.core.executor import READ_ONLY_ACTIONS
+
+
+def dependencies(plan: List[Dict[str, Any]]) -> List[Set[int]]:
+    """
+    For each step, the indexes of the earlier steps it must wait for.
+
+    A step may list them explicitly in "depends_on". On top of that, every
+    step with side effects is a barrier: it waits for all earlier steps,
+    and every later step waits for it. Read-only steps between two barriers
+    are independent of each other.
+    """
+    deps: List[Set[int]] = []
+    barrier = None
+
+    for i, step in enumerate(plan):
+        explicit = step.get("depends_on") or []
+        for dep in explicit:
+            if not isinstance(dep, int) or isinstance(dep, bool) or not 0 <= dep < i:
+                raise ValueError(f"Step {i} has an invalid dependency: {dep!r}")
+
+        step_deps = set(explicit)
+        if step["action"] in READ_ONLY_ACTIONS:
+            if barrier is not None:
+                step_deps.add(barrier)
+        else:
+            step_deps.update(range(i))
+            barrier = i
+
+        deps.append(step_deps)
+
+    return deps
+
+
+def waves(plan: List[Dict[str, Any]]) -> List[List[int]]:
+    """
+    Group step indexes into waves that can run concurrently: every step
+    runs in the wave after the last of its dependencies.
+    """
+    level: List[int] = []
+    grouped: List[List[int]] = []
+
+    for i, step_deps in enumerate(dependencies(plan)):
+        level.append(max((level[d] + 1 for d in step_deps), default=0))
+        if level[i] == len(grouped):
+            grouped.append([])
+        grouped[level[i]].append(i)
+
+    return grouped
@@ -0,0 +1,92 @@
+import json
+from typing import Any, List
+
+
+class JsonArrayStream:
+    """
+    Incremental parser for a streamed top-level JSON array.
+
+    feed() takes raw text chunks and returns every array element that was
+    completed by the chunk, so callers can act on element N while element
+    N+1 is still being generated. Anything before the opening bracket
+    (e.g. a stray markdown fence) is skipped. close() raises ValueError if
+    the array never started or was not terminated.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._start = None
+        self.started = False
+        self.finished = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        if self.finished:
+            return []
+
+        self._buffer += chunk
+        items = []
+
+        while self._pos < len(self._buffer):
+            ch = self._buffer[self._pos]
+            self._pos += 1
+
+            if not self.started:
+                if ch == "[":
+                    self.started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._start is None:
+                    self._start = self._pos - 1
+            elif ch in "[{":
+                if self._depth == 1 and self._start is None:
+                    self._start = self._pos - 1
+                self._depth += 1
+            elif ch in "]}":
+                self._depth -= 1
+                if self._depth == 1 and self._start is not None:
+                    items.append(self._take(self._pos))
+                elif self._depth == 0:
+                    if self._start is not None:
+                        items.append(self._take(self._pos - 1))
+                    self.finished = True
+                    break
+            elif ch == "," and self._depth == 1:
+                if self._start is not None:
+                    items.append(self._take(self._pos - 1))
+            elif not ch.isspace() and self._depth == 1 and self._start is None:
+                self._start = self._pos - 1
+
+        # Drop consumed text so long streams don't grow the buffer
+        if self._start is None:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+
+        return items
+
+    def _take(self, end: int) -> Any:
+        text = self._buffer[self._start:end].strip()
+        self._start = None
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError("LLM returned invalid JSON") from e
+
+    def close(self):
+        if not self.started or not self.finished:
+            raise ValueError("LLM returned invalid JSON")
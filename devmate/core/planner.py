@@ -1,9 +1,14 @@
 from multiprocessing import Value
-from typing import List, Dict, Any
+from typing import Iterator, List, Dict, Any, Optional
 from devmate.logger import get_logger
+from devmate.config import settings
 import json
-from devmate.core.llm_client import LLMClient
+from devmate.core.llm_client import LLMClient, build_messages
 from devmate.core.context import RepoContextBuilder
+from devmate.core.intent_router import IntentRouter
+from devmate.core.plan_cache import PlanCache
+from devmate.core.plan_stream import JsonArrayStream
+from devmate.core import plan_graph, routing
 
 
 
@@ -25,6 +30,8 @@ Rules (VERY IMPORTANT):
 - Each list item MUST be an object
 - Each object MUST contain an "action" field
 - Optional "payload" field may be included
+- Optional "depends_on" field: list of 0-based indexes of earlier steps
+  whose results this step needs (read-only steps otherwise run in parallel)
 - Do NOT include explanations
 - Do NOT include markdown
 - Do NOT include text outside JSON
@@ -45,7 +52,8 @@ Allowed actions (ONLY these are permitted):
 
 
 Action payload rules:
-- read_file → { "path": "<file path>" }
+- read_file → { "path": "<file path>" }, optionally narrowed with
+  "start_line"/"end_line", "line"/"context" or byte "offset"/"length"
 - write_file → { "path": "<file path>", "content": "<new content>" }
 - list_files → { "path": "<directory path>" }
 - git_commit → { "message": "<commit message>" }
@@ -104,12 +112,58 @@ Output:
 
 
 
+# Single-pass mode sends an outline instead of file contents and lets the
+# model ask for files in the same response
+SINGLE_PASS_PROMPT = SYSTEM_PROMPT + """
+Single-pass mode (overrides the output format above):
+
+You are given a repository outline (file paths with their top-level
+classes and functions) instead of file contents.
+
+Output a JSON object with two fields:
+- "files": a list of paths from the outline whose contents the plan needs
+- "plan": the list of steps, following the rules above
+
+The listed files are read before the plan runs; do NOT add read_file steps
+for them. Only list paths that appear in the outline.
+
+Example output:
+{
+  "files": ["devmate/tools/git.py"],
+  "plan": [
+    {"action": "print", "payload": {"message": "Git commits are handled by staging all changes and calling git commit with a message."}}
+  ]
+}
+"""
+
+
+
+
+
+ALLOWED_ACTIONS = {
+    "noop",
+    "print",
+    "read_file",
+    "write_file",
+    "list_files",
+    "git_status",
+    "git_diff",
+    "git_commit",
+    "github_list_prs",
+    "github_get_pr",
+    "github_get_pr_comments",
+    "github_list_review_comments",
+
+}
+
+
+
 CONTEXT_SELECTION_PROMPT = """
 You are helping decide which files from a repository are relevant.
 
 Given:
 - a user intent
-- a list of file paths
+- a list of candidate file paths, most relevant first
 
 Return ONLY a JSON list of file paths that should be read.
 
@@ -139,118 +193,236 @@ class Planner:
     """
 
     def __init__(self):
-        self.llm=LLMClient();
+        self.llm=LLMClient(component="planner")
+        self.builder=RepoContextBuilder()
+        self.plan_cache=PlanCache(str(self.builder.root)) if settings.PLAN_CACHE else None
+        self.router=IntentRouter(settings.INTENT_CLASSIFIER) if settings.INTENT_ROUTER else None
 
     def create_plan(self,intent: str)-> List[Dict[str, Any]]:
         logger.info(f"Creating LLM-based plan for intent: {intent}")
 
-        # Build repo context (RAG-lite)
-        builder = RepoContextBuilder()
-        selected_files = self._select_relevant_files(intent)
-        context = builder.read_files(selected_files)
-        context_block = f"\nRepository context:\n{context}\n" if context else ""
+        routed = self._route(intent)
+        if routed is not None:
+            return routed
 
+        if self.plan_cache is not None:
+            cached = self.plan_cache.get(intent, self._cache_salt())
+            if cached is not None:
+                logger.info("Using cached plan")
+                return cached
 
-        full_prompt = f"""
-        {SYSTEM_PROMPT}
+        if settings.PLAN_MODE == "single_pass":
+            selected_files, plan = self._plan_single_pass(intent)
+        else:
+            selected_files = self._select_relevant_files(intent)
+            full_prompt = self._build_prompt(intent, selected_files)
 
-        {context_block}
+            # Invalid plans escalate to the next model of the planner's chain
+            response = self.llm.generate(full_prompt, validate=self._parse_plan)
 
 
-        User intent:
-        {intent}
+            logger.info(f"Raw LLM response: {response}")
+
+            plan = self._parse_plan(response)
+
+        if self.plan_cache is not None:
+            self.plan_cache.put(intent, selected_files, plan, self._cache_salt())
+
+        return plan
+
+    def _route(self, intent: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fixed plan for a well-known intent, or None to ask the LLM.
+        """
+        if self.router is None:
+            return None
+
+        plan = self.router.route(intent)
+        if plan is not None:
+            self._validate_plan(plan)
+        return plan
+
+    def _plan_single_pass(self, intent: str):
+        """
+        Plan over a repository outline in one request. The files the model
+        asks for become leading read_file steps. Returns (files, plan).
         """
+        outline = self.builder.outline(intent)
+        allowed = set(outline["paths"])
 
-        response = self.llm.generate(full_prompt)
+        prompt = build_messages(
+            SINGLE_PASS_PROMPT,
+            f"Repository outline:\n{outline['text']}\n\nUser intent:\n{intent}",
+        )
 
+        response = self.llm.generate(
+            prompt, validate=lambda r: self._parse_single_pass(r, allowed)
+        )
 
         logger.info(f"Raw LLM response: {response}")
 
+        return self._parse_single_pass(response, allowed)
 
+    def _parse_single_pass(self, response: str, allowed: set):
         try:
-            plan=json.loads(response)
-        
-        except json.JSONDecodeError as e:
+            result = json.loads(response)
+        except (json.JSONDecodeError, TypeError) as e:
             raise ValueError("LLM returned invalid JSON") from e
 
+        if not isinstance(result, dict):
+            raise ValueError("Single-pass plan must be an object")
 
+        files = result.get("files", [])
+        if not isinstance(files, list):
+            raise ValueError("Single-pass 'files' must be a list")
+
+        plan = result.get("plan")
         self._validate_plan(plan)
 
-        return plan
+        already_read = {
+            (step.get("payload") or {}).get("path")
+            for step in plan if step["action"] == "read_file"
+        }
 
+        selected = []
+        for path in files:
+            if not isinstance(path, str) or path not in allowed:
+                logger.warning(f"Ignoring requested file not in the outline: {path}")
+                continue
+            if path not in selected:
+                selected.append(path)
+
+        reads = [
+            {"action": "read_file", "payload": {"path": path}}
+            for path in selected if path not in already_read
+        ]
 
+        # The model numbered its steps without the prepended reads
+        shifted = []
+        for step in plan:
+            if step.get("depends_on"):
+                step = dict(step, depends_on=[dep + len(reads) for dep in step["depends_on"]])
+            shifted.append(step)
 
-    def _select_relevant_files(self, intent: str) -> List[str]:
-        builder = RepoContextBuilder()
-        all_files = [
-            str(p.relative_to(builder.root))
-            for p in builder._select_files()
-        ]
+        combined = reads + shifted
+        self._validate_plan(combined)
+        return selected, combined
+
+    def _cache_salt(self) -> str:
+        # A new prompt, mode or model chain must not be served old plans
+        return json.dumps([SYSTEM_PROMPT, settings.PLAN_MODE, routing.models_for("planner")])
+
+    def stream_plan(self, intent: str) -> Iterator[Dict[str, Any]]:
+        """
+        Like create_plan(), but yield each validated step as soon as the
+        model has finished generating it. Raises ValueError once the stream
+        ends if the plan as a whole is invalid.
+        """
+        logger.info(f"Streaming LLM-based plan for intent: {intent}")
+
+        routed = self._route(intent)
+        if routed is not None:
+            yield from routed
+            return
+
+        full_prompt = self._build_prompt(intent)
+        parser = JsonArrayStream()
+
+        for chunk in self.llm.stream(full_prompt, validate=self._parse_plan):
+            for step in parser.feed(chunk):
+                self._validate_step(step)
+                yield step
+
+        parser.close()
+
+    def _build_prompt(self, intent: str, selected_files: Optional[List[str]] = None) -> List[Dict[str, str]]:
+        # Build repo context (RAG-lite)
+        if selected_files is None:
+            selected_files = self._select_relevant_files(intent)
+        context = self.builder.read_files(selected_files, intent)
+        context_block = f"Repository context:\n{context}\n\n" if context else ""
+
+        # SYSTEM_PROMPT is the stable, cacheable prefix; per-call data follows
+        return build_messages(SYSTEM_PROMPT, f"{context_block}User intent:\n{intent}")
 
-        prompt = f"""
-        {CONTEXT_SELECTION_PROMPT}
 
-        User intent:
-        {intent}
 
-        Available files:
-        {json.dumps(all_files, indent=2)}
+    def _select_relevant_files(self, intent: str) -> List[str]:
+        """
+        Rank files locally with BM25; optionally let the LLM rerank the top-k.
         """
+        if not settings.LLM_RERANK:
+            return self.builder.rank_files(intent, top_k=settings.CONTEXT_TOP_K)
 
-        response = self.llm.generate(prompt)
+        all_files = self.builder.rank_files(intent, top_k=settings.RERANK_TOP_K)
+        if not all_files:
+            return []
+
+        prompt = build_messages(
+            CONTEXT_SELECTION_PROMPT,
+            f"User intent:\n{intent}\n\n"
+            f"Available files:\n{json.dumps(all_files, indent=2)}",
+        )
 
         try:
-            selected = json.loads(response)
-        except json.JSONDecodeError:
+            response = self.llm.generate(
+                prompt, component="selector", validate=self._parse_selection
+            )
+        except ValueError:
             logger.warning("Context selector returned invalid JSON")
-            return []
+            return all_files[:settings.CONTEXT_TOP_K]
 
-        if not isinstance(selected, list):
-            return []
+        selected = self._parse_selection(response)
 
-        return [f for f in selected if isinstance(f, str)]
+        return [f for f in selected if isinstance(f, str) and f in all_files]
 
 
 
     
-    def _validate_plan(self, plan: Any):
-        allowed_actions = {
-            "noop",
-            "print",
-            "read_file",
-            "write_file",
-            "list_files",
-            "git_status",
-            "git_diff",
-            "git_commit",
-            "github_list_prs",
-            "github_get_pr",
-            "github_get_pr_comments",
-            "github_list_review_comments",
+    def _parse_plan(self, response: str) -> List[Dict[str, Any]]:
+        try:
+            plan=json.loads(response)
+        except (json.JSONDecodeError, TypeError) as e:
+            raise ValueError("LLM returned invalid JSON") from e
 
-        }
+        self._validate_plan(plan)
+        return plan
 
+    def _parse_selection(self, response: str) -> List[Any]:
+        try:
+            selected = json.loads(response)
+        except (json.JSONDecodeError, TypeError) as e:
+            raise ValueError("Context selector returned invalid JSON") from e
+
+        if not isinstance(selected, list):
+            raise ValueError("Context selector must return a list")
+        return selected
+
+    def _validate_plan(self, plan: Any):
         if not isinstance(plan, list):
             raise ValueError("Plan must be a list")
 
         for step in plan:
-            if not isinstance(step, dict):
-                raise ValueError("Each plan step must be a dict")
-
-            action = step.get("action")
-            if not action:
-                raise ValueError("Each plan step must include 'action'")
-
-            if action not in allowed_actions:
-                raise ValueError(f"Action '{action}' is not allowed")
-
-            payload = step.get("payload")
-            if payload is not None and not isinstance(payload, dict):
-                raise ValueError("Payload must be a dict if provided")
+            self._validate_step(step)
 
+        # Dependencies must point at earlier steps
+        plan_graph.dependencies(plan)
 
+    def _validate_step(self, step: Any):
+        if not isinstance(step, dict):
+            raise ValueError("Each plan step must be a dict")
 
+        action = step.get("action")
+        if not action:
+            raise ValueError("Each plan step must include 'action'")
 
+        if action not in ALLOWED_ACTIONS:
+            raise ValueError(f"Action '{action}' is not allowed")
 
+        payload = step.get("payload")
+        if payload is not None and not isinstance(payload, dict):
+            raise ValueError("Payload must be a dict if provided")
 
-    
\ No newline at end of file
+        depends_on = step.get("depends_on")
+        if depends_on is not None and not isinstance(depends_on, list):
+            raise ValueError("depends_on must be a list of step indexes if provided")
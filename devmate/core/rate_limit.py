@@ -0,0 +1,303 @@
+import asyncio
+import heapq
+import itertools
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Mapping, Optional
+
+import openai
+
+from devmate.config import settings
+from devmate.core.tokens import estimate_tokens
+from devmate.logger import get_logger
+
+
+logger = get_logger("rate_limit")
+
+# Lower values are served first
+PRIORITY_PLANNING = 0
+PRIORITY_FIX = 10
+
+# How often a queued request re-checks whether it is at the head
+POLL_INTERVAL = 0.05
+# Longest single sleep, so newly queued higher-priority requests are noticed
+MAX_SLEEP = 1.0
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+_lock = threading.Lock()
+_shared = None
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """
+    Parse durations as sent in rate-limit headers ("20ms", "1.5s", "6m0s")
+    or a bare number of seconds. Returns None if unparseable.
+    """
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(n) * _UNIT_SECONDS[unit] for n, unit in parts)
+
+
+def prompt_tokens(prompt: Any) -> int:
+    """
+    Estimated token cost of a prompt string or list of chat messages.
+    """
+    if not isinstance(prompt, str):
+        prompt = "".join(m.get("content") or "" for m in prompt or [])
+    return max(1, estimate_tokens(prompt))
+
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to `capacity` and refills at `rate` per
+    second. Requests larger than the capacity are clamped so they can
+    still be served once the bucket is full.
+    """
+
+    def __init__(self, capacity: float, rate: float, clock: Callable[[], float] = time.monotonic):
+        if capacity <= 0 or rate <= 0:
+            raise ValueError("Token bucket capacity and rate must be positive")
+
+        self.capacity = float(capacity)
+        self.rate = float(rate)
+        self.level = float(capacity)
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        deficit = min(amount, self.capacity) - self.level
+        return 0.0 if deficit <= 0 else deficit / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def limit(self, remaining: float):
+        """
+        Lower the level to what the server says is actually left.
+        """
+        self._refill()
+        self.level = min(self.level, remaining)
+
+
+class RateLimiter:
+    """
+    Schedules LLM requests within requests-per-minute and tokens-per-minute
+    budgets.
+
+    Waiting requests are served in priority order (then FIFO). Retryable
+    API errors are retried with jittered exponential backoff; a 429 blocks
+    every queued request until the server's retry-after has passed, so
+    concurrent callers don't keep hammering a throttled endpoint.
+    """
+
+    def __init__(
+        self,
+        rpm: int,
+        tpm: int,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.requests = TokenBucket(rpm, rpm / 60, clock)
+        self.tokens = TokenBucket(tpm, tpm / 60, clock)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.retries = 0
+
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._queue = []
+        self._seq = itertools.count()
+        self._blocked_until = 0.0
+
+    # ------------------------
+    # Admission
+    # ------------------------
+
+    def _enqueue(self, priority: int) -> tuple:
+        ticket = (priority, next(self._seq))
+        with self._lock:
+            heapq.heappush(self._queue, ticket)
+        return ticket
+
+    def _dequeue(self, ticket: tuple):
+        with self._lock:
+            if ticket in self._queue:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+
+    def _try_acquire(self, ticket: tuple, tokens: int) -> float:
+        """
+        Admit the ticket if it is at the head of the queue and the budgets
+        allow it. Returns 0 when admitted, otherwise how long to wait.
+        """
+        with self._lock:
+            if self._queue[0] != ticket:
+                return POLL_INTERVAL
+
+            wait = max(
+                self._blocked_until - self._clock(),
+                self.requests.wait_time(1),
+                self.tokens.wait_time(tokens),
+            )
+            if wait > 0:
+                return min(wait, MAX_SLEEP)
+
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            heapq.heappop(self._queue)
+            return 0.0
+
+    def acquire(self, tokens: int = 1, priority: int = PRIORITY_PLANNING, sleep=time.sleep):
+        ticket = self._enqueue(priority)
+        try:
+            while True:
+                wait = self._try_acquire(ticket, tokens)
+                if wait <= 0:
+                    return
+                sleep(wait)
+        finally:
+            self._dequeue(ticket)
+
+    async def acquire_async(self, tokens: int = 1, priority: int = PRIORITY_PLANNING):
+        ticket = self._enqueue(priority)
+        try:
+            while True:
+                wait = self._try_acquire(ticket, tokens)
+                if wait <= 0:
+                    return
+                await asyncio.sleep(wait)
+        finally:
+            self._dequeue(ticket)
+
+    # ------------------------
+    # Server feedback
+    # ------------------------
+
+    def observe(self, headers: Mapping[str, str]) -> Optional[float]:
+        """
+        Fold rate-limit response headers into the local budgets. Returns the
+        server-requested retry delay in seconds, if any.
+        """
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+
+        retry_after = None
+        if "retry-after-ms" in headers:
+            ms = parse_duration(headers["retry-after-ms"])
+            retry_after = ms / 1000 if ms is not None else None
+        elif "retry-after" in headers:
+            retry_after = parse_duration(headers["retry-after"])
+
+        with self._lock:
+            for kind, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+                remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+                if remaining is None:
+                    continue
+                try:
+                    bucket.limit(float(remaining))
+                except ValueError:
+                    continue
+
+                reset = headers.get(f"x-ratelimit-reset-{kind}")
+                if float(remaining) <= 0 and reset and retry_after is None:
+                    retry_after = parse_duration(reset)
+
+        return retry_after
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(delay / 2, delay)
+
+    def _on_error(self, error: Exception, attempt: int) -> float:
+        response = getattr(error, "response", None)
+        retry_after = self.observe(getattr(response, "headers", None) or {})
+        delay = self.backoff_delay(attempt, retry_after)
+
+        self.retries += 1
+        logger.warning(
+            f"LLM request failed ({type(error).__name__}); "
+            f"retry {attempt + 1}/{self.max_retries} in {delay:.2f}s"
+        )
+
+        if isinstance(error, openai.RateLimitError):
+            with self._lock:
+                self._blocked_until = max(self._blocked_until, self._clock() + delay)
+            return 0.0
+        return delay
+
+    # ------------------------
+    # Scheduled calls
+    # ------------------------
+
+    def call(self, fn: Callable[[], Any], prompt: Any = "", priority: int = PRIORITY_PLANNING, sleep=time.sleep) -> Any:
+        tokens = prompt_tokens(prompt)
+
+        for attempt in itertools.count():
+            self.acquire(tokens, priority, sleep)
+            try:
+                return fn()
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._on_error(e, attempt)
+                if delay:
+                    sleep(delay)
+
+    async def call_async(self, fn: Callable[[], Any], prompt: Any = "", priority: int = PRIORITY_PLANNING) -> Any:
+        tokens = prompt_tokens(prompt)
+
+        for attempt in itertools.count():
+            await self.acquire_async(tokens, priority)
+            try:
+                return await fn()
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._on_error(e, attempt)
+                if delay:
+                    await asyncio.sleep(delay)
+
+
+def shared_limiter() -> RateLimiter:
+    """
+    Process-wide limiter configured from settings, shared by all LLM clients.
+    """
+    global _shared
+
+    with _lock:
+        if _shared is None:
+            _shared = RateLimiter(
+                rpm=settings.LLM_RPM,
+                tpm=settings.LLM_TPM,
+                max_retries=settings.LLM_MAX_RETRIES,
+            )
+        return _shared
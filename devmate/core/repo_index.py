@@ -0,0 +1,381 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from devmate.config import settings
+from devmate.core.walker import RepoWalker
+from devmate.logger import get_logger
+from devmate.tools import git
+
+
+logger = get_logger("index")
+
+INDEX_DIR = ".devmate"
+INDEX_FILE = "index.json"
+INDEX_VERSION = 2
+
+
+def blob_hash(data: bytes) -> str:
+    """
+    Hash content the same way git hashes blobs, so ids line up with
+    `git ls-files -s` output.
+    """
+    header = f"blob {len(data)}\0".encode()
+    return hashlib.sha1(header + data).hexdigest()
+
+
+def state_dir(root: Path) -> Path:
+    """
+    Return the per-repo devmate state directory, creating it on first use.
+
+    The directory carries its own .gitignore so `git add .` never stages it.
+    """
+    path = Path(root) / INDEX_DIR
+    if not path.is_dir():
+        path.mkdir(parents=True, exist_ok=True)
+        (path / ".gitignore").write_text("*\n", encoding="utf-8")
+    return path
+
+
+def load_state(path: Path, version: int, what: str = "state") -> Optional[Dict[str, Any]]:
+    """
+    Read a JSON state file written by save_state(). Returns None if it is
+    missing, unreadable or of another version; `what` names it in the
+    warning for an unreadable file.
+    """
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logger.warning(f"Ignoring unreadable {what} at {path}")
+        return None
+
+    if not isinstance(data, dict) or data.get("version") != version:
+        return None
+    return data
+
+
+def save_state(root: Path, path: Path, data: Dict[str, Any]):
+    """
+    Atomically write a JSON state file. Files in the default state
+    directory get it created with its .gitignore (see state_dir()).
+    """
+    path = Path(path)
+    if path.parent == Path(root) / INDEX_DIR:
+        state_dir(root)
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class RepoIndex:
+    """
+    Persistent, incrementally refreshed index of repository files.
+
+    Each file record holds size, mtime, suffix and a lazily computed
+    content hash. Directory mtimes are remembered between runs so that
+    refresh() only re-lists directories whose entries changed; the files
+    of an unchanged directory are still stat'ed, since editing a file in
+    place does not bump its directory's mtime. Ignored subtrees are pruned
+    by RepoWalker and never indexed.
+
+    refresh(full=True) re-lists every directory. Changing a root-level
+    ignore file forces a full refresh automatically.
+
+    In git mode the walk is skipped entirely: blob hashes from
+    `git ls-files -s` are diffed against the previous snapshot, and only
+    the files git reports as modified or untracked are stat'ed and hashed.
+    """
+
+    def __init__(
+        self,
+        root: str = ".",
+        path: Optional[str] = None,
+        walker: Optional[RepoWalker] = None,
+    ):
+        self.root = Path(root)
+        self.path = Path(path) if path else self.root / INDEX_DIR / INDEX_FILE
+        self.walker = walker or RepoWalker(root)
+
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.dirs: Dict[str, Dict[str, Any]] = {}
+        self.ignore_state: Dict[str, Optional[int]] = {}
+
+        self._loaded = False
+        self._dirty = False
+
+    # ------------------------
+    # Persistence
+    # ------------------------
+
+    def load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+
+        data = load_state(self.path, INDEX_VERSION, "index")
+        if data is None:
+            return
+
+        self.files = data.get("files", {})
+        self.dirs = data.get("dirs", {})
+        self.ignore_state = data.get("ignore", {})
+
+    def save(self):
+        if not self._dirty:
+            return
+
+        save_state(self.root, self.path, {
+            "version": INDEX_VERSION,
+            "files": self.files,
+            "dirs": self.dirs,
+            "ignore": self.ignore_state,
+        })
+        self._dirty = False
+
+    # ------------------------
+    # Refresh
+    # ------------------------
+
+    def refresh(self, full: bool = False, mode: Optional[str] = None) -> List[str]:
+        """
+        Bring the index up to date with the worktree.
+
+        mode is "git", "stat" or "auto" (git when the root is a git
+        checkout); it defaults to settings.INDEX_MODE. Git mode falls back
+        to a stat walk if git is unavailable.
+
+        Returns the sorted list of paths that were added, modified or removed.
+        """
+        self.load()
+
+        mode = mode or settings.INDEX_MODE
+        if mode == "auto":
+            mode = "git" if (self.root / ".git").exists() else "stat"
+
+        if mode == "git":
+            try:
+                return self._refresh_git()
+            except RuntimeError as e:
+                logger.warning(f"Git index refresh failed, walking instead: {e}")
+
+        return self._refresh_stat(full)
+
+    def _refresh_git(self) -> List[str]:
+        blobs = git.ls_files_stage(str(self.root))
+        dirty = set(git.ls_files_changed(str(self.root)))
+
+        current = {}
+        for rel_path, sha in blobs.items():
+            if rel_path not in dirty:
+                current[rel_path] = sha
+        for rel_path in dirty:
+            current[rel_path] = None
+
+        changed = set()
+        seen = set()
+
+        for rel_path, sha in current.items():
+            if self.walker.is_path_ignored(rel_path):
+                continue
+
+            record = self.files.get(rel_path)
+
+            if sha is not None:
+                # Clean tracked file: git's blob hash is its content identity
+                if record is not None and record["hash"] == sha:
+                    seen.add(rel_path)
+                    continue
+                if self._stat_into(rel_path, changed):
+                    self.files[rel_path]["hash"] = sha
+                    seen.add(rel_path)
+                continue
+
+            # Modified or untracked: git has no hash for the worktree copy
+            if self._stat_into(rel_path, changed, verify_hash=True):
+                seen.add(rel_path)
+
+        for rel_path in set(self.files) - seen:
+            del self.files[rel_path]
+            changed.add(rel_path)
+            self._dirty = True
+
+        # Directory listings are not maintained in git mode
+        if self.dirs:
+            self.dirs = {}
+            self._dirty = True
+
+        if changed:
+            logger.info(f"Index refreshed from git: {len(changed)} changed path(s)")
+
+        return sorted(changed)
+
+    def _stat_into(self, rel_path: str, changed: set, verify_hash: bool = False) -> bool:
+        """
+        Stat one file into the index. With verify_hash, a file whose
+        size/mtime moved but whose content hash did not is not reported
+        as changed. Returns False if the file is gone.
+        """
+        try:
+            st = os.stat(self.root / rel_path)
+        except OSError:
+            return False
+
+        record = self.files.get(rel_path)
+        if record and record["size"] == st.st_size and record["mtime"] == st.st_mtime_ns:
+            return True
+
+        if verify_hash and record is not None and record["hash"] is not None:
+            old_hash = record["hash"]
+            try:
+                new_hash = blob_hash((self.root / rel_path).read_bytes())
+            except OSError:
+                return False
+
+            if new_hash == old_hash:
+                record["size"] = st.st_size
+                record["mtime"] = st.st_mtime_ns
+                self._dirty = True
+                return True
+
+        self._update_file(rel_path, st.st_size, st.st_mtime_ns, changed)
+        return True
+
+    def _refresh_stat(self, full: bool) -> List[str]:
+        ignore_state = self._ignore_state()
+        if ignore_state != self.ignore_state:
+            self.ignore_state = ignore_state
+            self._dirty = True
+            full = True
+
+        changed = set()
+        seen_dirs = set()
+        seen_files = set()
+        stack = [""]
+
+        while stack:
+            rel_dir = stack.pop()
+            abs_dir = self.root / rel_dir if rel_dir else self.root
+
+            try:
+                mtime = os.stat(abs_dir).st_mtime_ns
+            except OSError:
+                continue
+
+            cached = self.dirs.get(rel_dir)
+            if cached and cached["mtime"] == mtime and not full:
+                subdirs = cached["dirs"]
+                files = [f for f in cached["files"] if self._stat_into(f, changed)]
+            else:
+                subdirs, files = self._scan_dir(rel_dir, changed)
+                self.dirs[rel_dir] = {
+                    "mtime": mtime,
+                    "dirs": subdirs,
+                    "files": files,
+                }
+                self._dirty = True
+
+            seen_dirs.add(rel_dir)
+            seen_files.update(files)
+            stack.extend(reversed(subdirs))
+
+        for rel_dir in set(self.dirs) - seen_dirs:
+            del self.dirs[rel_dir]
+            self._dirty = True
+
+        for rel_path in set(self.files) - seen_files:
+            del self.files[rel_path]
+            changed.add(rel_path)
+            self._dirty = True
+
+        if changed:
+            logger.info(f"Index refreshed: {len(changed)} changed path(s)")
+
+        return sorted(changed)
+
+    def _scan_dir(self, rel_dir: str, changed: set):
+        subdirs, entries = self.walker.list_dir(rel_dir)
+
+        files = []
+        for rel_path, st in entries:
+            files.append(rel_path)
+            self._update_file(rel_path, st.st_size, st.st_mtime_ns, changed)
+
+        return subdirs, files
+
+    def _ignore_state(self) -> Dict[str, Optional[int]]:
+        state = {}
+        for path in self.walker.ignore_files():
+            try:
+                state[str(path)] = path.stat().st_mtime_ns
+            except OSError:
+                state[str(path)] = None
+        return state
+
+    def _update_file(self, rel_path: str, size: int, mtime: int, changed: set):
+        record = self.files.get(rel_path)
+        if record and record["size"] == size and record["mtime"] == mtime:
+            return
+
+        self.files[rel_path] = {
+            "size": size,
+            "mtime": mtime,
+            "hash": None,
+            "suffix": Path(rel_path).suffix,
+        }
+        changed.add(rel_path)
+        self._dirty = True
+
+    # ------------------------
+    # Queries
+    # ------------------------
+
+    def paths(
+        self,
+        suffixes: Optional[Iterable[str]] = None,
+        max_size: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Return indexed paths in deterministic (sorted) order.
+        """
+        self.load()
+        allowed = set(suffixes) if suffixes is not None else None
+
+        result = []
+        for rel_path in sorted(self.files):
+            record = self.files[rel_path]
+            if allowed is not None and record["suffix"] not in allowed:
+                continue
+            if max_size is not None and record["size"] > max_size:
+                continue
+            result.append(rel_path)
+
+        return result
+
+    def entry(self, rel_path: str) -> Optional[Dict[str, Any]]:
+        self.load()
+        return self.files.get(rel_path)
+
+    def content_hash(self, rel_path: str) -> Optional[str]:
+        """
+        Return the blob hash of a file, computing and caching it on demand.
+        """
+        record = self.entry(rel_path)
+        if record is None:
+            return None
+
+        if record["hash"] is None:
+            try:
+                data = (self.root / rel_path).read_bytes()
+            except OSError:
+                return None
+            record["hash"] = blob_hash(data)
+            self._dirty = True
+
+        return record["hash"]
@@ -0,0 +1,13 @@
+from typing import List
+
+from devmate.config import settings
+
+
+def models_for(task: str) -> List[str]:
+    """
+    Model chain for a task (selector, planner, fixer, ...), tried in order.
+
+    The first model serves every request; later ones are used only when
+    the call fails or its output fails validation.
+    """
+    return settings.MODEL_ROUTES.get(task) or settings.DEFAULT_MODELS
@@ -0,0 +1,286 @@
+import math
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from devmate.core.repo_index import INDEX_DIR, RepoIndex, load_state, save_state
+from devmate.logger import get_logger
+
+
+logger = get_logger("search")
+
+SEARCH_FILE = "bm25.json"
+SEARCH_VERSION = 1
+
+MAX_INDEXED_BYTES = 512_000
+
+# Field weights: a term in the path or in a def/class name says more about
+# a file than the same term somewhere in its body.
+PATH_WEIGHT = 3
+DEFINITION_WEIGHT = 2
+
+# Extra, length-independent credit when a query term names the file itself
+# (executor.py for "executor"), split across the words of the file stem.
+STEM_BONUS = 2.0
+
+# Common English filler plus the request verbs users put in front of
+# every intent ("explain ...", "describe ..."), which say nothing about
+# which file is relevant.
+STOPWORDS = {
+    "a", "about", "an", "and", "are", "as", "at", "be", "by", "can", "do",
+    "does", "for", "from", "how", "if", "in", "is", "it", "me", "my", "of",
+    "on", "or", "please", "self", "show", "that", "the", "this", "to",
+    "what", "where", "why", "with",
+    "analyse", "analyze", "describe", "explain", "handle", "handled",
+    "tell", "work", "works",
+}
+
+_WORD_RE = re.compile(r"[A-Za-z0-9_]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+_DEFINITION_RE = re.compile(r"^\s*(?:async\s+def|def|class)\s+([A-Za-z_][A-Za-z0-9_]*)", re.M)
+
+
+def _stem(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    Identifiers are kept whole and also split on snake_case and camelCase
+    boundaries, so "read_file" matches both "read_file" and "file". Plural
+    endings are stripped so "commits" matches "commit".
+    """
+    tokens = []
+
+    for word in _WORD_RE.findall(text):
+        lowered = word.lower()
+        parts = [
+            p.lower()
+            for chunk in word.split("_")
+            for p in _CAMEL_RE.findall(chunk)
+        ]
+
+        if len(parts) > 1 and len(lowered) > 1 and lowered not in STOPWORDS:
+            tokens.append(lowered)
+
+        for part in parts:
+            if len(part) > 1 and part not in STOPWORDS:
+                tokens.append(_stem(part))
+
+    return tokens
+
+
+def _count(tokens: Iterable[str], weight: int, into: Dict[str, int]):
+    for token in tokens:
+        into[token] = into.get(token, 0) + weight
+
+
+def score_texts(query: str, texts: List[str], k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """
+    BM25 scores of each text against the query, treating `texts` as a
+    small throwaway corpus (used for ranking chunks within a prompt).
+    """
+    docs = []
+    for text in texts:
+        tf: Dict[str, int] = {}
+        _count(tokenize(text), 1, tf)
+        docs.append(tf)
+
+    if not docs:
+        return []
+
+    lengths = [sum(tf.values()) for tf in docs]
+    avg_len = (sum(lengths) / len(docs)) or 1.0
+    scores = [0.0] * len(docs)
+
+    for term in set(tokenize(query)):
+        df = sum(1 for tf in docs if term in tf)
+        if not df:
+            continue
+
+        idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+        for i, tf in enumerate(docs):
+            count = tf.get(term)
+            if count:
+                norm = count + k1 * (1 - b + b * lengths[i] / avg_len)
+                scores[i] += idf * count * (k1 + 1) / norm
+
+    return scores
+
+
+class BM25Index:
+    """
+    Local inverted index over file paths, definitions and contents,
+    scored with Okapi BM25.
+
+    Term frequencies are persisted per file together with the file's
+    (size, mtime), so a refresh only re-tokenizes files that changed.
+    """
+
+    def __init__(
+        self,
+        index: RepoIndex,
+        path: Optional[str] = None,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        self.index = index
+        self.root = index.root
+        self.path = Path(path) if path else self.root / INDEX_DIR / SEARCH_FILE
+        self.k1 = k1
+        self.b = b
+
+        self.docs: Dict[str, Dict] = {}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.total_length = 0
+
+        self._loaded = False
+        self._dirty = False
+
+    # ------------------------
+    # Persistence
+    # ------------------------
+
+    def load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+
+        data = load_state(self.path, SEARCH_VERSION, "search index")
+        if data is None:
+            return
+
+        for rel_path, doc in data.get("docs", {}).items():
+            self._add(rel_path, doc)
+
+    def save(self):
+        if not self._dirty:
+            return
+
+        save_state(self.root, self.path, {"version": SEARCH_VERSION, "docs": self.docs})
+        self._dirty = False
+
+    # ------------------------
+    # Maintenance
+    # ------------------------
+
+    def refresh(self, paths: Iterable[str]) -> int:
+        """
+        Sync the index with the given candidate paths. Returns the number of
+        files that were (re)tokenized.
+        """
+        self.load()
+
+        wanted = set(paths)
+        updated = 0
+
+        for rel_path in list(self.docs):
+            if rel_path not in wanted:
+                self._remove(rel_path)
+                self._dirty = True
+
+        for rel_path in sorted(wanted):
+            record = self.index.entry(rel_path)
+            if record is None:
+                continue
+
+            sig = [record["size"], record["mtime"]]
+            doc = self.docs.get(rel_path)
+            if doc is not None and doc["sig"] == sig:
+                continue
+
+            tf = self._tokenize_file(rel_path)
+            if tf is None:
+                continue
+
+            if doc is not None:
+                self._remove(rel_path)
+
+            self._add(rel_path, {"sig": sig, "len": sum(tf.values()), "tf": tf})
+            self._dirty = True
+            updated += 1
+
+        if updated:
+            logger.info(f"Search index updated: {updated} file(s) tokenized")
+
+        return updated
+
+    def _tokenize_file(self, rel_path: str) -> Optional[Dict[str, int]]:
+        try:
+            with open(self.root / rel_path, "rb") as f:
+                text = f.read(MAX_INDEXED_BYTES).decode("utf-8", errors="ignore")
+        except OSError:
+            return None
+
+        tf: Dict[str, int] = {}
+        _count(tokenize(rel_path), PATH_WEIGHT, tf)
+        _count(tokenize(" ".join(_DEFINITION_RE.findall(text))), DEFINITION_WEIGHT, tf)
+        _count(tokenize(text), 1, tf)
+        return tf
+
+    def _add(self, rel_path: str, doc: Dict):
+        self.docs[rel_path] = doc
+        self.total_length += doc["len"]
+        for term, count in doc["tf"].items():
+            self.postings.setdefault(term, {})[rel_path] = count
+
+    def _remove(self, rel_path: str):
+        doc = self.docs.pop(rel_path)
+        self.total_length -= doc["len"]
+        for term in doc["tf"]:
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(rel_path, None)
+            if not posting:
+                del self.postings[term]
+
+    # ------------------------
+    # Queries
+    # ------------------------
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Rank indexed files against a free-text query.
+
+        Returns up to top_k (path, score) pairs, best first; files that share
+        no terms with the query are never returned.
+        """
+        self.load()
+
+        n_docs = len(self.docs)
+        if not n_docs:
+            return []
+
+        avg_len = self.total_length / n_docs
+        scores: Dict[str, float] = {}
+        idfs: Dict[str, float] = {}
+
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+
+            idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            idfs[term] = idf
+
+            for rel_path, tf in posting.items():
+                length = self.docs[rel_path]["len"]
+                norm = tf + self.k1 * (1 - self.b + self.b * length / avg_len)
+                scores[rel_path] = scores.get(rel_path, 0.0) + idf * tf * (self.k1 + 1) / norm
+
+        for rel_path in scores:
+            stem_terms = set(tokenize(Path(rel_path).stem))
+            matched = stem_terms.intersection(idfs)
+            if matched:
+                bonus = sum(idfs[term] for term in matched) * STEM_BONUS / len(stem_terms)
+                scores[rel_path] += bonus
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:top_k]
@@ -0,0 +1,111 @@
+import ast
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from devmate.core.repo_index import INDEX_DIR, blob_hash, load_state, save_state
+from devmate.logger import get_logger
+
+
+logger = get_logger("symbols")
+
+SYMBOLS_FILE = "symbols.json"
+SYMBOLS_VERSION = 1
+
+
+def _signature(node: ast.AST) -> str:
+    if isinstance(node, ast.ClassDef):
+        bases = [ast.unparse(b) for b in node.bases]
+        bases += [ast.unparse(k) for k in node.keywords]
+        return f"class {node.name}({', '.join(bases)}):" if bases else f"class {node.name}:"
+
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    sig = f"{prefix} {node.name}({ast.unparse(node.args)})"
+    if node.returns is not None:
+        sig += f" -> {ast.unparse(node.returns)}"
+    return sig + ":"
+
+
+def _symbol(node: ast.AST, kind: str) -> Dict[str, Any]:
+    start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+    return {
+        "name": node.name,
+        "kind": kind,
+        "start": start,
+        "end": node.end_lineno,
+        "signature": _signature(node),
+        "children": [],
+    }
+
+
+def parse_symbols(source: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse Python source into a module -> classes -> functions outline with
+    1-based, inclusive line spans. Returns None if the source does not parse.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+
+    symbols = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            symbols.append(_symbol(node, "function"))
+
+        elif isinstance(node, ast.ClassDef):
+            cls = _symbol(node, "class")
+            for child in node.body:
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    cls["children"].append(_symbol(child, "method"))
+            symbols.append(cls)
+
+    return {"symbols": symbols}
+
+
+class SymbolIndex:
+    """
+    AST symbol outlines for Python files, cached on disk per file and
+    keyed on the file's content hash so unchanged files are never
+    re-parsed.
+    """
+
+    def __init__(self, root: str = ".", path: Optional[str] = None):
+        self.root = Path(root)
+        self.path = Path(path) if path else self.root / INDEX_DIR / SYMBOLS_FILE
+
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+        self._loaded = False
+        self._dirty = False
+
+    def load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+
+        data = load_state(self.path, SYMBOLS_VERSION, "symbol index")
+        if data is not None:
+            self.entries = data.get("files", {})
+
+    def save(self):
+        if not self._dirty:
+            return
+
+        save_state(self.root, self.path, {"version": SYMBOLS_VERSION, "files": self.entries})
+        self._dirty = False
+
+    def outline(self, rel_path: str, source: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the symbol outline for a file's current source.
+        """
+        self.load()
+
+        content_hash = blob_hash(source.encode("utf-8"))
+        entry = self.entries.get(rel_path)
+        if entry is not None and entry["hash"] == content_hash:
+            return entry["module"]
+
+        module = parse_symbols(source)
+        self.entries[rel_path] = {"hash": content_hash, "module": module}
+        self._dirty = True
+        return module
@@ -0,0 +1,129 @@
+import contextvars
+import json
+import threading
+from typing import Any, Dict, List, Optional
+
+from devmate.logger import get_logger
+
+
+logger = get_logger("telemetry")
+
+# USD per million tokens: (prompt, cached prompt, completion)
+PRICES = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+}
+
+_current = contextvars.ContextVar("devmate_telemetry", default=None)
+
+
+def cost(model: str, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> float:
+    """
+    Estimated USD cost of one call; 0 for models without a known price.
+    """
+    prices = PRICES.get(model)
+    if prices is None:
+        return 0.0
+
+    prompt_price, cached_price, completion_price = prices
+    uncached = max(prompt_tokens - cached_tokens, 0)
+    return (
+        uncached * prompt_price
+        + cached_tokens * cached_price
+        + completion_tokens * completion_price
+    ) / 1_000_000
+
+
+class Telemetry:
+    """
+    Collects one record per LLM call for the duration of an agent run.
+
+    Activate it with activate()/deactivate(); LLM clients report through
+    record_call(), which is a no-op when no run is being recorded.
+    """
+
+    def __init__(self):
+        self.calls: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: Dict[str, Any]):
+        with self._lock:
+            self.calls.append(record)
+
+    def summary(self) -> Dict[str, Any]:
+        def totals(records):
+            return {
+                "calls": len(records),
+                "latency": round(sum(r["latency"] for r in records), 4),
+                "prompt_tokens": sum(r["prompt_tokens"] for r in records),
+                "cached_tokens": sum(r["cached_tokens"] for r in records),
+                "completion_tokens": sum(r["completion_tokens"] for r in records),
+                "cost": round(sum(r["cost"] for r in records), 6),
+                "errors": sum(1 for r in records if r["error"]),
+            }
+
+        with self._lock:
+            calls = list(self.calls)
+
+        by_component: Dict[str, List[Dict[str, Any]]] = {}
+        for record in calls:
+            by_component.setdefault(record["component"], []).append(record)
+
+        return {
+            **totals(calls),
+            "by_component": {
+                name: totals(records) for name, records in by_component.items()
+            },
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = list(self.calls)
+        return {"summary": self.summary(), "calls": calls}
+
+    def export(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def activate(telemetry: Telemetry) -> contextvars.Token:
+    return _current.set(telemetry)
+
+
+def deactivate(token: contextvars.Token):
+    _current.reset(token)
+
+
+def current() -> Optional[Telemetry]:
+    return _current.get()
+
+
+def record_call(
+    component: str,
+    model: str,
+    latency: float,
+    prompt_tokens: int = 0,
+    cached_tokens: int = 0,
+    completion_tokens: int = 0,
+    ttft: Optional[float] = None,
+    cache_hit: bool = False,
+    error: Optional[str] = None,
+) -> Dict[str, Any]:
+    record = {
+        "component": component,
+        "model": model,
+        "latency": round(latency, 4),
+        "ttft": round(ttft, 4) if ttft is not None else None,
+        "prompt_tokens": prompt_tokens,
+        "cached_tokens": cached_tokens,
+        "completion_tokens": completion_tokens,
+        "cost": cost(model, prompt_tokens, cached_tokens, completion_tokens),
+        "cache_hit": cache_hit,
+        "error": error,
+    }
+
+    telemetry = _current.get()
+    if telemetry is not None:
+        telemetry.add(record)
+
+    return record
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import weakref
+
+import httpx
+
+from devmate.config import settings
+from devmate.logger import get_logger
+
+
+logger = get_logger("transport")
+
+_lock = threading.Lock()
+_client = None
+_async_clients = weakref.WeakKeyDictionary()
+_h2_warned = False
+
+
+def http2_enabled() -> bool:
+    """
+    HTTP/2 is used when requested in settings and the `h2` package
+    (httpx[http2]) is installed; otherwise connections fall back to
+    HTTP/1.1, with a warning the first time.
+    """
+    global _h2_warned
+
+    if not settings.HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        if not _h2_warned:
+            _h2_warned = True
+            logger.warning("DEVMATE_HTTP2 is set but h2 is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def _options() -> dict:
+    return {
+        "http2": http2_enabled(),
+        "limits": httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        "timeout": httpx.Timeout(
+            settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT
+        ),
+    }
+
+
+def http_client() -> httpx.Client:
+    """
+    Process-wide pooled client shared by every synchronous LLM consumer.
+    """
+    global _client
+
+    with _lock:
+        if _client is None or _client.is_closed:
+            options = _options()
+            logger.info(f"Creating shared HTTP client (http2={options['http2']})")
+            _client = httpx.Client(**options)
+        return _client
+
+
+def async_http_client() -> httpx.AsyncClient:
+    """
+    Pooled async client for the running event loop.
+
+    Async connections cannot outlive their loop, so there is one client per
+    loop, shared by every async consumer running on it.
+    """
+    loop = asyncio.get_running_loop()
+
+    with _lock:
+        client = _async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(**_options())
+            _async_clients[loop] = client
+        return client
+
+
+async def aclose_loop_client():
+    """
+    Close the running loop's async client. Call it before a short-lived
+    loop (asyncio.run) ends, so its connections are not left open.
+    """
+    loop = asyncio.get_running_loop()
+
+    with _lock:
+        client = _async_clients.pop(loop, None)
+
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def close():
+    """
+    Close the shared synchronous client; the next use creates a new one.
+    """
+    global _client
+
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
@@ -0,0 +1,274 @@
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from devmate.logger import get_logger
+
+
+logger = get_logger("walker")
+
+DEVMATE_IGNORE_FILE = ".devmateignore"
+
+# Directories that are never worth descending into, whatever the ignore
+# files say.
+DEFAULT_PRUNE = {
+    ".git",
+    ".devmate",
+    "node_modules",
+    "__pycache__",
+    ".venv",
+    "venv",
+    ".tox",
+    ".nox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+}
+
+
+def _glob_segment(segment: str) -> str:
+    regex = ""
+    i = 0
+
+    while i < len(segment):
+        c = segment[i]
+
+        if c == "*":
+            regex += "[^/]*"
+        elif c == "?":
+            regex += "[^/]"
+        elif c == "[":
+            end = segment.find("]", i + 2)
+            if end == -1:
+                regex += re.escape(c)
+            else:
+                body = segment[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                regex += "[" + body.replace("\\", "\\\\") + "]"
+                i = end
+        elif c == "\\" and i + 1 < len(segment):
+            i += 1
+            regex += re.escape(segment[i])
+        else:
+            regex += re.escape(c)
+
+        i += 1
+
+    return regex
+
+
+class IgnoreRule:
+    """
+    A single gitignore pattern, compiled to a regex over paths relative
+    to the directory that holds the ignore file.
+    """
+
+    def __init__(self, pattern: str, base: str = ""):
+        self.base = base
+        self.negate = pattern.startswith("!")
+        if self.negate:
+            pattern = pattern[1:]
+
+        self.dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+
+        anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+
+        parts = pattern.split("/")
+        regex = "" if anchored else "(?:[^/]+/)*"
+
+        for i, part in enumerate(parts):
+            last = i == len(parts) - 1
+            if part == "**":
+                regex += ".*" if last else "(?:[^/]+/)*"
+            else:
+                regex += _glob_segment(part)
+                if not last:
+                    regex += "/"
+
+        self.regex = re.compile(regex + r"\Z")
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+
+        if self.base:
+            prefix = self.base + "/"
+            if not rel_path.startswith(prefix):
+                return False
+            rel_path = rel_path[len(prefix):]
+
+        return self.regex.match(rel_path) is not None
+
+
+def parse_ignore_file(path: Path, base: str = "") -> List[IgnoreRule]:
+    try:
+        text = path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return []
+
+    rules = []
+    for line in text.splitlines():
+        if line.endswith("\\ "):
+            line = line[:-2].rstrip() + " "
+        else:
+            line = line.rstrip()
+
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("\\#") or line.startswith("\\!"):
+            line = line[1:]
+
+        rules.append(IgnoreRule(line, base))
+
+    return rules
+
+
+class RepoWalker:
+    """
+    os.scandir based repository walker.
+
+    Whole subtrees matched by .gitignore files, .git/info/exclude or
+    .devmateignore are pruned without being listed. Entries are visited
+    in sorted order, so results are deterministic.
+    """
+
+    def __init__(
+        self,
+        root: str = ".",
+        suffixes: Optional[Iterable[str]] = None,
+        prune: Iterable[str] = DEFAULT_PRUNE,
+    ):
+        self.root = Path(root)
+        self.suffixes = set(suffixes) if suffixes is not None else None
+        self.prune = set(prune)
+
+        self._dir_rules: Dict[str, List[IgnoreRule]] = {}
+        self._dir_ignored: Dict[str, bool] = {}
+        self._base_rules = parse_ignore_file(self.root / ".git" / "info" / "exclude")
+        self._top_rules = parse_ignore_file(self.root / DEVMATE_IGNORE_FILE)
+
+    def ignore_files(self) -> List[Path]:
+        """
+        Root-level ignore files; callers caching listings should treat a
+        change to any of them as invalidating everything.
+        """
+        return [
+            self.root / ".git" / "info" / "exclude",
+            self.root / ".gitignore",
+            self.root / DEVMATE_IGNORE_FILE,
+        ]
+
+    def _rules_for(self, rel_dir: str) -> List[IgnoreRule]:
+        """
+        .git/info/exclude plus every .gitignore from the root down to
+        rel_dir, lowest precedence first.
+        """
+        rules = self._dir_rules.get(rel_dir)
+        if rules is not None:
+            return rules
+
+        if rel_dir:
+            inherited = self._rules_for(rel_dir.rpartition("/")[0])
+        else:
+            inherited = self._base_rules
+
+        abs_dir = self.root / rel_dir if rel_dir else self.root
+        rules = inherited + parse_ignore_file(abs_dir / ".gitignore", rel_dir)
+
+        self._dir_rules[rel_dir] = rules
+        return rules
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        """
+        Return True if the path is ignored. Parent directories are assumed
+        to have been checked already, as they are during a walk.
+        """
+        parent, _, name = rel_path.rpartition("/")
+        if is_dir and name in self.prune:
+            return True
+
+        ignored = False
+        for rule in self._rules_for(parent) + self._top_rules:
+            if rule.matches(rel_path, is_dir):
+                ignored = not rule.negate
+
+        return ignored
+
+    def is_path_ignored(self, rel_path: str) -> bool:
+        """
+        Check a file path that did not come from a walk (e.g. from git),
+        including whether any of its parent directories is pruned.
+        """
+        parts = rel_path.split("/")
+
+        for i in range(1, len(parts)):
+            rel_dir = "/".join(parts[:i])
+            ignored = self._dir_ignored.get(rel_dir)
+            if ignored is None:
+                ignored = self.is_ignored(rel_dir, True)
+                self._dir_ignored[rel_dir] = ignored
+            if ignored:
+                return True
+
+        return self.is_ignored(rel_path, False)
+
+    def list_dir(self, rel_dir: str = "") -> Tuple[List[str], List[Tuple[str, os.stat_result]]]:
+        """
+        List one directory.
+
+        Returns (subdirs, files) as repo-relative paths in sorted order;
+        files are paired with their stat result. Ignored entries are
+        dropped; the suffix allow-list is NOT applied here.
+        """
+        abs_dir = self.root / rel_dir if rel_dir else self.root
+        subdirs = []
+        files = []
+
+        try:
+            with os.scandir(abs_dir) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            logger.warning(f"Cannot list {abs_dir}: {e}")
+            return subdirs, files
+
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not self.is_ignored(rel_path, True):
+                        subdirs.append(rel_path)
+                    continue
+
+                if not entry.is_file():
+                    continue
+
+                if self.is_ignored(rel_path, False):
+                    continue
+
+                files.append((rel_path, entry.stat()))
+            except OSError:
+                continue
+
+        return subdirs, files
+
+    def walk(self) -> Iterator[str]:
+        """
+        Yield repo-relative file paths in deterministic depth-first order,
+        filtered by the suffix allow-list.
+        """
+        stack = [""]
+
+        while stack:
+            rel_dir = stack.pop()
+            subdirs, files = self.list_dir(rel_dir)
+
+            for rel_path, _ in files:
+                if self.suffixes is None or Path(rel_path).suffix in self.suffixes:
+                    yield rel_path
+
+            stack.extend(reversed(subdirs))
@@ -1,12 +1,320 @@
+import codecs
+import mmap
+import os
+import secrets
+import threading
+from array import array
+from collections import OrderedDict
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
-def read_file(path: str)-> str:
-    return Path(path).read_text(encoding="utf-8")
+# Files at least this large are mapped instead of read, so a bounded read
+# only touches the pages it needs.
+MMAP_THRESHOLD = 256 * 1024
 
+# How much of a file is inspected to decide whether it is text.
+SNIFF_BYTES = 8192
 
-def write_file(path:str,content:str):
-    Path(path).write_text(content,encoding="utf-8")
+# Line-offset indexes kept for recently read files, keyed on
+# (path, mtime, size) so any change to a file drops its entry.
+LINE_INDEX_ENTRIES = 32
+
+_line_indexes: "OrderedDict[Tuple[str, int, int], array]" = OrderedDict()
+_line_indexes_lock = threading.Lock()
+
+
+def is_text(prefix: bytes) -> bool:
+    """
+    Decide from the first bytes of a file whether it is UTF-8 text.
+
+    A NUL byte means binary; otherwise the prefix must decode as UTF-8,
+    allowing for a multi-byte character cut off at the end.
+    """
+    if b"\0" in prefix:
+        return False
+
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+    except UnicodeDecodeError:
+        return False
+
+    return True
+
+
+def read_text(path: str, max_bytes: Optional[int] = None) -> Optional[str]:
+    """
+    Read a UTF-8 file, or at most its first max_bytes.
+
+    Returns None for binary or non-UTF-8 files without decoding them in
+    full. Large files are read through mmap.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return ""
+
+        limit = size if max_bytes is None else min(size, max_bytes)
+
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if not is_text(mm[:SNIFF_BYTES]):
+                    return None
+                data = mm[:limit]
+        else:
+            data = f.read(limit)
+            if not is_text(data[:SNIFF_BYTES]):
+                return None
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        return decoder.decode(data, final=limit == size)
+    except UnicodeDecodeError:
+        return None
+
+
+def truncate_text(text: str, max_bytes: int) -> str:
+    """
+    The longest prefix of text within max_bytes of UTF-8, cut the way
+    read_text() cuts a bounded read: a character split at the end is dropped.
+    """
+    data = text.encode("utf-8")
+    if len(data) <= max_bytes:
+        return text
+    return codecs.getincrementaldecoder("utf-8")().decode(data[:max_bytes], final=False)
+
+
+def read_file(path: str, cache=None)-> str:
+    """
+    Read a whole UTF-8 file, through a run-scoped FileCache when given.
+    """
+    if cache is not None:
+        content = cache.read_text(path)
+    else:
+        content = read_text(path)
+
+    if content is None:
+        raise ValueError(f"{path} is not a UTF-8 text file")
+
+    return content
+
+
+def _scan_line_offsets(f, size: int) -> array:
+    offsets = array("Q", [0])
+    if size == 0:
+        return offsets
+
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if not is_text(mm[:SNIFF_BYTES]):
+            raise ValueError(f"{f.name} is not a UTF-8 text file")
+
+        pos = mm.find(b"\n")
+        while pos != -1:
+            offsets.append(pos + 1)
+            pos = mm.find(b"\n", pos + 1)
+
+    if offsets[-1] != size:
+        offsets.append(size)
+    return offsets
+
+
+def line_offsets(path: str) -> array:
+    """
+    Byte offset of the start of every line, plus the file size: line n
+    (1-based) spans offsets[n - 1]:offsets[n], and there are
+    len(offsets) - 1 lines. The scan is cached until the file changes.
+    """
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+    with _line_indexes_lock:
+        if key in _line_indexes:
+            _line_indexes.move_to_end(key)
+            return _line_indexes[key]
+
+    with open(path, "rb") as f:
+        offsets = _scan_line_offsets(f, st.st_size)
+
+    with _line_indexes_lock:
+        _line_indexes[key] = offsets
+        while len(_line_indexes) > LINE_INDEX_ENTRIES:
+            _line_indexes.popitem(last=False)
+
+    return offsets
+
+
+def _read_bytes(path: str, start: int, end: int) -> bytes:
+    if end <= start:
+        return b""
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm[start:end]
+        f.seek(start)
+        return f.read(end - start)
+
+
+def read_lines(path: str, start: int, end: Optional[int] = None) -> Tuple[str, int, int, int]:
+    """
+    Read lines start..end (1-based, inclusive, clamped to the file) without
+    reading the rest of the file. Returns (text, start, end, total_lines).
+    """
+    offsets = line_offsets(path)
+    total = len(offsets) - 1
+
+    start = max(1, start)
+    end = total if end is None else min(end, total)
+    if start > end:
+        return "", start, end, total
+
+    data = _read_bytes(path, offsets[start - 1], offsets[end])
+    return data.decode("utf-8", errors="replace"), start, end, total
+
+
+def read_range(path: str, offset: int = 0, length: Optional[int] = None) -> Tuple[str, int]:
+    """
+    Read length bytes from offset (to the end of the file by default).
+    A multi-byte character cut at either end is replaced. Returns
+    (text, file_size).
+    """
+    size = os.stat(path).st_size
+    end = size if length is None else min(size, offset + length)
+
+    if not is_text(_read_bytes(path, 0, min(size, SNIFF_BYTES))):
+        raise ValueError(f"{path} is not a UTF-8 text file")
+
+    return _read_bytes(path, offset, end).decode("utf-8", errors="replace"), size
+
+
+def _split_lines(text: str) -> List[str]:
+    # Only "\n" ends a line, matching line_offsets()
+    parts = text.split("\n")
+    lines = [part + "\n" for part in parts[:-1]]
+    if parts[-1]:
+        lines.append(parts[-1])
+    return lines
+
+
+def slice_lines(text: str, start: int, end: Optional[int] = None) -> Tuple[str, int, int, int]:
+    """
+    read_lines() for content already in memory.
+    """
+    lines = _split_lines(text)
+    total = len(lines)
+
+    start = max(1, start)
+    end = total if end is None else min(end, total)
+    return "".join(lines[start - 1:end]), start, end, total
+
+
+def splice_lines(text: str, start: int, end: int, replacement: str) -> str:
+    """
+    Replace lines start..end (1-based, inclusive) of text.
+    """
+    lines = _split_lines(text)
+    replaced = lines[start - 1:end]
+
+    # Models tend to drop the final newline of a region
+    if replaced and replaced[-1].endswith("\n") and replacement and not replacement.endswith("\n"):
+        replacement += "\n"
+
+    return "".join(lines[:start - 1]) + replacement + "".join(lines[end:])
+
+
+def same_content(path: str, data: bytes) -> bool:
+    """
+    Whether the file at path already holds exactly data. Sizes are compared
+    first, so most real changes are detected without reading the file.
+    """
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except FileNotFoundError:
+        return False
+
+
+def write_file(path:str,content:str)-> bool:
+    """
+    Atomically replace a file's content; returns False, without touching
+    the file, if it already holds exactly this content.
+    """
+    return bool(write_files_atomic({path: content}))
+
+
+def _create_temp(path: str) -> Tuple[int, str]:
+    """
+    Create an empty temp file next to path. Unlike mkstemp (0600), the
+    file is opened with 0666 so the process umask applies as it would to
+    a plain write.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    for _ in range(100):
+        tmp = os.path.join(directory, f".{os.path.basename(path)}.{secrets.token_hex(6)}.tmp")
+        try:
+            return os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), tmp
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"Could not create a temp file next to {path}")
+
+
+def write_files_atomic(files: Dict[str, str])-> List[str]:
+    """
+    Write several files so that each is replaced whole: every new content
+    goes to a temp file next to its target first, and only once all of them
+    are on disk are they renamed into place. If any temp write fails,
+    nothing is replaced.
+
+    Files that already hold their new content are left alone, so their
+    mtime (and git's view of them) does not change. A symlink is followed
+    and its target replaced, and a file with other hard links is rewritten
+    in place so the links keep sharing it. Returns the paths that were
+    written.
+    """
+    staged = []
+    in_place = []
+    try:
+        for path, content in files.items():
+            if same_content(path, content.encode("utf-8")):
+                continue
+
+            target = os.path.realpath(path)
+            try:
+                links = os.stat(target).st_nlink
+            except FileNotFoundError:
+                links = 1
+            if links > 1:
+                in_place.append((target, content, path))
+                continue
+
+            fd, tmp = _create_temp(target)
+            staged.append((tmp, target, path))
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+                f.write(content)
+
+            # Keep the permissions of the file being replaced; new files
+            # keep the 0666-minus-umask mode they were created with
+            try:
+                os.chmod(tmp, os.stat(target).st_mode & 0o7777)
+            except FileNotFoundError:
+                pass
+    except BaseException:
+        for tmp, _, _ in staged:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+        raise
+
+    for tmp, target, _ in staged:
+        os.replace(tmp, target)
+
+    for target, content, _ in in_place:
+        with open(target, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+
+    return [path for _, _, path in staged] + [path for _, _, path in in_place]
 
 
 def list_files(path:str=".")-> List[str]:
@@ -1,4 +1,5 @@
 import subprocess
+from typing import Dict, List
 
 
 def _run(cmd: list[str]) -> str:
@@ -30,3 +31,61 @@ def commit(message: str) -> str:
     return _run(["git", "commit", "-m", message])
 
 
+
+
+def _run_checked(cmd: list[str], cwd: str = ".") -> str:
+    """
+    Like _run, but raise RuntimeError when git fails instead of returning
+    its error output (callers need to tell "no output" from "not a repo").
+    """
+    try:
+        out = subprocess.check_output(
+            cmd,
+            cwd=cwd,
+            stderr=subprocess.PIPE,
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise RuntimeError(f"{' '.join(cmd)} failed: {e}") from e
+
+    return out.decode("utf-8", errors="surrogateescape")
+
+
+def head(cwd: str = ".") -> str:
+    """
+    Commit id of HEAD; raises RuntimeError outside a repo or before the
+    first commit.
+    """
+    return _run_checked(["git", "rev-parse", "HEAD"], cwd).strip()
+
+
+def ls_files_stage(cwd: str = ".") -> Dict[str, str]:
+    """
+    Blob hashes of tracked files as recorded in the index:
+    {path: sha}, from `git ls-files -s`.
+    """
+    out = _run_checked(["git", "ls-files", "-s", "-z"], cwd)
+
+    blobs = {}
+    for record in out.split("\0"):
+        if not record:
+            continue
+        meta, path = record.split("\t", 1)
+        mode, sha, _ = meta.split(" ")
+        if mode == "160000":
+            # submodule commit, not a file
+            continue
+        blobs[path] = sha
+
+    return blobs
+
+
+def ls_files_changed(cwd: str = ".") -> List[str]:
+    """
+    Paths whose worktree content may differ from the index: modified,
+    deleted and untracked (non-ignored) files.
+    """
+    out = _run_checked(
+        ["git", "ls-files", "-m", "-o", "--exclude-standard", "-z"],
+        cwd,
+    )
+    return sorted({path for path in out.split("\0") if path})
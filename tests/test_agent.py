@@ -1,4 +1,7 @@
+import tempfile
+import threading
 import unittest
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 from devmate.core.agent import Agent
 
@@ -37,6 +40,141 @@ class TestAgent(unittest.TestCase):
         self.assertEqual(results[0]["action"], "noop")
         self.assertEqual(results[1]["result"]["printed"], "Hello")
 
+    @patch("devmate.core.agent.CodeFixer")
+    @patch("devmate.core.agent.Planner")
+    @patch("devmate.core.agent.Executor")
+    def test_streaming_runs_read_only_steps_before_plan_completes(
+        self, MockExecutor, MockPlanner, MockFixer
+    ):
+        events = []
+
+        def stream_plan(intent):
+            events.append("step 1 generated")
+            yield {"action": "read_file", "payload": {"path": "a.py"}}
+            events.append("step 2 generated")
+            yield {"action": "write_file", "payload": {"path": "a.py", "content": "x"}}
+            events.append("step 3 generated")
+            yield {"action": "git_status"}
+            events.append("plan complete")
+
+        def execute(action, payload):
+            events.append(f"executed {action}")
+            return {}
+
+        MockPlanner.return_value.stream_plan.side_effect = stream_plan
+        MockExecutor.return_value.execute.side_effect = execute
+
+        results = Agent().run("edit a.py", stream=True)
+
+        self.assertEqual(
+            events,
+            [
+                "step 1 generated",
+                "executed read_file",
+                "step 2 generated",
+                "step 3 generated",
+                "plan complete",
+                "executed write_file",
+                "executed git_status",
+            ],
+        )
+        self.assertEqual(
+            [r["action"] for r in results], ["read_file", "write_file", "git_status"]
+        )
+
+    @patch("devmate.core.agent.CodeFixer")
+    @patch("devmate.core.agent.Planner")
+    @patch("devmate.core.agent.Executor")
+    def test_streaming_never_runs_side_effects_of_invalid_plan(
+        self, MockExecutor, MockPlanner, MockFixer
+    ):
+        def stream_plan(intent):
+            yield {"action": "write_file", "payload": {"path": "a.py"}}
+            raise ValueError("LLM returned invalid JSON")
+
+        MockPlanner.return_value.stream_plan.side_effect = stream_plan
+
+        with self.assertRaises(ValueError):
+            Agent().run("edit a.py", stream=True)
+
+        MockExecutor.return_value.execute.assert_not_called()
+
+    @patch("devmate.core.agent.CodeFixer")
+    @patch("devmate.core.agent.Planner")
+    @patch("devmate.core.agent.Executor")
+    def test_fixer_is_reused_across_runs(self, MockExecutor, MockPlanner, MockFixer):
+        MockPlanner.return_value.create_plan.return_value = [{"action": "noop"}]
+
+        agent = Agent()
+        agent.run("first")
+        agent.run("second")
+
+        MockFixer.assert_called_once()
+
+    @patch("devmate.core.agent.CodeFixer")
+    @patch("devmate.core.agent.Planner")
+    @patch("devmate.core.agent.Executor")
+    def test_independent_reads_run_concurrently_in_plan_order(
+        self, MockExecutor, MockPlanner, MockFixer
+    ):
+        MockPlanner.return_value.create_plan.return_value = [
+            {"action": "read_file", "payload": {"path": "a.py"}},
+            {"action": "read_file", "payload": {"path": "b.py"}},
+            {"action": "read_file", "payload": {"path": "c.py"}},
+            {"action": "print", "payload": {"message": "done"}},
+        ]
+
+        # Each read waits for the other two, so this only passes if they overlap
+        barrier = threading.Barrier(3, timeout=5)
+        printed = []
+
+        def execute(action, payload):
+            if action == "read_file":
+                barrier.wait()
+                return {"content": payload["path"]}
+            printed.append(barrier.n_waiting)
+            return {"printed": payload["message"]}
+
+        MockExecutor.return_value.execute.side_effect = execute
+
+        results = Agent().run("read three files")
+
+        self.assertEqual(
+            [r["result"].get("content") for r in results],
+            ["a.py", "b.py", "c.py", None],
+        )
+        self.assertEqual(printed, [0])
+
+
+    @patch("devmate.core.agent.CodeFixer")
+    @patch("devmate.core.agent.Planner")
+    def test_failed_run_leaves_disk_untouched(self, MockPlanner, MockFixer):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "a.py"
+            path.write_text("old")
+
+            plan = [
+                {"action": "write_file", "payload": {"path": str(path), "content": "half-applied"}},
+                {"action": "does_not_exist"},
+            ]
+            MockPlanner.return_value.create_plan.return_value = plan
+
+            agent = Agent()
+            with self.assertRaises(ValueError):
+                agent.run("break halfway")
+            self.assertEqual(path.read_text(), "old")
+
+            # git_diff must not flush the staged write either
+            MockPlanner.return_value.create_plan.return_value = [plan[0], {"action": "git_diff"}, plan[1]]
+            with patch("devmate.core.executor.git.diff", return_value=""):
+                with self.assertRaises(ValueError):
+                    agent.run("diff then break")
+            self.assertEqual(path.read_text(), "old")
+
+            MockPlanner.return_value.create_plan.return_value = plan[:1]
+            agent.run("write it")
+            self.assertEqual(path.read_text(), "half-applied")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from devmate.config import settings
+from devmate.core.agent import Agent
+from devmate.core.backends import (
+    LatencyProfile,
+    OpenAIBackend,
+    RecordingBackend,
+    ReplayBackend,
+    load_recordings,
+    profile,
+)
+from devmate.core.llm_cache import ResponseCache
+from devmate.core.llm_client import AsyncLLMClient, LLMClient, build_messages
+
+
+PLAN = '[{"action": "noop"}, {"action": "print", "payload": {"message": "done"}}]'
+
+
+class TestReplayBackend(unittest.TestCase):
+
+    def test_lookup_prefers_exact_key_then_match_then_default(self):
+        messages = build_messages("system", "User intent:\nexplain git")
+        recorded = ReplayBackend(default="fallback")
+        key_backend = ReplayBackend([
+            {"key": ResponseCache.key("m", 0.2, messages), "response": "exact"},
+            {"match": "explain", "response": "matched"},
+        ])
+
+        self.assertEqual(key_backend.lookup("m", 0.2, messages), "exact")
+        self.assertEqual(key_backend.lookup("m", 0.5, messages), "matched")
+        self.assertEqual(recorded.lookup("m", 0.2, messages), "fallback")
+
+        with self.assertRaises(RuntimeError):
+            ReplayBackend().lookup("m", 0.2, messages)
+
+    def test_latency_profile_is_deterministic(self):
+        first = LatencyProfile(ttft=1.0, tokens_per_second=10, jitter=0.5, seed=7)
+        second = LatencyProfile(ttft=1.0, tokens_per_second=10, jitter=0.5, seed=7)
+
+        self.assertEqual(
+            [first.first_token_delay(), first.decode_delay(20)],
+            [second.first_token_delay(), second.decode_delay(20)],
+        )
+        self.assertEqual(profile("instant").decode_delay(1000), 0.0)
+        with self.assertRaises(ValueError):
+            profile("warp")
+
+    def test_profile_delays_are_applied(self):
+        backend = ReplayBackend(default="x" * 40, latency=LatencyProfile(ttft=0.5, tokens_per_second=10))
+
+        with patch("devmate.core.backends.time.sleep") as mock_sleep:
+            backend.create(model="m", messages=build_messages("s", "u"), temperature=0.2)
+
+        mock_sleep.assert_called_once_with(1.5)
+
+    def test_recorded_responses_replay_exactly(self):
+        inner = MagicMock()
+        inner.create.return_value.choices[0].message.content = "recorded answer"
+        messages = build_messages("system", "user")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "rec.jsonl")
+            RecordingBackend(inner, path).create(model="m", messages=messages, temperature=0.2)
+
+            replay = ReplayBackend.from_file(path)
+            response = replay.create(model="m", messages=messages, temperature=0.2)
+
+        self.assertEqual(response.choices[0].message.content, "recorded answer")
+
+    def test_load_recordings_rejects_entries_without_response(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "rec.jsonl")
+            with open(path, "w") as f:
+                f.write(json.dumps({"match": "x"}) + "\n")
+
+            with self.assertRaises(ValueError):
+                load_recordings(path)
+
+
+class TestClientsWithBackends(unittest.TestCase):
+
+    @patch("devmate.core.llm_client.settings")
+    def test_replay_backend_needs_no_api_key(self, mock_settings):
+        mock_settings.validate = MagicMock(side_effect=RuntimeError("API key missing"))
+
+        client = LLMClient(cache=None, backend=ReplayBackend(default="hi"))
+
+        self.assertEqual(client.generate("hello"), "hi")
+        self.assertEqual("".join(client.stream("hello")), "hi")
+        mock_settings.validate.assert_not_called()
+
+    def test_async_client_uses_replay_backend(self):
+        backend = ReplayBackend(default="fixed")
+        client = AsyncLLMClient(max_concurrency=2, cache=None, backend=backend)
+
+        results = asyncio.run(client.generate_many(["a", "b"]))
+
+        self.assertEqual(results, ["fixed", "fixed"])
+        self.assertEqual(backend.calls, 2)
+
+    def test_openai_backend_passes_requests_through(self):
+        client = MagicMock()
+        OpenAIBackend(client=client).create(model="m", messages=[], temperature=0.2)
+
+        client.chat.completions.create.assert_called_once_with(model="m", messages=[], temperature=0.2)
+
+    def test_agent_runs_offline_against_recordings(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "rec.jsonl")
+            with open(path, "w") as f:
+                f.write(json.dumps({"match": "User intent", "response": PLAN}) + "\n")
+
+            with patch.object(settings, "LLM_BACKEND", "replay"), \
+                 patch.object(settings, "LLM_REPLAY_PATH", path), \
+                 patch.object(settings, "LLM_CACHE", False):
+                results = Agent().run("say done")
+
+        self.assertEqual([r["action"] for r in results], ["noop", "print"])
+
+
+if __name__ == "__main__":
+    unittest.main()
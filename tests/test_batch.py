@@ -0,0 +1,99 @@
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from devmate.config import settings
+from devmate.core import batch
+from devmate.core.backends import ReplayBackend
+from devmate.core.code_fixer import CodeFixer
+
+
+class FakeRunner:
+    def __init__(self, statuses, output=""):
+        self.statuses = list(statuses)
+        self.submitted = None
+        self._output = output
+
+    def submit(self, lines):
+        self.submitted = lines
+        return "batch-1"
+
+    def status(self, batch_id):
+        return {"id": batch_id, "status": self.statuses.pop(0)}
+
+    def output(self, batch):
+        return self._output
+
+
+def output_line(custom_id, content=None, error=None):
+    if error:
+        return json.dumps({"custom_id": custom_id, "response": None, "error": {"message": error}})
+    body = {"choices": [{"message": {"content": content}}]}
+    return json.dumps({"custom_id": custom_id, "response": {"status_code": 200, "body": body}, "error": None})
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_build_requests_and_parse_results(self):
+        lines = batch.build_requests("m", 0.2, [("a", [{"role": "user", "content": "x"}])])
+
+        self.assertEqual(lines[0]["custom_id"], "a")
+        self.assertEqual(lines[0]["url"], "/v1/chat/completions")
+        self.assertEqual(lines[0]["body"]["model"], "m")
+
+        results = batch.parse_results(
+            output_line("a", "fixed") + "\n" + output_line("b", error="boom") + "\n"
+        )
+        self.assertEqual(results, {"a": "fixed", "b": None})
+
+    def test_run_batch_polls_until_complete(self):
+        runner = FakeRunner(["validating", "in_progress", "completed"], output_line("a", "ok"))
+        sleeps = []
+
+        results = batch.run_batch(runner, [{"custom_id": "a"}], poll_interval=5, sleep=sleeps.append)
+
+        self.assertEqual(results, {"a": "ok"})
+        self.assertEqual(sleeps, [5, 5])
+
+    def test_run_batch_raises_on_failure_and_timeout(self):
+        with self.assertRaises(RuntimeError):
+            batch.run_batch(FakeRunner(["failed"]), [], sleep=lambda s: None)
+
+        with self.assertRaises(RuntimeError):
+            batch.run_batch(
+                FakeRunner(["in_progress"] * 10), [], poll_interval=1, timeout=3, sleep=lambda s: None
+            )
+
+    def test_openai_runner_uploads_file_and_creates_batch(self):
+        client = MagicMock()
+        client.files.create.return_value.id = "file-1"
+        client.post.return_value.json.return_value = {"id": "batch-9"}
+
+        runner = batch.OpenAIBatchRunner(client)
+        batch_id = runner.submit(batch.build_requests("m", 0.2, [("a", [])]))
+
+        self.assertEqual(batch_id, "batch-9")
+        self.assertEqual(client.files.create.call_args.kwargs["purpose"], "batch")
+        self.assertEqual(client.post.call_args.args[0], "/batches")
+        self.assertEqual(client.post.call_args.kwargs["body"]["input_file_id"], "file-1")
+
+    def test_code_fixer_batches_all_comments_per_file(self):
+        backend = ReplayBackend([{"match": "2. rename", "response": "fixed a"}], default="fixed b")
+        # Without an OpenAI client the fixer batches through the local runner
+        fixer = CodeFixer(backend=backend)
+        self.assertIsInstance(fixer.batch_runner, batch.LocalBatchRunner)
+
+        results = fixer.fix_batch([("a = 1", ["add docs", "rename"]), ("b = 1", ["tidy"])])
+
+        self.assertEqual(results, ["fixed a", "fixed b"])
+        self.assertEqual(backend.calls, 2)
+
+    def test_batch_fixes_that_fail_validation_are_dropped(self):
+        backend = ReplayBackend([{"match": "a = 1", "response": "```python\na = 2\n```"}], default="")
+        fixer = CodeFixer(backend=backend)
+
+        self.assertEqual(fixer.fix_batch([("a = 1", ["x"]), ("b = 1", ["y"])]), [None, None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from devmate.config import settings
+from devmate.core.context import ContextPacker, RepoContextBuilder, estimate_tokens
+from devmate.core.symbols import SymbolIndex
+
+
+GIT_SOURCE = '''import subprocess
+
+
+class Git:
+    """Wraps the git CLI."""
+
+    def status(self):
+        return subprocess.check_output(["git", "status"])
+
+    def commit(self, message):
+        subprocess.check_output(["git", "add", "."])
+        return subprocess.check_output(["git", "commit", "-m", message])
+'''
+
+
+class TestContextPacker(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.symbols = SymbolIndex(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_relevant_chunks_in_full_and_signatures_for_the_rest(self):
+        packer = ContextPacker(self.symbols, budget=85)
+        result = packer.pack("how does commit work", {"git.py": GIT_SOURCE})
+
+        context = result["context"]
+        self.assertTrue(context.startswith("--- FILE: git.py ---"))
+        self.assertIn('return subprocess.check_output(["git", "commit", "-m", message])', context)
+        self.assertIn("class Git:", context)
+        self.assertIn("    def status(self): ...", context)
+        self.assertLessEqual(result["tokens"], 85)
+
+        dropped = {(d["start"], d["reason"]) for d in result["dropped"]}
+        self.assertIn((7, "budget"), dropped)
+
+    def test_everything_fits_in_a_large_budget(self):
+        packer = ContextPacker(self.symbols, budget=10_000)
+        result = packer.pack("commit", {"git.py": GIT_SOURCE})
+
+        self.assertEqual(result["dropped"], [])
+        self.assertIn('return subprocess.check_output(["git", "status"])', result["context"])
+
+    def test_duplicate_chunks_are_dropped(self):
+        packer = ContextPacker(self.symbols, budget=10_000)
+        notes = "release notes\n" * 3
+        result = packer.pack("release notes", {"a.md": notes, "b.md": notes})
+
+        self.assertEqual(len(result["included"]), 1)
+        self.assertEqual(result["dropped"][0]["reason"], "duplicate")
+        self.assertNotIn("b.md", result["context"])
+
+    def test_zero_budget_includes_nothing(self):
+        packer = ContextPacker(self.symbols, budget=0)
+        result = packer.pack("commit", {"git.py": GIT_SOURCE})
+
+        self.assertEqual(result["context"], "")
+        self.assertEqual(result["tokens"], 0)
+
+    def test_estimate_tokens(self):
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("abcd"), 1)
+        self.assertEqual(estimate_tokens("abcde"), 2)
+
+
+class TestRepoContextBuilderPack(unittest.TestCase):
+
+    def test_read_files_with_intent_uses_packer(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "git.py").write_text(GIT_SOURCE)
+            builder = RepoContextBuilder(tmp)
+
+            context = builder.read_files(["git.py", "missing.py"], "commit")
+
+            self.assertIn("--- FILE: git.py ---", context)
+            self.assertIsNotNone(builder.last_pack)
+            self.assertTrue(builder.last_pack["included"])
+
+    def test_read_bulk_keeps_order_and_skips_binary_and_missing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "b.py").write_text("b = 2\n")
+            (root / "a.py").write_text("a = 1\n")
+            (root / "img.png").write_bytes(b"\x89PNG\x00\x00")
+
+            builder = RepoContextBuilder(tmp)
+            files = builder.read_bulk(["b.py", "img.png", "missing.py", "a.py"])
+
+            self.assertEqual(list(files), ["b.py", "a.py"])
+            self.assertEqual(files["a.py"], "a = 1\n")
+
+    def test_rank_files_sees_in_place_edits(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "a.py").write_text("def alpha():\n    pass\n")
+            (Path(tmp) / "b.py").write_text("def beta():\n    pass\n")
+            # The second run settles the root's mtime after .devmate appears
+            for _ in range(2):
+                RepoContextBuilder(tmp).rank_files("alpha", top_k=5)
+
+            with open(Path(tmp) / "a.py", "a") as f:
+                f.write("\ndef zebra():\n    pass\n")
+
+            self.assertEqual(RepoContextBuilder(tmp).rank_files("zebra", top_k=5), ["a.py"])
+
+    def test_outline_lists_paths_with_top_level_symbols(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "git.py").write_text(GIT_SOURCE)
+            (root / "README.md").write_text("# readme\n")
+
+            outline = RepoContextBuilder(tmp).outline()
+
+            self.assertEqual(outline["paths"], ["README.md", "git.py"])
+            self.assertIn("git.py: Git", outline["text"])
+            self.assertNotIn("commit", outline["text"])
+
+            # Unchanged files are served from the symbol cache
+            with patch("devmate.core.context.filesystem.read_text") as read_text:
+                again = RepoContextBuilder(tmp).outline()
+            read_text.assert_not_called()
+            self.assertEqual(again, outline)
+
+    def test_outline_respects_budget(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(5):
+                (Path(tmp) / f"m{i}.py").write_text(f"def f{i}():\n    pass\n")
+
+            outline = RepoContextBuilder(tmp).outline(budget=8)
+
+            self.assertEqual(outline["paths"], ["m0.py", "m1.py"])
+
+
+    def test_outline_lists_relevant_files_first_and_reads_lazily(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(5):
+                (Path(tmp) / f"m{i}.py").write_text(f"def f{i}():\n    pass\n")
+            (Path(tmp) / "m4.py").write_text("def deploy_cluster():\n    pass\n")
+
+            builder = RepoContextBuilder(tmp)
+            with patch.object(settings, "READ_WORKERS", 1), \
+                 patch.object(builder, "read_bulk", wraps=builder.read_bulk) as read_bulk:
+                outline = builder.outline("deploy cluster", budget=9)
+
+            self.assertEqual(outline["paths"], ["m4.py", "m0.py"])
+            read = [p for call in read_bulk.call_args_list for p in call.args[0]]
+            self.assertEqual(read, ["m4.py", "m0.py", "m1.py"])
+
+if __name__ == "__main__":
+    unittest.main()
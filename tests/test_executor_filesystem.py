@@ -1,6 +1,8 @@
+import os
 import unittest
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 from devmate.core.executor import Executor
 
@@ -41,3 +43,119 @@ class TestExecutorFilesystem(unittest.TestCase):
 
         self.assertIn(str(self.base_path / "a.txt"), result["files"])
         self.assertIn(str(self.base_path / "b.txt"), result["files"])
+
+    def test_list_files_includes_staged_new_files(self):
+        (self.base_path / "a.txt").write_text("a")
+
+        self.executor.begin()
+        for rel_path in ("a.txt", "new.txt", "pkg/mod.py", "pkg/other.py"):
+            self.executor.execute("write_file", {"path": str(self.base_path / rel_path), "content": "x"})
+
+        result = self.executor.execute("list_files", {"path": str(self.base_path)})
+
+        self.assertEqual(
+            sorted(result["files"]),
+            [str(self.base_path / name) for name in ("a.txt", "new.txt", "pkg")],
+        )
+        self.assertEqual(
+            result["staged"],
+            [str(self.base_path / "new.txt"), str(self.base_path / "pkg")],
+        )
+        self.assertFalse((self.base_path / "new.txt").exists())
+
+    def test_transaction_coalesces_writes_until_flush(self):
+        file_path = self.base_path / "a.py"
+        file_path.write_text("old")
+
+        self.executor.begin()
+        for content in ("one", "two"):
+            result = self.executor.execute("write_file", {"path": str(file_path), "content": content})
+            self.assertTrue(result["staged"])
+
+        # Read-your-writes while the disk is untouched
+        self.assertEqual(self.executor.execute("read_file", {"path": str(file_path)})["content"], "two")
+        self.assertEqual(file_path.read_text(), "old")
+
+        self.assertEqual(self.executor.flush(), [str(file_path)])
+        self.assertEqual(file_path.read_text(), "two")
+
+    def test_discard_drops_staged_writes(self):
+        file_path = self.base_path / "new.py"
+
+        self.executor.begin()
+        self.executor.execute("write_file", {"path": str(file_path), "content": "x"})
+        self.assertTrue(self.executor.execute("read_file", {"path": str(file_path)})["exists"])
+        self.executor.discard()
+
+        self.assertFalse(file_path.exists())
+        self.assertFalse(self.executor.execute("read_file", {"path": str(file_path)})["exists"])
+
+    @patch("devmate.core.executor.git.commit", return_value="ok")
+    def test_git_commit_flushes_first(self, mock_commit):
+        file_path = self.base_path / "a.py"
+        mock_commit.side_effect = lambda message: file_path.read_text()
+
+        self.executor.begin()
+        self.executor.execute("write_file", {"path": str(file_path), "content": "fixed"})
+        result = self.executor.execute("git_commit", {"message": "fix"})
+
+        self.assertEqual(result["commit"], "fixed")
+
+    def test_write_reports_whether_content_changed(self):
+        file_path = str(self.base_path / "a.py")
+
+        self.assertTrue(self.executor.execute("write_file", {"path": file_path, "content": "a"})["changed"])
+        self.assertFalse(self.executor.execute("write_file", {"path": file_path, "content": "a"})["changed"])
+
+        self.executor.begin()
+        self.assertFalse(self.executor.execute("write_file", {"path": file_path, "content": "a"})["changed"])
+        self.assertTrue(self.executor.execute("write_file", {"path": file_path, "content": "b"})["changed"])
+        self.assertEqual(self.executor.flush(), [file_path])
+
+    def test_ranged_reads(self):
+        file_path = str(self.base_path / "big.txt")
+        Path(file_path).write_text("".join(f"{i}\n" for i in range(1, 101)))
+
+        window = self.executor.execute("read_file", {"path": file_path, "line": 50, "context": 2})
+        self.assertEqual(window["content"], "48\n49\n50\n51\n52\n")
+        self.assertEqual((window["start_line"], window["end_line"], window["total_lines"]), (48, 52, 100))
+
+        lines = self.executor.execute("read_file", {"path": file_path, "start_line": 99})
+        self.assertEqual(lines["content"], "99\n100\n")
+
+        chunk = self.executor.execute("read_file", {"path": file_path, "offset": 2, "length": 4})
+        self.assertEqual(chunk["content"], "2\n3\n")
+
+        with self.assertRaises(ValueError):
+            self.executor.execute("read_file", {"path": file_path, "offset": -1})
+
+    def test_ranged_read_and_write_of_staged_content(self):
+        file_path = str(self.base_path / "a.py")
+        Path(file_path).write_text("a\nb\nc\n")
+
+        self.executor.begin()
+        result = self.executor.execute("write_file", {"path": file_path, "content": "B", "start_line": 2, "end_line": 2})
+        self.assertTrue(result["changed"])
+
+        self.assertEqual(self.executor.execute("read_file", {"path": file_path, "start_line": 2, "end_line": 3})["content"], "B\nc\n")
+        self.assertEqual(Path(file_path).read_text(), "a\nb\nc\n")
+
+        self.executor.flush()
+        self.assertEqual(Path(file_path).read_text(), "a\nB\nc\n")
+
+    @patch("devmate.core.executor.git.status", return_value="")
+    @patch("devmate.core.executor.git.diff", return_value="")
+    def test_status_and_diff_report_staged_writes_without_flushing(self, mock_diff, mock_status):
+        file_path = self.base_path / "a.py"
+        file_path.write_text("old\n")
+
+        self.executor.begin()
+        self.executor.execute("write_file", {"path": str(file_path), "content": "new\n"})
+
+        diff = self.executor.execute("git_diff")
+        self.assertIn("-old\n+new\n", diff["staged_diff"])
+        status = self.executor.execute("git_status")
+        self.assertEqual(status["staged"], [os.path.relpath(file_path)])
+
+        self.assertEqual(file_path.read_text(), "old\n")
+
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from devmate.core.executor import Executor
+from devmate.core.file_cache import FileCache
+from devmate.tools import filesystem
+
+
+class TestFileCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "a.py"
+        self.path.write_text("a = 1\n")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_repeated_reads_hit_the_cache(self):
+        cache = FileCache()
+
+        with patch.object(filesystem, "read_text", wraps=filesystem.read_text) as mock_read:
+            self.assertEqual(cache.read_text(str(self.path)), "a = 1\n")
+            self.assertEqual(filesystem.read_file(str(self.path), cache=cache), "a = 1\n")
+
+        mock_read.assert_called_once()
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_external_change_is_detected(self):
+        cache = FileCache()
+        cache.read_text(str(self.path))
+
+        self.path.write_text("a = 22\n")
+        st = self.path.stat()
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        self.assertEqual(cache.read_text(str(self.path)), "a = 22\n")
+
+    def test_bounded_reads_of_large_files_are_not_cached(self):
+        cache = FileCache()
+        cache.read_text(str(self.path), max_bytes=2)
+
+        self.assertEqual(cache.read_text(str(self.path)), "a = 1\n")
+        self.assertEqual(cache.stats()["hits"], 0)
+
+    def test_bounded_read_of_a_cached_file_is_truncated(self):
+        self.path.write_text("naïve = 1\n", encoding="utf-8")
+        cache = FileCache()
+        cache.read_text(str(self.path))
+
+        # "ï" is two bytes; cutting through it drops it like read_text does
+        self.assertEqual(cache.read_text(str(self.path), max_bytes=3), "na")
+        self.assertEqual(cache.read_text(str(self.path), max_bytes=3), filesystem.read_text(str(self.path), 3))
+        self.assertEqual(cache.stats()["hits"], 2)
+
+    def test_executor_write_updates_cache(self):
+        cache = FileCache()
+        executor = Executor(file_cache=cache)
+
+        executor.execute("read_file", {"path": str(self.path)})
+        executor.execute("write_file", {"path": str(self.path), "content": "b = 2\n"})
+
+        with patch.object(filesystem, "read_text") as mock_read:
+            result = executor.execute("read_file", {"path": str(self.path)})
+
+        mock_read.assert_not_called()
+        self.assertEqual(result["content"], "b = 2\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
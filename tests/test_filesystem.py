@@ -0,0 +1,209 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from devmate.tools import filesystem
+
+
+class TestReadText(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.base = Path(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_reads_utf8_text(self):
+        path = self.base / "a.py"
+        path.write_text("naïve = 1\n", encoding="utf-8")
+
+        self.assertEqual(filesystem.read_text(str(path)), "naïve = 1\n")
+
+    def test_binary_file_returns_none(self):
+        path = self.base / "a.bin"
+        path.write_bytes(b"\x89PNG\r\n\x1a\n\x00\x00")
+
+        self.assertIsNone(filesystem.read_text(str(path)))
+
+    def test_non_utf8_file_returns_none(self):
+        path = self.base / "latin1.txt"
+        path.write_bytes("café".encode("latin-1"))
+
+        self.assertIsNone(filesystem.read_text(str(path)))
+
+    def test_max_bytes_does_not_split_characters(self):
+        path = self.base / "a.txt"
+        path.write_text("aé", encoding="utf-8")  # 'é' is two bytes
+
+        self.assertEqual(filesystem.read_text(str(path), max_bytes=2), "a")
+
+    def test_large_files_are_read_through_mmap(self):
+        path = self.base / "big.txt"
+        path.write_text("line\n" * 1000)
+
+        with patch.object(filesystem, "MMAP_THRESHOLD", 100):
+            with patch("devmate.tools.filesystem.mmap.mmap", wraps=filesystem.mmap.mmap) as mock_mmap:
+                text = filesystem.read_text(str(path), max_bytes=10)
+
+        mock_mmap.assert_called_once()
+        self.assertEqual(text, "line\nline\n")
+
+
+class TestWriteFilesAtomic(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.base = Path(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_replaces_files_and_keeps_mode(self):
+        existing = self.base / "run.sh"
+        existing.write_text("old\n")
+        existing.chmod(0o755)
+
+        filesystem.write_files_atomic({
+            str(existing): "new\n",
+            str(self.base / "new.py"): "x = 1\n",
+        })
+
+        self.assertEqual(existing.read_text(), "new\n")
+        self.assertEqual(existing.stat().st_mode & 0o777, 0o755)
+        self.assertEqual((self.base / "new.py").read_text(), "x = 1\n")
+        self.assertEqual(sorted(p.name for p in self.base.iterdir()), ["new.py", "run.sh"])
+
+    def test_new_files_get_the_umask_mode_without_changing_it(self):
+        plain = self.base / "plain.py"
+        plain.write_text("")
+
+        with patch("devmate.tools.filesystem.os.umask") as umask:
+            filesystem.write_files_atomic({str(self.base / "new.py"): "x = 1\n"})
+        umask.assert_not_called()
+
+        self.assertEqual(
+            (self.base / "new.py").stat().st_mode & 0o777,
+            plain.stat().st_mode & 0o777,
+        )
+
+    def test_failed_write_replaces_nothing(self):
+        existing = self.base / "a.py"
+        existing.write_text("old\n")
+
+        with self.assertRaises(OSError):
+            filesystem.write_files_atomic({
+                str(existing): "new\n",
+                str(self.base / "missing" / "b.py"): "b\n",
+            })
+
+        self.assertEqual(existing.read_text(), "old\n")
+        self.assertEqual([p.name for p in self.base.iterdir()], ["a.py"])
+
+    def test_symlinks_are_followed(self):
+        real = self.base / "real.py"
+        real.write_text("old\n")
+        link = self.base / "link.py"
+        link.symlink_to(real)
+
+        filesystem.write_files_atomic({str(link): "new\n"})
+
+        self.assertTrue(link.is_symlink())
+        self.assertEqual(real.read_text(), "new\n")
+        self.assertEqual(sorted(p.name for p in self.base.iterdir()), ["link.py", "real.py"])
+
+    def test_hard_links_keep_sharing_the_file(self):
+        first = self.base / "a.py"
+        first.write_text("old\n")
+        second = self.base / "b.py"
+        os.link(first, second)
+
+        written = filesystem.write_files_atomic({str(first): "new\n"})
+
+        self.assertEqual(written, [str(first)])
+        self.assertEqual(second.read_text(), "new\n")
+        self.assertTrue(os.path.samefile(first, second))
+
+
+class TestWriteFile(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "a.py"
+        self.path.write_text("x = 1\n")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_identical_content_is_not_rewritten(self):
+        before = self.path.stat()
+
+        with patch("devmate.tools.filesystem.os.replace") as replace:
+            self.assertFalse(filesystem.write_file(str(self.path), "x = 1\n"))
+        replace.assert_not_called()
+        self.assertEqual(self.path.stat().st_mtime_ns, before.st_mtime_ns)
+
+    def test_changed_content_is_written(self):
+        # Same size, different bytes
+        self.assertTrue(filesystem.write_file(str(self.path), "x = 2\n"))
+        self.assertEqual(self.path.read_text(), "x = 2\n")
+
+    def test_same_content_compares_size_first(self):
+        with patch("builtins.open") as mock_open:
+            self.assertFalse(filesystem.same_content(str(self.path), b"longer content\n"))
+        mock_open.assert_not_called()
+        self.assertFalse(filesystem.same_content(str(self.path) + ".missing", b""))
+
+
+class TestLineReads(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "log.txt"
+        self.path.write_text("".join(f"line {i}\n" for i in range(1, 11)))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_line_offsets(self):
+        offsets = filesystem.line_offsets(str(self.path))
+
+        self.assertEqual(len(offsets) - 1, 10)
+        self.assertEqual(offsets[1], len("line 1\n"))
+        self.assertEqual(offsets[-1], self.path.stat().st_size)
+
+    def test_offsets_are_cached_until_the_file_changes(self):
+        filesystem.line_offsets(str(self.path))
+        with patch("devmate.tools.filesystem._scan_line_offsets") as scan:
+            filesystem.line_offsets(str(self.path))
+        scan.assert_not_called()
+
+        self.path.write_text("only\nlines\nleft")
+        self.assertEqual(filesystem.read_lines(str(self.path), 3), ("left", 3, 3, 3))
+
+    def test_read_lines_clamps_to_the_file(self):
+        text, start, end, total = filesystem.read_lines(str(self.path), 9, 20)
+
+        self.assertEqual(text, "line 9\nline 10\n")
+        self.assertEqual((start, end, total), (9, 10, 10))
+        self.assertEqual(filesystem.read_lines(str(self.path), 11)[0], "")
+
+    def test_read_range(self):
+        self.assertEqual(filesystem.read_range(str(self.path), 7, 6), ("line 2", self.path.stat().st_size))
+
+        binary = Path(self.tmpdir.name) / "a.bin"
+        binary.write_bytes(b"\x00\x01")
+        with self.assertRaises(ValueError):
+            filesystem.read_range(str(binary))
+
+    def test_slice_and_splice_lines(self):
+        text = "a\nb\nc\n"
+
+        self.assertEqual(filesystem.slice_lines(text, 2, 3), ("b\nc\n", 2, 3, 3))
+        self.assertEqual(filesystem.splice_lines(text, 2, 2, "B1\nB2"), "a\nB1\nB2\nc\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import patch
+
+from devmate.config import settings
+from devmate.core.intent_router import IntentRouter, classify
+from devmate.core.planner import Planner
+
+
+class TestIntentRouter(unittest.TestCase):
+
+    def setUp(self):
+        self.router = IntentRouter()
+
+    def test_known_intents_map_to_fixed_plans(self):
+        cases = {
+            "git status": [{"action": "git_status"}],
+            "Show the diff.": [{"action": "git_diff"}],
+            "list files in devmate/core": [{"action": "list_files", "payload": {"path": "devmate/core"}}],
+            "read README.md": [{"action": "read_file", "payload": {"path": "README.md"}}],
+            "list open PRs for owner/repo": [{"action": "github_list_prs", "payload": {"repo": "owner/repo"}}],
+            "please show PR #12 in Owner/Repo": [{"action": "github_get_pr", "payload": {"repo": "Owner/Repo", "pr": 12}}],
+            "list comments on PR 3 in owner/repo": [
+                {"action": "github_get_pr_comments", "payload": {"repo": "owner/repo", "pr": 3}}
+            ],
+            "fix review comments for PR 1 in owner/repo": [
+                {"action": "github_list_review_comments", "payload": {"repo": "owner/repo", "pr": 1}}
+            ],
+        }
+        for intent, plan in cases.items():
+            with self.subTest(intent=intent):
+                self.assertEqual(self.router.route(intent), plan)
+
+    def test_open_ended_intents_fall_through(self):
+        for intent in ("read the readme", "explain executor", "what files have changed", "change the status code"):
+            with self.subTest(intent=intent):
+                self.assertIsNone(self.router.route(intent))
+
+    def test_classifier_is_opt_in(self):
+        router = IntentRouter(use_classifier=True)
+
+        self.assertEqual(router.route("what files have changed"), [{"action": "git_status"}])
+        self.assertEqual(router.route("show uncommitted changes"), [{"action": "git_diff"}])
+        self.assertIsNone(router.route("change the status code"))
+
+    def test_classify_requires_every_word_in_vocabulary(self):
+        self.assertEqual(classify("what changed in git"), "git_status")
+        self.assertIsNone(classify("explain the git changes in executor"))
+        self.assertIsNone(classify(""))
+
+
+class TestPlannerRouting(unittest.TestCase):
+
+    @patch("devmate.core.planner.LLMClient")
+    def test_routed_intent_skips_the_llm(self, MockLLM):
+        planner = Planner()
+
+        self.assertEqual(planner.create_plan("git status"), [{"action": "git_status"}])
+        self.assertEqual(list(planner.stream_plan("git diff")), [{"action": "git_diff"}])
+        MockLLM.return_value.generate.assert_not_called()
+        MockLLM.return_value.stream.assert_not_called()
+
+    @patch.object(settings, "INTENT_ROUTER", False)
+    @patch("devmate.core.planner.LLMClient")
+    def test_router_can_be_disabled(self, MockLLM):
+        MockLLM.return_value.generate.return_value = '[{"action": "git_status"}]'
+
+        Planner().create_plan("git status")
+
+        MockLLM.return_value.generate.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
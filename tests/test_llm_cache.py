@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from devmate.core.llm_cache import ResponseCache
+from devmate.core.llm_client import LLMClient
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.sqlite3")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_key_depends_on_model_temperature_and_prompt(self):
+        key = ResponseCache.key("m", 0.2, "hello")
+
+        self.assertEqual(key, ResponseCache.key("m", 0.2, "hello"))
+        self.assertNotEqual(key, ResponseCache.key("m", 0.3, "hello"))
+        self.assertNotEqual(key, ResponseCache.key("other", 0.2, "hello"))
+        self.assertNotEqual(key, ResponseCache.key("m", 0.2, "hello!"))
+
+    def test_get_counts_hits_and_misses_and_persists(self):
+        cache = ResponseCache(self.path)
+        key = cache.key("m", 0.2, "p")
+
+        self.assertIsNone(cache.get(key))
+        cache.put(key, "answer")
+        self.assertEqual(cache.get(key), "answer")
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+        self.assertEqual(ResponseCache(self.path).get(key), "answer")
+
+    def test_expired_entries_are_misses(self):
+        cache = ResponseCache(self.path, ttl=10)
+        cache.put("k", "old")
+
+        with patch("devmate.core.llm_cache.time") as mock_time:
+            mock_time.time.return_value = 1e12
+            self.assertIsNone(cache.get("k"))
+
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResponseCache(self.path, ttl=1e12, max_entries=2)
+
+        with patch("devmate.core.llm_cache.time") as mock_time:
+            mock_time.time.side_effect = [1, 2, 3, 4]
+            cache.put("a", "1")
+            cache.put("b", "2")
+            cache.get("a")
+            cache.put("c", "3")
+
+        self.assertEqual(cache.get("a"), "1")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "3")
+
+    def test_size_bound_evicts_entries(self):
+        cache = ResponseCache(self.path, max_bytes=10)
+        cache.put("a", "x" * 8)
+        cache.put("b", "y" * 8)
+
+        self.assertEqual(cache.stats()["entries"], 1)
+        self.assertEqual(cache.get("b"), "y" * 8)
+
+
+class TestLLMClientCache(unittest.TestCase):
+
+    @patch('devmate.core.llm_client.settings')
+    @patch('devmate.core.llm_client.OpenAI')
+    def test_repeated_prompt_is_served_from_cache(self, mock_openai, mock_settings):
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_settings.validate = MagicMock()
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "cached answer"
+        mock_create = mock_openai.return_value.chat.completions.create
+        mock_create.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(os.path.join(tmp, "cache.sqlite3"))
+            client = LLMClient(cache=cache)
+
+            self.assertEqual(client.generate("same prompt"), "cached answer")
+            self.assertEqual(client.generate("same prompt"), "cached answer")
+
+        mock_create.assert_called_once()
+        self.assertEqual(cache.hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
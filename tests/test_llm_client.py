@@ -1,6 +1,8 @@
+import asyncio
 import unittest
 from unittest.mock import patch, MagicMock
-from devmate.core.llm_client import LLMClient
+from devmate.core.llm_client import AsyncLLMClient, LLMClient, build_messages
+from devmate.core import transport
 from devmate.config import Settings
 
 
@@ -22,7 +24,11 @@ class TestLLMClient(unittest.TestCase):
 
         # Assertions
         mock_settings.validate.assert_called_once()
-        mock_openai.assert_called_once_with(api_key="test-key-123")
+        mock_openai.assert_called_once_with(
+            api_key="test-key-123",
+            http_client=transport.http_client(),
+            max_retries=0,
+        )
         self.assertEqual(client.client, mock_client_instance)
 
     @patch('devmate.core.llm_client.settings')
@@ -83,6 +89,139 @@ class TestLLMClient(unittest.TestCase):
                 client = LLMClient()
             self.assertIn("API key missing", str(context.exception))
 
+    @patch('devmate.core.llm_client.settings')
+    @patch('devmate.core.llm_client.OpenAI')
+    def test_llm_client_sends_structured_messages_and_tracks_cached_tokens(self, mock_openai, mock_settings):
+        """Test that message lists are sent as-is and cached prefix tokens are counted"""
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_settings.validate = MagicMock()
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "ok"
+        mock_response.usage.prompt_tokens = 1200
+        mock_response.usage.completion_tokens = 10
+        mock_response.usage.prompt_tokens_details = {"cached_tokens": 1024}
+        create = mock_openai.return_value.chat.completions.create
+        create.return_value = mock_response
+
+        client = LLMClient(cache=None)
+        messages = build_messages("static instructions", "variable part")
+        client.generate(messages)
+
+        self.assertEqual(create.call_args.kwargs["messages"], messages)
+        self.assertEqual(messages[0], {"role": "system", "content": "static instructions"})
+        self.assertEqual(client.usage["prompt_tokens"], 1200)
+        self.assertEqual(client.usage["cached_tokens"], 1024)
+
+    @patch('devmate.core.llm_client.settings')
+    @patch('devmate.core.llm_client.OpenAI')
+    def test_llm_client_stream_yields_deltas(self, mock_openai, mock_settings):
+        """Test that stream() requests a streamed completion and yields its deltas"""
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_settings.validate = MagicMock()
+
+        chunks = []
+        for text in ["[", None, "{}", "]"]:
+            chunk = MagicMock()
+            chunk.choices = [MagicMock()]
+            chunk.choices[0].delta.content = text
+            chunks.append(chunk)
+
+        create = mock_openai.return_value.chat.completions.create
+        create.return_value = iter(chunks)
+
+        client = LLMClient(cache=None)
+
+        self.assertEqual(list(client.stream("Test prompt")), ["[", "{}", "]"])
+        self.assertTrue(create.call_args.kwargs["stream"])
+
+    @patch('devmate.core.llm_client.settings')
+    @patch('devmate.core.llm_client.OpenAI')
+    def test_llm_client_stream_caches_only_validated_output(self, mock_openai, mock_settings):
+        """Test that a streamed output failing validation is not cached"""
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_settings.validate = MagicMock()
+
+        chunk = MagicMock()
+        chunk.choices = [MagicMock()]
+        chunk.choices[0].delta.content = "not json"
+        mock_openai.return_value.chat.completions.create.side_effect = lambda **kw: iter([chunk])
+
+        cache = MagicMock()
+        cache.get.return_value = None
+        client = LLMClient(cache=cache)
+
+        def reject(text):
+            raise ValueError("invalid")
+
+        with self.assertRaises(ValueError):
+            list(client.stream("Test prompt", validate=reject))
+        cache.put.assert_not_called()
+
+        self.assertEqual(list(client.stream("Test prompt", validate=len)), ["not json"])
+        cache.put.assert_called_once()
+
+
+class TestAsyncLLMClient(unittest.TestCase):
+    """Fan-out behaviour of the async client"""
+
+    @patch('devmate.core.llm_client.settings')
+    @patch('devmate.core.llm_client.AsyncOpenAI')
+    def test_generate_many_preserves_order_and_bounds_concurrency(self, mock_openai, mock_settings):
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_settings.validate = MagicMock()
+
+        in_flight = 0
+        peak = 0
+
+        async def create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            prompt = kwargs["messages"][0]["content"]
+            # Later prompts finish first
+            await asyncio.sleep(0.01 * (10 - int(prompt)))
+            in_flight -= 1
+
+            response = MagicMock()
+            response.choices = [MagicMock()]
+            response.choices[0].message.content = f"answer {prompt}"
+            return response
+
+        mock_openai.return_value.chat.completions.create = create
+
+        client = AsyncLLMClient(max_concurrency=3, cache=None)
+        prompts = [str(i) for i in range(8)]
+        results = asyncio.run(client.generate_many(prompts))
+
+        self.assertEqual(results, [f"answer {i}" for i in range(8)])
+        self.assertEqual(peak, 3)
+
+    @patch('devmate.core.llm_client.settings')
+    @patch('devmate.core.llm_client.AsyncOpenAI')
+    def test_generate_many_can_return_exceptions(self, mock_openai, mock_settings):
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_settings.validate = MagicMock()
+
+        async def create(**kwargs):
+            if kwargs["messages"][0]["content"] == "bad":
+                raise RuntimeError("boom")
+            response = MagicMock()
+            response.choices = [MagicMock()]
+            response.choices[0].message.content = "ok"
+            return response
+
+        mock_openai.return_value.chat.completions.create = create
+
+        client = AsyncLLMClient(max_concurrency=2, cache=None)
+        results = asyncio.run(
+            client.generate_many(["good", "bad"], return_exceptions=True)
+        )
+
+        self.assertEqual(results[0], "ok")
+        self.assertIsInstance(results[1], RuntimeError)
+
 
 if __name__ == "__main__":
     unittest.main()
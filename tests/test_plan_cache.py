@@ -0,0 +1,105 @@
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from devmate.core.plan_cache import PlanCache, normalize_intent
+from devmate.core.planner import Planner
+
+
+PLAN = [{"action": "read_file", "payload": {"path": "a.py"}}]
+
+
+class TestPlanCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        (self.root / "a.py").write_text("a = 1\n")
+        (self.root / "b.py").write_text("b = 1\n")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _git(self, *args):
+        subprocess.run(["git", *args], cwd=self.root, check=True, capture_output=True)
+
+    def test_normalize_intent(self):
+        self.assertEqual(normalize_intent("  Explain   the Executor. "), "explain the executor")
+
+    def test_hit_survives_reload_and_normalization(self):
+        PlanCache(str(self.root)).put("explain a", ["a.py"], PLAN)
+
+        cache = PlanCache(str(self.root))
+        self.assertEqual(cache.get("Explain  A!"), PLAN)
+        self.assertEqual(cache.hits, 1)
+        self.assertTrue((self.root / ".devmate" / "plans.json").exists())
+
+    def test_editing_a_selected_file_invalidates(self):
+        cache = PlanCache(str(self.root))
+        cache.put("explain a", ["a.py"], PLAN)
+
+        (self.root / "b.py").write_text("b = 2\n")
+        self.assertEqual(cache.get("explain a"), PLAN)
+
+        (self.root / "a.py").write_text("a = 2\n")
+        self.assertIsNone(cache.get("explain a"))
+
+    def test_new_commit_or_salt_invalidates(self):
+        self._git("init", "-q")
+        self._git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "one")
+
+        cache = PlanCache(str(self.root))
+        cache.put("explain a", ["a.py"], PLAN, salt="v1")
+        self.assertEqual(cache.get("explain a", salt="v1"), PLAN)
+        self.assertIsNone(cache.get("explain a", salt="v2"))
+
+        self._git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "two")
+        self.assertIsNone(cache.get("explain a", salt="v1"))
+
+    def test_oldest_entries_are_evicted(self):
+        cache = PlanCache(str(self.root), max_entries=2)
+        for intent in ("one", "two", "three"):
+            cache.put(intent, [], PLAN)
+
+        self.assertIsNone(cache.get("one"))
+        self.assertEqual(cache.get("three"), PLAN)
+
+
+class TestPlannerPlanCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        (self.root / "a.py").write_text("a = 1\n")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    @patch("devmate.core.planner.LLMClient")
+    def test_repeated_intent_skips_the_llm_until_context_changes(self, MockLLM):
+        mock_llm = MagicMock()
+        mock_llm.generate.return_value = '[{"action": "read_file", "payload": {"path": "a.py"}}]'
+        MockLLM.return_value = mock_llm
+
+        planner = Planner()
+        planner.plan_cache = PlanCache(str(self.root))
+        planner._select_relevant_files = MagicMock(return_value=["a.py"])
+        planner.builder = MagicMock()
+        planner.builder.read_files.return_value = ""
+
+        first = planner.create_plan("explain a")
+        second = planner.create_plan("Explain a.")
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_llm.generate.call_count, 1)
+        self.assertEqual(planner._select_relevant_files.call_count, 1)
+
+        (self.root / "a.py").write_text("a = 2\n")
+        planner.create_plan("explain a")
+        self.assertEqual(mock_llm.generate.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
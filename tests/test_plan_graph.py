@@ -0,0 +1,52 @@
+import unittest
+
+from devmate.core.plan_graph import dependencies, waves
+
+
+def read(path):
+    return {"action": "read_file", "payload": {"path": path}}
+
+
+class TestPlanGraph(unittest.TestCase):
+
+    def test_independent_reads_share_a_wave(self):
+        plan = [read("a.py"), read("b.py"), {"action": "git_status"}, {"action": "git_diff"}]
+
+        self.assertEqual(waves(plan), [[0, 1, 2, 3]])
+
+    def test_side_effects_are_barriers(self):
+        plan = [
+            read("a.py"),
+            read("b.py"),
+            {"action": "write_file", "payload": {"path": "a.py", "content": "x"}},
+            read("a.py"),
+            {"action": "github_get_pr", "payload": {"repo": "o/r", "pr": 1}},
+            {"action": "print", "payload": {"message": "done"}},
+        ]
+
+        self.assertEqual(waves(plan), [[0, 1], [2], [3, 4], [5]])
+        self.assertEqual(dependencies(plan)[2], {0, 1})
+        self.assertEqual(dependencies(plan)[3], {2})
+
+    def test_explicit_dependencies(self):
+        plan = [
+            {"action": "github_list_prs", "payload": {"repo": "o/r"}},
+            dict(read("a.py")),
+            {"action": "github_get_pr", "payload": {"repo": "o/r", "pr": 1}, "depends_on": [0]},
+        ]
+
+        self.assertEqual(waves(plan), [[0, 1], [2]])
+
+    def test_invalid_dependencies_raise(self):
+        for deps in ([1], [5], [-1], ["0"], [True]):
+            with self.subTest(deps=deps):
+                plan = [read("a.py"), dict(read("b.py"), depends_on=deps)]
+                with self.assertRaises(ValueError):
+                    dependencies(plan)
+
+    def test_empty_plan(self):
+        self.assertEqual(waves([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
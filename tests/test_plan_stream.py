@@ -0,0 +1,56 @@
+import unittest
+
+from devmate.core.plan_stream import JsonArrayStream
+
+
+class TestJsonArrayStream(unittest.TestCase):
+
+    def feed_all(self, chunks):
+        parser = JsonArrayStream()
+        items = []
+        for chunk in chunks:
+            items.append(parser.feed(chunk))
+        return parser, items
+
+    def test_elements_are_emitted_as_soon_as_they_close(self):
+        text = '[{"action": "noop"}, {"action": "print", "payload": {"message": "hi"}}]'
+        parser, items = self.feed_all([text[:20], text[20:50], text[50:]])
+
+        self.assertEqual(items[0], [{"action": "noop"}])
+        self.assertEqual(items[1], [])
+        self.assertEqual(items[2], [{"action": "print", "payload": {"message": "hi"}}])
+        parser.close()
+
+    def test_character_by_character_with_tricky_strings(self):
+        text = '```json\n[{"action": "print", "payload": {"message": "a } ] , \\" ["}}, "x", 3]'
+        parser, items = self.feed_all(list(text))
+
+        flat = [item for batch in items for item in batch]
+        self.assertEqual(
+            flat,
+            [{"action": "print", "payload": {"message": 'a } ] , " ['}}, "x", 3],
+        )
+        parser.close()
+
+    def test_unterminated_array_is_invalid(self):
+        parser, items = self.feed_all(['[{"action": "noop"}, '])
+
+        self.assertEqual(items[0], [{"action": "noop"}])
+        with self.assertRaises(ValueError):
+            parser.close()
+
+    def test_missing_array_is_invalid(self):
+        parser, _ = self.feed_all(["not json"])
+
+        with self.assertRaises(ValueError):
+            parser.close()
+
+    def test_malformed_element_raises(self):
+        parser = JsonArrayStream()
+
+        with self.assertRaises(ValueError):
+            parser.feed('[{"action": noop}]')
+
+
+if __name__ == "__main__":
+    unittest.main()
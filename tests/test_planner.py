@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import patch, MagicMock
-from devmate.core.planner import Planner
+from devmate.core.planner import CONTEXT_SELECTION_PROMPT, SINGLE_PASS_PROMPT, SYSTEM_PROMPT, Planner
+from devmate.config import settings
 
 
 class TestLLMPlanner(unittest.TestCase):
@@ -90,16 +91,21 @@ class TestLLMPlanner(unittest.TestCase):
 
         planner.create_plan("do something")
 
-        prompt = mock_llm.generate.call_args[0][0]
+        system, user = mock_llm.generate.call_args[0][0]
 
-        self.assertIn("Repository context", prompt)
-        self.assertIn("test.py", prompt)
-        self.assertIn("print('hello')", prompt)
+        # Static instructions form a byte-stable system prefix
+        self.assertEqual(system, {"role": "system", "content": SYSTEM_PROMPT})
+        self.assertEqual(user["role"], "user")
+        self.assertIn("Repository context", user["content"])
+        self.assertIn("test.py", user["content"])
+        self.assertIn("print('hello')", user["content"])
+        self.assertTrue(user["content"].endswith("User intent:\ndo something"))
 
 
 
 
     
+    @patch.object(settings, "LLM_RERANK", True)
     @patch("devmate.core.planner.LLMClient")
     def test_context_selection_called(self, MockLLM):
         mock_llm = MockLLM.return_value
@@ -115,4 +121,105 @@ class TestLLMPlanner(unittest.TestCase):
 
         self.assertEqual(mock_llm.generate.call_count, 2)
 
+        system, user = mock_llm.generate.call_args_list[0][0][0]
+        self.assertEqual(system["content"], CONTEXT_SELECTION_PROMPT)
+        self.assertIn("devmate/core/executor.py", user["content"])
+
+
+
+    @patch("devmate.core.planner.LLMClient")
+    def test_local_ranking_skips_selection_round_trip(self, MockLLM):
+        mock_llm = MockLLM.return_value
+        mock_llm.generate.return_value = '[{"action": "noop"}]'
+
+        planner = Planner()
+        planner.create_plan("explain executor")
+
+        self.assertEqual(mock_llm.generate.call_count, 1)
+        user = mock_llm.generate.call_args[0][0][-1]
+        self.assertIn("--- FILE: devmate/core/executor.py ---", user["content"])
+
+    @patch("devmate.core.planner.LLMClient")
+    def test_stream_plan_yields_validated_steps(self, MockLLM):
+        mock_llm = MagicMock()
+        mock_llm.stream.return_value = iter(
+            ['[{"action": "no', 'op"}, {"action": "print", ', '"payload": {"message": "Hi"}}]']
+        )
+        MockLLM.return_value = mock_llm
+
+        planner = Planner()
+        steps = planner.stream_plan("say hi")
+
+        self.assertEqual(next(steps), {"action": "noop"})
+        self.assertEqual(next(steps)["payload"]["message"], "Hi")
+        self.assertEqual(list(steps), [])
+
+    @patch("devmate.core.planner.LLMClient")
+    def test_stream_plan_rejects_unknown_action_mid_stream(self, MockLLM):
+        mock_llm = MagicMock()
+        mock_llm.stream.return_value = iter(['[{"action": "noop"}, {"action": "rm_rf"}]'])
+        MockLLM.return_value = mock_llm
+
+        steps = Planner().stream_plan("break it")
+
+        self.assertEqual(next(steps), {"action": "noop"})
+        with self.assertRaises(ValueError):
+            next(steps)
+
+
+class TestSinglePassPlanner(unittest.TestCase):
+
+    @patch.object(settings, "PLAN_MODE", "single_pass")
+    @patch("devmate.core.planner.RepoContextBuilder")
+    @patch("devmate.core.planner.LLMClient")
+    def test_single_request_turns_files_into_read_steps(self, MockLLM, MockContext):
+        mock_llm = MockLLM.return_value
+        mock_llm.generate.return_value = """
+        {"files": ["devmate/tools/git.py", "made/up.py"],
+         "plan": [{"action": "print", "payload": {"message": "done"}}]}
+        """
+        MockContext.return_value.outline.return_value = {
+            "text": "devmate/tools/git.py: commit()",
+            "paths": ["devmate/tools/git.py"],
+        }
+
+        plan = Planner().create_plan("explain commits")
+
+        self.assertEqual(mock_llm.generate.call_count, 1)
+        self.assertEqual(plan, [
+            {"action": "read_file", "payload": {"path": "devmate/tools/git.py"}},
+            {"action": "print", "payload": {"message": "done"}},
+        ])
+
+        system, user = mock_llm.generate.call_args[0][0]
+        self.assertEqual(system["content"], SINGLE_PASS_PROMPT)
+        self.assertIn("devmate/tools/git.py: commit()", user["content"])
+        MockContext.return_value.read_files.assert_not_called()
+
+    @patch.object(settings, "PLAN_MODE", "single_pass")
+    @patch("devmate.core.planner.RepoContextBuilder")
+    @patch("devmate.core.planner.LLMClient")
+    def test_single_pass_rejects_bare_list(self, MockLLM, MockContext):
+        MockLLM.return_value.generate.return_value = '[{"action": "noop"}]'
+        MockContext.return_value.outline.return_value = {"text": "", "paths": []}
+
+        with self.assertRaises(ValueError):
+            Planner().create_plan("do something")
+
+    @patch.object(settings, "PLAN_MODE", "single_pass")
+    @patch("devmate.core.planner.RepoContextBuilder")
+    @patch("devmate.core.planner.LLMClient")
+    def test_single_pass_shifts_dependencies_past_prepended_reads(self, MockLLM, MockContext):
+        MockLLM.return_value.generate.return_value = """
+        {"files": ["a.py", "b.py"],
+         "plan": [{"action": "git_status"}, {"action": "git_diff"},
+                  {"action": "print", "payload": {"message": "x"}},
+                  {"action": "read_file", "payload": {"path": "c.py"}, "depends_on": [1]}]}
+        """
+        MockContext.return_value.outline.return_value = {"text": "", "paths": ["a.py", "b.py"]}
+
+        plan = Planner().create_plan("explain things")
+
+        self.assertEqual(plan[5]["depends_on"], [3])
+        self.assertEqual(plan[3]["action"], "git_diff")
 
@@ -1,6 +1,9 @@
+import tempfile
 import unittest
-from unittest.mock import patch, MagicMock
+from pathlib import Path
+from unittest.mock import patch, MagicMock, AsyncMock
 
+from devmate.config import settings
 from devmate.core.agent import Agent
 
 
@@ -30,7 +33,7 @@ class TestPRAutoFix(unittest.TestCase):
         mock_planner = MagicMock()
         mock_planner.create_plan.return_value = [
             {
-                "action": "github_list_pr_review_comments",
+                "action": "github_list_review_comments",
                 "payload": {"repo": "owner/repo", "pr": 1},
             }
         ]
@@ -40,7 +43,7 @@ class TestPRAutoFix(unittest.TestCase):
         mock_executor = MagicMock()
 
         mock_executor.execute.side_effect = [
-            # github_list_pr_review_comments
+            # github_list_review_comments
             {
                 "comments": [
                     {
@@ -53,7 +56,7 @@ class TestPRAutoFix(unittest.TestCase):
             # read_file
             {"content": "x=1"},
             # write_file
-            {},
+            {"written": "foo.py", "changed": True},
             # git_commit
             {},
         ]
@@ -62,7 +65,7 @@ class TestPRAutoFix(unittest.TestCase):
 
         # -------- CodeFixer mock --------
         mock_fixer = MagicMock()
-        mock_fixer.fix.return_value = "better_name = 1"
+        mock_fixer.afix = AsyncMock(return_value="better_name = 1")
         mock_fixer_cls.return_value = mock_fixer
 
         # -------- Run agent --------
@@ -77,13 +80,232 @@ class TestPRAutoFix(unittest.TestCase):
         # Executor calls
         calls = mock_executor.execute.call_args_list
 
-        self.assertEqual(calls[0][0][0], "github_list_pr_review_comments")
+        self.assertEqual(calls[0][0][0], "github_list_review_comments")
         self.assertEqual(calls[1][0][0], "read_file")
         self.assertEqual(calls[2][0][0], "write_file")
         self.assertEqual(calls[3][0][0], "git_commit")
 
         # Fixer called
-        mock_fixer.fix.assert_called_once_with("x=1", "Use better variable names")
+        mock_fixer.afix.assert_awaited_once_with("x=1", "Use better variable names")
 
         # Final result sanity
-        self.assertEqual(results[0]["action"], "github_list_pr_review_comments")
+        self.assertEqual(results[0]["action"], "github_list_review_comments")
+
+    @patch("devmate.core.agent.CodeFixer")
+    @patch("devmate.core.agent.Executor")
+    @patch("devmate.core.agent.Planner")
+    def test_comments_on_same_file_are_applied_in_sequence(
+        self,
+        mock_planner_cls,
+        mock_executor_cls,
+        mock_fixer_cls,
+    ):
+        mock_planner_cls.return_value.create_plan.return_value = [
+            {"action": "github_list_review_comments", "payload": {"pr": 1}}
+        ]
+
+        files = {"a.py": "a0", "b.py": "b0"}
+
+        def execute(action, payload):
+            if action == "github_list_review_comments":
+                return {
+                    "comments": [
+                        {"path": "a.py", "body": "first"},
+                        {"path": "b.py", "body": "only"},
+                        {"path": "a.py", "body": "second"},
+                        {"path": None, "body": "ignored"},
+                    ]
+                }
+            if action == "read_file":
+                return {"content": files[payload["path"]]}
+            if action == "write_file":
+                changed = files[payload["path"]] != payload["content"]
+                files[payload["path"]] = payload["content"]
+                return {"written": payload["path"], "changed": changed}
+            return {}
+
+        mock_executor_cls.return_value.execute.side_effect = execute
+
+        async def afix(code, comment):
+            return f"{code}+{comment}"
+
+        mock_fixer_cls.return_value.afix = AsyncMock(side_effect=afix)
+
+        with patch("devmate.core.agent.transport.aclose_loop_client", new_callable=AsyncMock) as aclose:
+            Agent().run("fix review comments")
+        aclose.assert_awaited_once()
+
+        self.assertEqual(files["a.py"], "a0+first+second")
+        self.assertEqual(files["b.py"], "b0+only")
+        self.assertEqual(mock_fixer_cls.return_value.afix.await_count, 3)
+
+    @patch.object(settings, "FIX_MODE", "batch")
+    @patch("devmate.core.agent.CodeFixer")
+    @patch("devmate.core.agent.Executor")
+    @patch("devmate.core.agent.Planner")
+    def test_batch_mode_submits_one_job_per_file(
+        self,
+        mock_planner_cls,
+        mock_executor_cls,
+        mock_fixer_cls,
+    ):
+        mock_planner_cls.return_value.create_plan.return_value = [
+            {"action": "github_list_review_comments", "payload": {"pr": 1}}
+        ]
+
+        files = {"a.py": "a0", "b.py": "b0"}
+
+        def execute(action, payload):
+            if action == "github_list_review_comments":
+                return {
+                    "comments": [
+                        {"path": "a.py", "body": "first"},
+                        {"path": "b.py", "body": "only"},
+                        {"path": "a.py", "body": "second"},
+                    ]
+                }
+            if action == "read_file":
+                return {"content": files[payload["path"]]}
+            if action == "write_file":
+                changed = files[payload["path"]] != payload["content"]
+                files[payload["path"]] = payload["content"]
+                return {"written": payload["path"], "changed": changed}
+            return {}
+
+        mock_executor_cls.return_value.execute.side_effect = execute
+        mock_fixer = mock_fixer_cls.return_value
+        mock_fixer.fix_batch.return_value = ["a1", None]
+
+        Agent().run("fix review comments")
+
+        mock_fixer.fix_batch.assert_called_once_with(
+            [("a0", ["first", "second"]), ("b0", ["only"])]
+        )
+        mock_fixer.afix.assert_not_called()
+        self.assertEqual(files, {"a.py": "a1", "b.py": "b0"})
+
+    @patch("devmate.core.agent.CodeFixer")
+    @patch("devmate.core.agent.Executor")
+    @patch("devmate.core.agent.Planner")
+    def test_no_commit_when_fixes_change_nothing(
+        self,
+        mock_planner_cls,
+        mock_executor_cls,
+        mock_fixer_cls,
+    ):
+        mock_planner_cls.return_value.create_plan.return_value = [
+            {"action": "github_list_review_comments", "payload": {"pr": 1}}
+        ]
+
+        def execute(action, payload):
+            if action == "github_list_review_comments":
+                return {"comments": [{"path": "a.py", "body": "looks fine"}]}
+            if action == "read_file":
+                return {"content": "a0"}
+            if action == "write_file":
+                return {"written": payload["path"], "changed": False}
+            return {}
+
+        mock_executor_cls.return_value.execute.side_effect = execute
+        mock_fixer_cls.return_value.afix = AsyncMock(return_value="a0")
+
+        Agent().run("fix review comments")
+
+        actions = [c[0][0] for c in mock_executor_cls.return_value.execute.call_args_list]
+        self.assertNotIn("git_commit", actions)
+
+    @patch.object(settings, "FIX_WINDOW_BYTES", 100)
+    @patch.object(settings, "FIX_CONTEXT_LINES", 1)
+    @patch("devmate.core.executor.git.commit", return_value="ok")
+    @patch("devmate.core.executor.github.list_pr_review_comments")
+    @patch("devmate.core.agent.CodeFixer")
+    @patch("devmate.core.agent.Planner")
+    def test_large_files_are_fixed_on_a_line_window(
+        self,
+        mock_planner_cls,
+        mock_fixer_cls,
+        mock_list_comments,
+        mock_commit,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "big.py"
+            path.write_text("".join(f"x{i} = {i}\n" for i in range(1, 51)))
+
+            mock_planner_cls.return_value.create_plan.return_value = [
+                {"action": "github_list_review_comments", "payload": {"repo": "o/r", "pr": 1}}
+            ]
+            mock_list_comments.return_value = [
+                {"path": str(path), "body": "rename x10", "line": 10},
+                {"path": str(path), "body": "rename x30", "line": 30},
+            ]
+
+            async def afix(code, comment, region=None):
+                # Grow the first window by a line to shift later comments
+                if comment == "rename x10":
+                    return "a = 9\nten = 10\nextra = 0\na = 11\n"
+                return code.replace("x30", "thirty")
+
+            mock_fixer = mock_fixer_cls.return_value
+            mock_fixer.afix = AsyncMock(side_effect=afix)
+
+            Agent().run("fix review comments")
+
+            first, second = mock_fixer.afix.await_args_list
+            self.assertEqual(first.args, ("x9 = 9\nx10 = 10\nx11 = 11\n", "rename x10"))
+            self.assertEqual(first.kwargs, {"region": (9, 11)})
+            self.assertEqual(second.kwargs, {"region": (30, 32)})
+
+            lines = path.read_text().splitlines()
+            self.assertEqual(lines[8:12], ["a = 9", "ten = 10", "extra = 0", "a = 11"])
+            self.assertEqual(lines[30], "thirty = 30")
+            self.assertEqual(len(lines), 51)
+            mock_commit.assert_called_once()
+
+
+    @patch.object(settings, "FIX_WINDOW_BYTES", 100)
+    @patch.object(settings, "FIX_CONTEXT_LINES", 1)
+    @patch("devmate.core.executor.git.commit", return_value="ok")
+    @patch("devmate.core.executor.github.list_pr_review_comments")
+    @patch("devmate.core.agent.CodeFixer")
+    @patch("devmate.core.agent.Planner")
+    def test_window_shifts_accumulate_past_later_comments(
+        self,
+        mock_planner_cls,
+        mock_fixer_cls,
+        mock_list_comments,
+        mock_commit,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "big.py"
+            path.write_text("".join(f"x{i} = {i}\n" for i in range(1, 201)))
+
+            mock_planner_cls.return_value.create_plan.return_value = [
+                {"action": "github_list_review_comments", "payload": {"repo": "o/r", "pr": 1}}
+            ]
+            # Growth from the first two fixes (105 lines) exceeds the gap
+            # between the comments
+            mock_list_comments.return_value = [
+                {"path": str(path), "body": "grow 100", "line": 10},
+                {"path": str(path), "body": "grow 5", "line": 20},
+                {"path": str(path), "body": "rename x115", "line": 115},
+            ]
+            growth = {"grow 100": 100, "grow 5": 5}
+
+            async def afix(code, comment, region=None):
+                if comment in growth:
+                    return code + "".join(f"pad = {i}\n" for i in range(growth[comment]))
+                return code.replace("x115", "renamed")
+
+            mock_fixer = mock_fixer_cls.return_value
+            mock_fixer.afix = AsyncMock(side_effect=afix)
+
+            Agent().run("fix review comments")
+
+            regions = [c.kwargs["region"] for c in mock_fixer.afix.await_args_list]
+            self.assertEqual(regions, [(9, 11), (119, 121), (219, 221)])
+            self.assertIn("x115 = 115", mock_fixer.afix.await_args_list[2].args[0])
+
+            text = path.read_text()
+            self.assertIn("renamed = 115\n", text)
+            self.assertIn("x110 = 110\n", text)
+            self.assertEqual(len(text.splitlines()), 305)
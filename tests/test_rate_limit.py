@@ -0,0 +1,143 @@
+import subprocess
+import sys
+import unittest
+
+import httpx
+import openai
+
+from devmate.core.rate_limit import (
+    PRIORITY_FIX,
+    PRIORITY_PLANNING,
+    POLL_INTERVAL,
+    RateLimiter,
+    TokenBucket,
+    parse_duration,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def rate_limit_error(headers):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers=headers, request=request)
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_bucket_refills_over_time(self):
+        clock = FakeClock()
+        bucket = TokenBucket(10, 1, clock)
+
+        bucket.take(10)
+        self.assertEqual(bucket.wait_time(4), 4)
+
+        clock.now += 4
+        self.assertEqual(bucket.wait_time(4), 0)
+
+    def test_oversized_requests_are_clamped_to_capacity(self):
+        bucket = TokenBucket(10, 1, FakeClock())
+
+        self.assertEqual(bucket.wait_time(50), 0)
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_parse_duration(self):
+        self.assertEqual(parse_duration("2"), 2)
+        self.assertEqual(parse_duration("20ms"), 0.02)
+        self.assertEqual(parse_duration("6m0s"), 360)
+        self.assertIsNone(parse_duration("soon"))
+
+    def test_requests_are_paced_to_rpm(self):
+        limiter = RateLimiter(rpm=60, tpm=100_000, clock=self.clock)
+        limiter.requests.take(60)
+
+        limiter.acquire(sleep=self.clock.sleep)
+
+        self.assertAlmostEqual(sum(self.clock.sleeps), 1.0)
+
+    def test_headers_lower_remaining_budget(self):
+        limiter = RateLimiter(rpm=600, tpm=100_000, clock=self.clock)
+
+        retry = limiter.observe(
+            {"x-ratelimit-remaining-tokens": "0", "x-ratelimit-reset-tokens": "1.5s"}
+        )
+
+        self.assertEqual(retry, 1.5)
+        self.assertEqual(limiter.tokens.level, 0)
+
+    def test_rate_limit_error_is_retried_after_server_delay(self):
+        limiter = RateLimiter(rpm=600, tpm=100_000, clock=self.clock)
+        outcomes = [rate_limit_error({"retry-after": "3"}), "ok"]
+
+        def request():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        self.assertEqual(limiter.call(request, prompt="hello", sleep=self.clock.sleep), "ok")
+        self.assertEqual(limiter.retries, 1)
+        self.assertGreaterEqual(sum(self.clock.sleeps), 3)
+
+    def test_gives_up_after_max_retries(self):
+        limiter = RateLimiter(rpm=600, tpm=100_000, max_retries=2, clock=self.clock)
+        calls = []
+
+        def request():
+            calls.append(1)
+            raise rate_limit_error({})
+
+        with self.assertRaises(openai.RateLimitError):
+            limiter.call(request, sleep=self.clock.sleep)
+        self.assertEqual(len(calls), 3)
+
+    def test_backoff_is_exponential_with_jitter(self):
+        limiter = RateLimiter(rpm=60, tpm=1000, base_delay=1, max_delay=8)
+
+        for attempt, cap in [(0, 1), (2, 4), (6, 8)]:
+            delay = limiter.backoff_delay(attempt)
+            self.assertGreaterEqual(delay, cap / 2)
+            self.assertLessEqual(delay, cap)
+
+    def test_planning_is_admitted_ahead_of_queued_fixes(self):
+        limiter = RateLimiter(rpm=60, tpm=100_000, clock=self.clock)
+
+        fix = limiter._enqueue(PRIORITY_FIX)
+        plan = limiter._enqueue(PRIORITY_PLANNING)
+
+        self.assertEqual(limiter._try_acquire(fix, 1), POLL_INTERVAL)
+        self.assertEqual(limiter._try_acquire(plan, 1), 0)
+        self.assertEqual(limiter._try_acquire(fix, 1), 0)
+
+
+class TestImports(unittest.TestCase):
+
+    def test_llm_client_does_not_load_the_context_stack(self):
+        code = (
+            "import sys, devmate.core.llm_client; "
+            "print(sorted(m for m in sys.modules if m.startswith('devmate.core.')))"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+
+        for module in ("context", "search", "symbols", "repo_index"):
+            self.assertNotIn(f"devmate.core.{module}'", out)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import os
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from devmate.core.repo_index import RepoIndex, blob_hash, load_state, save_state
+
+
+class TestRepoIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        (self.root / "pkg").mkdir()
+        (self.root / "pkg" / "a.py").write_text("a = 1\n")
+        (self.root / "README.md").write_text("# readme\n")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_refresh_indexes_files_in_sorted_order(self):
+        index = RepoIndex(self.root)
+        changed = index.refresh()
+
+        self.assertEqual(changed, ["README.md", "pkg/a.py"])
+        self.assertEqual(index.paths(), ["README.md", "pkg/a.py"])
+        self.assertEqual(index.paths(suffixes={".py"}), ["pkg/a.py"])
+
+    def test_index_persists_and_refresh_is_incremental(self):
+        index = RepoIndex(self.root)
+        index.refresh()
+        index.save()
+
+        reloaded = RepoIndex(self.root)
+        self.assertEqual(reloaded.refresh(), [])
+
+        (self.root / "pkg" / "b.py").write_text("b = 2\n")
+        self.assertEqual(reloaded.refresh(), ["pkg/b.py"])
+
+        os.remove(self.root / "pkg" / "a.py")
+        self.assertEqual(reloaded.refresh(), ["pkg/a.py"])
+        self.assertEqual(reloaded.paths(suffixes={".py"}), ["pkg/b.py"])
+
+    def test_full_refresh_detects_in_place_edits(self):
+        index = RepoIndex(self.root)
+        index.refresh()
+
+        path = self.root / "pkg" / "a.py"
+        path.write_text("a = 100\n")
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        self.assertEqual(index.refresh(full=True), ["pkg/a.py"])
+
+    def test_refresh_detects_in_place_edits(self):
+        index = RepoIndex(self.root)
+        index.refresh()
+        index.save()
+
+        with open(self.root / "pkg" / "a.py", "a") as f:
+            f.write("b = 2\n")
+
+        self.assertEqual(RepoIndex(self.root).refresh(mode="stat"), ["pkg/a.py"])
+
+    def test_content_hash_matches_git_blob_hash(self):
+        index = RepoIndex(self.root)
+        index.refresh()
+
+        self.assertEqual(index.content_hash("pkg/a.py"), blob_hash(b"a = 1\n"))
+        # `git hash-object` of an empty file
+        self.assertEqual(blob_hash(b""), "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391")
+
+    def test_state_dir_is_not_indexed(self):
+        index = RepoIndex(self.root)
+        index.refresh()
+        index.save()
+
+        self.assertTrue((self.root / ".devmate" / ".gitignore").exists())
+        self.assertEqual(RepoIndex(self.root).refresh(full=True), [])
+
+
+    def test_state_round_trips_and_rejects_other_versions(self):
+        path = self.root / ".devmate" / "state.json"
+        save_state(self.root, path, {"version": 1, "items": [1, 2]})
+
+        self.assertEqual(load_state(path, 1), {"version": 1, "items": [1, 2]})
+        self.assertIsNone(load_state(path, 2))
+        self.assertEqual(sorted(p.name for p in path.parent.iterdir()), [".gitignore", "state.json"])
+
+        path.write_text("{not json")
+        self.assertIsNone(load_state(path, 1))
+        self.assertIsNone(load_state(self.root / "missing.json", 1))
+
+class TestRepoIndexGitMode(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        subprocess.check_output(["git", "init", "-q"], cwd=self.root)
+
+        (self.root / "a.py").write_text("a = 1\n")
+        (self.root / "b.py").write_text("b = 1\n")
+        (self.root / ".gitignore").write_text("*.log\n")
+        (self.root / "debug.log").write_text("noise\n")
+        subprocess.check_output(["git", "add", "a.py", "b.py", ".gitignore"], cwd=self.root)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_tracked_files_take_git_blob_hashes(self):
+        index = RepoIndex(self.root)
+        index.refresh(mode="git")
+
+        self.assertEqual(index.paths(suffixes={".py"}), ["a.py", "b.py"])
+        self.assertNotIn("debug.log", index.paths())
+        self.assertEqual(index.entry("a.py")["hash"], blob_hash(b"a = 1\n"))
+
+    def test_only_changed_paths_are_reprocessed(self):
+        index = RepoIndex(self.root)
+        index.refresh(mode="git")
+        index.save()
+
+        (self.root / "b.py").write_text("b = 2\n")
+        (self.root / "c.py").write_text("c = 1\n")
+
+        reloaded = RepoIndex(self.root)
+        with patch("devmate.core.repo_index.os.stat", wraps=os.stat) as mock_stat:
+            changed = reloaded.refresh(mode="git")
+
+        self.assertEqual(changed, ["b.py", "c.py"])
+        stated = {Path(call.args[0]).name for call in mock_stat.call_args_list}
+        self.assertNotIn("a.py", stated)
+
+    def test_deleted_tracked_file_is_removed(self):
+        index = RepoIndex(self.root)
+        index.refresh(mode="git")
+
+        os.remove(self.root / "a.py")
+
+        self.assertEqual(index.refresh(mode="git"), ["a.py"])
+        self.assertIsNone(index.entry("a.py"))
+
+    def test_falls_back_to_walk_outside_a_repository(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "x.py").write_text("x = 1\n")
+            index = RepoIndex(tmp)
+
+            self.assertEqual(index.refresh(mode="git"), ["x.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()
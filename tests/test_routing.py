@@ -0,0 +1,101 @@
+import asyncio
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+import openai
+
+from devmate.config import settings
+from devmate.core import routing
+from devmate.core.backends import LLMBackend
+from devmate.core.code_fixer import CodeFixer
+from devmate.core.llm_client import AsyncLLMClient, LLMClient
+
+
+ROUTES = {"planner": ["cheap", "strong"], "selector": ["fast"], "fixer": ["cheap", "strong"]}
+
+
+class ScriptedBackend(LLMBackend):
+    """Returns a fixed output (or raises) per model and records the models used."""
+
+    def __init__(self, outputs):
+        self.outputs = outputs
+        self.models = []
+
+    def create(self, model, **kwargs):
+        self.models.append(model)
+        output = self.outputs[model]
+        if isinstance(output, Exception):
+            raise output
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=output))])
+
+    async def acreate(self, **kwargs):
+        return self.create(**kwargs)
+
+
+def must_be_json(content):
+    json.loads(content)
+
+
+@patch.object(settings, "MODEL_ROUTES", ROUTES)
+class TestRouting(unittest.TestCase):
+
+    def test_models_for_uses_route_or_default(self):
+        self.assertEqual(routing.models_for("planner"), ["cheap", "strong"])
+        self.assertEqual(routing.models_for("llm"), settings.DEFAULT_MODELS)
+
+    def test_each_component_uses_its_first_model(self):
+        backend = ScriptedBackend({"cheap": "plan", "fast": "files"})
+        client = LLMClient(cache=None, backend=backend, component="planner")
+
+        client.generate("p")
+        client.generate("s", component="selector")
+
+        self.assertEqual(backend.models, ["cheap", "fast"])
+
+    def test_invalid_output_escalates_to_next_model(self):
+        backend = ScriptedBackend({"cheap": "not json", "strong": "[]"})
+        client = LLMClient(cache=None, backend=backend, component="planner")
+
+        self.assertEqual(client.generate("p", validate=must_be_json), "[]")
+        self.assertEqual(backend.models, ["cheap", "strong"])
+
+    def test_api_error_falls_back_to_next_model(self):
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        not_found = openai.NotFoundError(
+            "no such model", response=httpx.Response(404, request=request), body=None
+        )
+        backend = ScriptedBackend({"cheap": not_found, "strong": "ok"})
+        client = LLMClient(cache=None, backend=backend, component="planner")
+
+        self.assertEqual(client.generate("p"), "ok")
+
+    def test_last_model_failure_is_raised(self):
+        backend = ScriptedBackend({"cheap": "bad", "strong": "worse"})
+        client = LLMClient(cache=None, backend=backend, component="planner")
+
+        with self.assertRaises(ValueError):
+            client.generate("p", validate=must_be_json)
+
+    def test_async_client_escalates_too(self):
+        backend = ScriptedBackend({"cheap": "bad", "strong": "[1]"})
+        client = AsyncLLMClient(max_concurrency=1, cache=None, backend=backend, component="planner")
+
+        result = asyncio.run(client.generate("p", validate=must_be_json))
+
+        self.assertEqual(result, "[1]")
+        self.assertEqual(backend.models, ["cheap", "strong"])
+
+    def test_fixer_escalates_markdown_output(self):
+        backend = ScriptedBackend({"cheap": "```python\nx = 2\n```", "strong": "x = 2\n"})
+        fixer = CodeFixer(backend=backend)
+        fixer.llm.cache = None
+
+        self.assertEqual(fixer.fix("x = 1\n", "use 2"), "x = 2\n")
+        self.assertEqual(backend.models, ["cheap", "strong"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from devmate.core.repo_index import RepoIndex
+from devmate.core.search import BM25Index, tokenize
+
+
+class TestTokenize(unittest.TestCase):
+
+    def test_splits_identifiers(self):
+        tokens = tokenize("def read_file(path): return GitHubClient")
+
+        self.assertIn("read_file", tokens)
+        self.assertIn("read", tokens)
+        self.assertIn("file", tokens)
+        self.assertIn("git", tokens)
+        self.assertIn("hub", tokens)
+        self.assertIn("githubclient", tokens)
+
+    def test_drops_stopwords(self):
+        self.assertEqual(tokenize("show the git status"), ["git", "status"])
+
+
+class TestBM25Index(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+
+        files = {
+            "tools/git.py": "def commit(message):\n    run(['git', 'commit'])\n",
+            "tools/github.py": "def list_open_prs(repo):\n    pass\n",
+            "core/executor.py": "class Executor:\n    def execute(self): pass\n",
+            "README.md": "Devmate runs plans.\n",
+        }
+        for rel, content in files.items():
+            path = self.root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+
+        self.index = RepoIndex(self.root)
+        self.index.refresh()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _search_index(self):
+        search = BM25Index(self.index)
+        search.refresh(self.index.paths())
+        return search
+
+    def test_ranks_matching_file_first(self):
+        search = self._search_index()
+
+        results = search.search("how are git commits handled")
+        self.assertEqual(results[0][0], "tools/git.py")
+
+        results = search.search("list open pull requests prs")
+        self.assertEqual(results[0][0], "tools/github.py")
+
+    def test_unrelated_query_returns_nothing(self):
+        search = self._search_index()
+        self.assertEqual(search.search("kubernetes"), [])
+
+    def test_persisted_index_only_retokenizes_changed_files(self):
+        search = self._search_index()
+        search.save()
+
+        (self.root / "README.md").write_text("Devmate can deploy kubernetes.\n")
+        self.index.refresh(full=True)
+
+        reloaded = BM25Index(self.index)
+        self.assertEqual(reloaded.refresh(self.index.paths()), 1)
+        self.assertEqual(reloaded.search("kubernetes")[0][0], "README.md")
+
+    def test_refresh_drops_removed_files(self):
+        search = self._search_index()
+        search.refresh(["tools/git.py"])
+
+        self.assertEqual(search.search("executor"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from devmate.core import symbols
+from devmate.core.symbols import SymbolIndex, parse_symbols
+
+
+SOURCE = '''import os
+
+
+def helper(x: int) -> int:
+    return x + 1
+
+
+class Git:
+    def status(self):
+        return "clean"
+
+    def commit(self, message):
+        staged = os.listdir(".")
+        return f"committed {message}"
+
+
+class Other:
+    pass
+'''
+
+
+class TestSymbols(unittest.TestCase):
+
+    def test_parse_symbols_builds_outline_with_spans(self):
+        module = parse_symbols(SOURCE)
+        names = [s["name"] for s in module["symbols"]]
+
+        self.assertEqual(names, ["helper", "Git", "Other"])
+
+        helper = module["symbols"][0]
+        self.assertEqual((helper["start"], helper["end"]), (4, 5))
+        self.assertEqual(helper["signature"], "def helper(x: int) -> int:")
+
+        git = module["symbols"][1]
+        self.assertEqual([c["name"] for c in git["children"]], ["status", "commit"])
+
+    def test_parse_symbols_returns_none_for_invalid_source(self):
+        self.assertIsNone(parse_symbols("def broken(:\n"))
+
+    def test_outline_is_cached_per_content_hash(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            index = SymbolIndex(tmp)
+            index.outline("git.py", SOURCE)
+            index.save()
+
+            reloaded = SymbolIndex(tmp)
+            with patch.object(symbols, "parse_symbols") as mock_parse:
+                reloaded.outline("git.py", SOURCE)
+                mock_parse.assert_not_called()
+
+                reloaded.outline("git.py", SOURCE + "\nx = 1\n")
+                mock_parse.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
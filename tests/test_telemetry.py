@@ -0,0 +1,138 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from devmate.core import telemetry
+from devmate.core.llm_client import AsyncLLMClient, LLMClient
+
+
+def fake_response(prompt_tokens=100, cached_tokens=0, completion_tokens=20):
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = "ok"
+    response.usage.prompt_tokens = prompt_tokens
+    response.usage.completion_tokens = completion_tokens
+    response.usage.prompt_tokens_details = {"cached_tokens": cached_tokens}
+    return response
+
+
+class TestTelemetry(unittest.TestCase):
+
+    def test_cost_discounts_cached_prompt_tokens(self):
+        full = telemetry.cost("gpt-4o-mini", 1_000_000, 0, 0)
+        half_cached = telemetry.cost("gpt-4o-mini", 1_000_000, 500_000, 0)
+
+        self.assertAlmostEqual(full, 0.15)
+        self.assertAlmostEqual(half_cached, 0.1125)
+        self.assertEqual(telemetry.cost("unknown-model", 1000, 0, 1000), 0.0)
+
+    def test_records_only_while_active_and_aggregate_by_component(self):
+        telemetry.record_call("planner", "gpt-4o-mini", 1.0)
+
+        run = telemetry.Telemetry()
+        token = telemetry.activate(run)
+        try:
+            telemetry.record_call("selector", "gpt-4o-mini", 0.5, prompt_tokens=10)
+            telemetry.record_call("planner", "gpt-4o-mini", 2.0, prompt_tokens=30, completion_tokens=5)
+            telemetry.record_call("planner", "gpt-4o-mini", 1.0, error="RateLimitError")
+        finally:
+            telemetry.deactivate(token)
+
+        summary = run.summary()
+        self.assertEqual(summary["calls"], 3)
+        self.assertEqual(summary["latency"], 3.5)
+        self.assertEqual(summary["by_component"]["planner"]["calls"], 2)
+        self.assertEqual(summary["by_component"]["planner"]["prompt_tokens"], 30)
+        self.assertEqual(summary["by_component"]["planner"]["errors"], 1)
+        self.assertIsNone(telemetry.current())
+
+    def test_export_writes_summary_and_calls(self):
+        run = telemetry.Telemetry()
+        run.add(telemetry.record_call("fixer", "gpt-4o-mini", 0.25))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "telemetry.json")
+            run.export(path)
+            with open(path) as f:
+                data = json.load(f)
+
+        self.assertEqual(data["summary"]["calls"], 1)
+        self.assertEqual(data["calls"][0]["component"], "fixer")
+
+
+class TestClientTelemetry(unittest.TestCase):
+
+    @patch("devmate.core.llm_client.settings")
+    @patch("devmate.core.llm_client.OpenAI")
+    def test_generate_records_usage_and_component(self, mock_openai, mock_settings):
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_settings.validate = MagicMock()
+        mock_openai.return_value.chat.completions.create.return_value = fake_response(
+            prompt_tokens=2000, cached_tokens=1024, completion_tokens=50
+        )
+
+        client = LLMClient(cache=None, component="planner")
+        run = telemetry.Telemetry()
+        token = telemetry.activate(run)
+        try:
+            client.generate("plan")
+            client.generate("select", component="selector")
+        finally:
+            telemetry.deactivate(token)
+
+        first, second = run.calls
+        self.assertEqual(first["component"], "planner")
+        self.assertEqual(first["model"], "gpt-4o-mini")
+        self.assertEqual(first["cached_tokens"], 1024)
+        self.assertGreater(first["cost"], 0)
+        self.assertEqual(second["component"], "selector")
+
+    @patch("devmate.core.llm_client.settings")
+    @patch("devmate.core.llm_client.OpenAI")
+    def test_stream_records_time_to_first_token(self, mock_openai, mock_settings):
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_settings.validate = MagicMock()
+
+        chunk = MagicMock()
+        chunk.choices = [MagicMock()]
+        chunk.choices[0].delta.content = "[]"
+        mock_openai.return_value.chat.completions.create.return_value = iter([chunk])
+
+        client = LLMClient(cache=None, component="planner")
+        run = telemetry.Telemetry()
+        token = telemetry.activate(run)
+        try:
+            list(client.stream("plan"))
+        finally:
+            telemetry.deactivate(token)
+
+        self.assertIsNotNone(run.calls[0]["ttft"])
+        self.assertLessEqual(run.calls[0]["ttft"], run.calls[0]["latency"])
+
+    @patch("devmate.core.llm_client.settings")
+    @patch("devmate.core.llm_client.AsyncOpenAI")
+    def test_concurrent_calls_report_to_the_active_run(self, mock_openai, mock_settings):
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_settings.validate = MagicMock()
+
+        async def create(**kwargs):
+            return fake_response()
+
+        mock_openai.return_value.chat.completions.create = create
+
+        client = AsyncLLMClient(max_concurrency=2, cache=None, component="fixer")
+        run = telemetry.Telemetry()
+        token = telemetry.activate(run)
+        try:
+            asyncio.run(client.generate_many(["a", "b", "c"]))
+        finally:
+            telemetry.deactivate(token)
+
+        self.assertEqual(run.summary()["by_component"]["fixer"]["calls"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from devmate.config import settings
+from devmate.core import transport
+
+
+class TestTransport(unittest.TestCase):
+
+    def tearDown(self):
+        transport.close()
+
+    def test_sync_client_is_shared_until_closed(self):
+        client = transport.http_client()
+
+        self.assertIs(transport.http_client(), client)
+
+        transport.close()
+        self.assertTrue(client.is_closed)
+        self.assertIsNot(transport.http_client(), client)
+
+    @patch.object(settings, "HTTP_MAX_CONNECTIONS", 7)
+    @patch.object(settings, "HTTP_CONNECT_TIMEOUT", 3)
+    def test_pool_limits_and_timeouts_come_from_settings(self):
+        transport.close()
+        client = transport.http_client()
+
+        self.assertEqual(client.timeout.connect, 3)
+        pool = client._transport._pool
+        self.assertEqual(pool._max_connections, 7)
+
+    @patch.object(settings, "HTTP2", True)
+    def test_http2_requires_h2(self):
+        with patch.dict("sys.modules", {"h2": None}), \
+             patch.object(transport, "_h2_warned", False), \
+             self.assertLogs("transport", level="WARNING") as logs:
+            self.assertFalse(transport.http2_enabled())
+            self.assertFalse(transport.http2_enabled())
+
+        self.assertEqual(len(logs.output), 1)
+
+    def test_async_client_is_shared_within_a_loop(self):
+        async def two_lookups():
+            return transport.async_http_client(), transport.async_http_client()
+
+        first, second = asyncio.run(two_lookups())
+        self.assertIs(first, second)
+
+        other, _ = asyncio.run(two_lookups())
+        self.assertIsNot(other, first)
+
+    def test_loop_client_is_closed_before_the_loop_ends(self):
+        async def use_and_close():
+            client = transport.async_http_client()
+            await transport.aclose_loop_client()
+            fresh = transport.async_http_client()
+            await transport.aclose_loop_client()
+            return client, fresh
+
+        closed, fresh = asyncio.run(use_and_close())
+        self.assertTrue(closed.is_closed)
+        self.assertIsNot(fresh, closed)
+
+        # Nothing to close is fine
+        asyncio.run(transport.aclose_loop_client())
+
+
+if __name__ == "__main__":
+    unittest.main()
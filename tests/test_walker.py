@@ -0,0 +1,92 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from devmate.core.walker import IgnoreRule, RepoWalker
+
+
+class TestIgnoreRule(unittest.TestCase):
+
+    def test_unanchored_pattern_matches_at_any_depth(self):
+        rule = IgnoreRule("*.pyc")
+        self.assertTrue(rule.matches("a.pyc", False))
+        self.assertTrue(rule.matches("pkg/sub/a.pyc", False))
+        self.assertFalse(rule.matches("a.py", False))
+
+    def test_anchored_pattern_matches_from_base(self):
+        rule = IgnoreRule("/build")
+        self.assertTrue(rule.matches("build", True))
+        self.assertFalse(rule.matches("src/build", True))
+
+    def test_dir_only_pattern(self):
+        rule = IgnoreRule("out/")
+        self.assertTrue(rule.matches("out", True))
+        self.assertFalse(rule.matches("out", False))
+
+    def test_double_star(self):
+        rule = IgnoreRule("docs/**/*.txt")
+        self.assertTrue(rule.matches("docs/a.txt", False))
+        self.assertTrue(rule.matches("docs/x/y/a.txt", False))
+        self.assertFalse(rule.matches("src/a.txt", False))
+
+    def test_nested_rule_is_relative_to_its_directory(self):
+        rule = IgnoreRule("/gen", base="pkg")
+        self.assertTrue(rule.matches("pkg/gen", True))
+        self.assertFalse(rule.matches("gen", True))
+
+
+class TestRepoWalker(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+
+        for rel in [
+            "b.py",
+            "a.py",
+            "notes.md",
+            "image.png",
+            "build/out.py",
+            "node_modules/dep/index.py",
+            ".git/config",
+            "pkg/keep.py",
+            "pkg/skip.log",
+            "pkg/gen/generated.py",
+            "vendor/lib.py",
+        ]:
+            path = self.root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("x")
+
+        (self.root / ".gitignore").write_text("/build\n*.log\n!important.log\n")
+        (self.root / "pkg" / ".gitignore").write_text("gen/\n")
+        (self.root / ".devmateignore").write_text("vendor/\n")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_walk_prunes_ignored_trees_in_sorted_order(self):
+        walker = RepoWalker(self.root, suffixes={".py", ".md"})
+
+        self.assertEqual(
+            list(walker.walk()),
+            ["a.py", "b.py", "notes.md", "pkg/keep.py"],
+        )
+
+    def test_negation_reincludes_file(self):
+        (self.root / "pkg" / "important.log").write_text("x")
+        walker = RepoWalker(self.root)
+
+        self.assertIn("pkg/important.log", list(walker.walk()))
+        self.assertNotIn("pkg/skip.log", list(walker.walk()))
+
+    def test_info_exclude_is_honoured(self):
+        (self.root / ".git" / "info").mkdir()
+        (self.root / ".git" / "info" / "exclude").write_text("notes.md\n")
+        walker = RepoWalker(self.root)
+
+        self.assertNotIn("notes.md", list(walker.walk()))
+
+
+if __name__ == "__main__":
+    unittest.main()